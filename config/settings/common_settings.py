@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "mathesar.middleware.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,6 +65,11 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "config.urls"
 
+MODERNRPC_HANDLERS = [
+    'mathesar.rpc.batch.BatchJSONRPCHandler',
+    'modernrpc.handlers.XMLRPCHandler',
+]
+
 MODERNRPC_METHODS_MODULES = [
     'mathesar.rpc.collaborators',
     'mathesar.rpc.columns',
@@ -76,15 +82,18 @@ MODERNRPC_METHODS_MODULES = [
     'mathesar.rpc.databases.privileges',
     'mathesar.rpc.databases.setup',
     'mathesar.rpc.explorations',
+    'mathesar.rpc.jobs',
     'mathesar.rpc.records',
     'mathesar.rpc.roles',
     'mathesar.rpc.roles.configured',
     'mathesar.rpc.schemas',
     'mathesar.rpc.schemas.privileges',
     'mathesar.rpc.servers.configured',
+    'mathesar.rpc.slow_calls',
     'mathesar.rpc.tables',
     'mathesar.rpc.tables.metadata',
     'mathesar.rpc.tables.privileges',
+    'mathesar.rpc.tables.search_indexes',
     'mathesar.rpc.types',
 ]
 
@@ -264,6 +273,82 @@ MATHESAR_UI_SOURCE_LOCATION = os.path.join(BASE_DIR, 'mathesar_ui/')
 MATHESAR_CAPTURE_UNHANDLED_EXCEPTION = decouple_config('CAPTURE_UNHANDLED_EXCEPTION', default=False)
 MATHESAR_STATIC_NON_CODE_FILES_LOCATION = os.path.join(BASE_DIR, 'mathesar/static/non-code/')
 
+# Pooled connections to user databases, one pool per (server, database, role)
+MATHESAR_CONNECTION_POOL = {
+    'ENABLED': decouple_config('MATHESAR_CONNECTION_POOL_ENABLED', default=True, cast=bool),
+    'MIN_SIZE': decouple_config('MATHESAR_CONNECTION_POOL_MIN_SIZE', default=1, cast=int),
+    'MAX_SIZE': decouple_config('MATHESAR_CONNECTION_POOL_MAX_SIZE', default=10, cast=int),
+    # Seconds an idle connection may stay open before being closed.
+    'MAX_IDLE': decouple_config('MATHESAR_CONNECTION_POOL_MAX_IDLE', default=300, cast=float),
+    # Seconds a request may wait for a free connection before failing.
+    'TIMEOUT': decouple_config('MATHESAR_CONNECTION_POOL_TIMEOUT', default=30, cast=float),
+}
+
+# Seconds to cache exact row counts of record listings. Counts are also
+# invalidated when records are added, modified, or deleted via Mathesar.
+MATHESAR_RECORD_COUNT_CACHE_TIMEOUT = decouple_config(
+    'MATHESAR_RECORD_COUNT_CACHE_TIMEOUT', default=60, cast=int
+)
+
+# Maximum number of rows read when suggesting column types from a sample.
+MATHESAR_TYPE_INFERENCE_SAMPLE_SIZE = decouple_config(
+    'MATHESAR_TYPE_INFERENCE_SAMPLE_SIZE', default=10000, cast=int
+)
+
+# Statement timeouts (in seconds; 0 disables) for RPC method calls, by
+# method family. See `mathesar.rpc.utils.get_statement_timeout_family`.
+MATHESAR_STATEMENT_TIMEOUTS = {
+    'CATALOG': decouple_config('MATHESAR_STATEMENT_TIMEOUT_CATALOG', default=30, cast=float),
+    'RECORDS': decouple_config('MATHESAR_STATEMENT_TIMEOUT_RECORDS', default=120, cast=float),
+    'DDL': decouple_config('MATHESAR_STATEMENT_TIMEOUT_DDL', default=600, cast=float),
+    # Background jobs are meant for calls that take long.
+    'JOBS': decouple_config('MATHESAR_STATEMENT_TIMEOUT_JOBS', default=0, cast=float),
+}
+
+# Seconds between checks for a disconnected client while an RPC method
+# call is running a query (0 disables the checks). The query is cancelled
+# once the client is gone.
+MATHESAR_CLIENT_DISCONNECT_POLL_INTERVAL = decouple_config(
+    'MATHESAR_CLIENT_DISCONNECT_POLL_INTERVAL', default=1, cast=float
+)
+
+# Metrics of RPC method calls, msar function calls, and connections, served
+# in the Prometheus format at /api/metrics/. Requests to the endpoint must
+# come from a superuser, or bear the TOKEN (if set).
+MATHESAR_METRICS = {
+    'ENABLED': decouple_config('MATHESAR_METRICS_ENABLED', default=False, cast=bool),
+    'TOKEN': decouple_config('MATHESAR_METRICS_TOKEN', default=''),
+    # Whether to send the timings of each request in a Server-Timing header.
+    'SERVER_TIMING': decouple_config('MATHESAR_METRICS_SERVER_TIMING', default=False, cast=bool),
+}
+
+# Record listing, search, and exploration calls slower than THRESHOLD
+# seconds (0 disables the log) are saved with their SQL and its plan. Only
+# the latest MAX_ENTRIES calls are kept.
+MATHESAR_SLOW_CALL_LOG = {
+    'THRESHOLD': decouple_config('MATHESAR_SLOW_CALL_THRESHOLD', default=5, cast=float),
+    'MAX_ENTRIES': decouple_config('MATHESAR_SLOW_CALL_MAX_ENTRIES', default=500, cast=int),
+}
+
+# Background jobs for long-running RPC method calls, run by worker
+# processes (`manage.py run_job_worker`). Each runs up to WORKERS jobs at
+# a time, checks for new jobs every POLL_INTERVAL seconds, and running
+# jobs without a heartbeat for HEARTBEAT_TIMEOUT seconds are failed.
+MATHESAR_JOBS = {
+    'WORKERS': decouple_config('MATHESAR_JOBS_WORKERS', default=2, cast=int),
+    'POLL_INTERVAL': decouple_config('MATHESAR_JOBS_POLL_INTERVAL', default=1, cast=float),
+    'HEARTBEAT_TIMEOUT': decouple_config(
+        'MATHESAR_JOBS_HEARTBEAT_TIMEOUT', default=60, cast=float
+    ),
+}
+
+# JSON-RPC batch requests. Calls in a batch which target the same database
+# share a connection, and calls targeting different databases run
+# concurrently in up to WORKERS threads.
+MATHESAR_RPC_BATCH = {
+    'WORKERS': decouple_config('MATHESAR_RPC_BATCH_WORKERS', default=4, cast=int),
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 # UI source files have to be served by Django in order for static assets to be included during dev mode
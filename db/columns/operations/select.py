@@ -46,6 +46,29 @@ def get_column_info_for_table(table, conn):
     return exec_msar_func(conn, 'get_column_info', table).fetchone()[0]
 
 
+def get_column_profiles(
+        table_oid, conn, column_attnums=None, sample_size=10000, analyze=False
+):
+    """
+    Return summary statistics for columns of a table, without scanning it.
+
+    Profiles come from `pg_stats`, or from a bounded sample of the table
+    for columns whose statistics are missing or stale. See
+    `msar.get_column_profiles` for the form of the returned dictionaries.
+
+    Args:
+        table_oid: The OID of the table whose columns we'll profile.
+        column_attnums: The attnums of the columns to profile. All
+            columns if None.
+        sample_size: The maximum number of rows to read when sampling.
+        analyze: Whether to analyze the table first, if its statistics
+            are missing or stale.
+    """
+    return exec_msar_func(
+        conn, 'get_column_profiles', table_oid, column_attnums, sample_size, analyze
+    ).fetchone()[0]
+
+
 def get_column_description(oid, attnum, engine):
     cursor = execute_msar_func_with_engine(engine, 'col_description', oid, attnum)
     row = cursor.fetchone()
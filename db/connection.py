@@ -1,7 +1,33 @@
+import time
+
 from sqlalchemy import text
 import psycopg
 from psycopg.rows import dict_row
 
+# Called after each msar function call with the function name, the
+# cursor, and the duration of the call in seconds (see
+# `set_msar_call_observer`).
+_msar_call_observer = None
+
+
+def set_msar_call_observer(observer):
+    """
+    Set a callable to observe msar function calls, e.g., for metrics.
+
+    Pass None to stop observing calls.
+    """
+    global _msar_call_observer
+    _msar_call_observer = observer
+
+
+def _execute_msar_query(conn, query, func_name, args):
+    if _msar_call_observer is None:
+        return conn.execute(query, args)
+    start = time.perf_counter()
+    cursor = conn.execute(query, args)
+    _msar_call_observer(func_name, cursor, time.perf_counter() - start)
+    return cursor
+
 
 def execute_msar_func_with_engine(engine, func_name, *args):
     """
@@ -51,8 +77,11 @@ def exec_msar_func(conn, func_name, *args):
         *args: The list of parameters to pass
     """
     # Returns a cursor
-    return conn.execute(
-        f"SELECT msar.{func_name}({','.join(['%s']*len(args))})", args
+    return _execute_msar_query(
+        conn,
+        f"SELECT msar.{func_name}({','.join(['%s']*len(args))})",
+        func_name,
+        args
     )
 
 
@@ -65,8 +94,11 @@ def select_from_msar_func(conn, func_name, *args):
         func_name: The unqualified msar_function name (danger; not sanitized)
         *args: The list of parameters to pass
     """
-    cursor = conn.execute(
-        f"SELECT * FROM msar.{func_name}({','.join(['%s']*len(args))})", args
+    cursor = _execute_msar_query(
+        conn,
+        f"SELECT * FROM msar.{func_name}({','.join(['%s']*len(args))})",
+        func_name,
+        args
     )
     cursor.row_factory = dict_row
     return cursor.fetchall()
@@ -4,6 +4,9 @@ from psycopg import sql
 
 def drop_database(database_oid, conn):
     cursor = conn.cursor()
+    # Autocommit can't be turned on in a transaction (e.g., one setting a
+    # statement timeout), and DROP DATABASE can't run in one anyway.
+    conn.commit()
     conn.autocommit = True
     drop_database_query = exec_msar_func(
         conn,
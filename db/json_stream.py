@@ -0,0 +1,142 @@
+"""
+Incremental reading of JSON data files.
+
+A JSON data file may hold a single object, an array of objects, or a
+sequence of objects separated by whitespace (e.g., newline delimited JSON).
+The values are decoded one at a time from a buffer that's refilled from the
+file in chunks, so memory use depends on the size of the largest object,
+rather than on the size of the file.
+"""
+import codecs
+import json
+import re
+
+# Number of bytes (or characters, for text files) read from the file at once.
+READ_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def iter_json_values(json_file):
+    """
+    Yield the values in a JSON file, one at a time.
+
+    If the file holds an array, its elements are yielded. Otherwise, every
+    top level value in the file is yielded in turn, which covers both a
+    file with a single object, and newline delimited JSON.
+
+    Args:
+        json_file: A file object opened in binary or text mode. For binary
+            files, the encoding is detected the same way as by `json.load`.
+
+    Raises:
+        json.JSONDecodeError: If the file isn't valid JSON or NDJSON.
+    """
+    reader = _JSONReader(json_file)
+    char = reader.peek()
+    if char is None:
+        reader.raise_error("Expecting value")
+    if char == '[':
+        reader.advance()
+        if reader.peek() == ']':
+            reader.advance()
+        else:
+            while True:
+                yield reader.decode()
+                char = reader.peek()
+                if char != ']' and char != ',':
+                    reader.raise_error("Expecting ',' delimiter")
+                reader.advance()
+                if char == ']':
+                    break
+        if reader.peek() is not None:
+            reader.raise_error("Extra data")
+    else:
+        while reader.peek() is not None:
+            yield reader.decode()
+
+
+def flatten_json_object(json_dict, max_level, prefix=''):
+    """
+    Yield the (key, value) pairs of a flattened JSON object.
+
+    Nested objects up to `max_level` levels deep are flattened, with their
+    keys joined to the parent key by a dot (as by `pandas.json_normalize`).
+    """
+    for key, value in json_dict.items():
+        flattened_key = f"{prefix}{key}"
+        if isinstance(value, dict) and max_level > 0:
+            yield from flatten_json_object(value, max_level - 1, f"{flattened_key}.")
+        else:
+            yield flattened_key, value
+
+
+def _iter_text_chunks(json_file):
+    decoder = None
+    while chunk := json_file.read(READ_SIZE):
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                # The encoding is detected from the first four bytes.
+                while len(chunk) < 4 and (more := json_file.read(READ_SIZE)):
+                    chunk += more
+                decoder = codecs.getincrementaldecoder(json.detect_encoding(chunk))()
+            chunk = decoder.decode(chunk)
+        yield chunk
+    if decoder is not None:
+        yield decoder.decode(b'', final=True)
+
+
+class _JSONReader:
+    def __init__(self, json_file):
+        self._chunks = _iter_text_chunks(json_file)
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """
+        Append the next chunk of the file to the buffer.
+
+        The consumed part of the buffer is dropped at the same time. Returns
+        False at the end of the file.
+        """
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace, and return the next character, or None at EOF."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def advance(self):
+        self._pos += 1
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may just be cut off by the end of the buffer.
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next
+            # chunk, so we decode it again once the buffer is longer.
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def raise_error(self, message):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
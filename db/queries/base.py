@@ -5,7 +5,9 @@ from db.records.operations import select as records_select
 from db.columns.base import MathesarColumn
 from db.columns.operations.select import get_column_name_from_attnum
 from db.tables.operations.select import reflect_table_from_oid
-from db.transforms.operations.apply import apply_transformations
+from db.transforms.operations.apply import (
+    apply_transformations, apply_transformations_deprecated, apply_transformations_stepwise
+)
 from db.transforms.base import Order
 from db.metadata import get_empty_metadata
 
@@ -21,7 +23,10 @@ class DBQuery:
             # The same metadata will be used by all the methods within DBQuery
             # So make sure to change the metadata in case the DBQuery methods are called
             # after a mutation to the database object that could make the existing metadata invalid.
-            metadata=None
+            metadata=None,
+            # If True, tables already reflected into the metadata are reused
+            # as-is rather than reflected again.
+            keep_existing=False,
     ):
         self.base_table_oid = base_table_oid
         for initial_col in initial_columns:
@@ -34,6 +39,7 @@ class DBQuery:
         self.transformations = transformations
         self.name = name
         self.metadata = metadata if metadata else get_empty_metadata()
+        self.keep_existing = keep_existing
 
     def get_input_aliases(self, ix_of_transform):
         """
@@ -120,6 +126,20 @@ class DBQuery:
             **kwargs,
         )
 
+    # mirrors a method in db.records.operations.select
+    def get_records_with_count(self, **kwargs):
+        """
+        Like get_records, but also returns the total number of records,
+        found in the same query where possible.
+        """
+        fallback_to_default_ordering = not self._is_sorting_transform_used
+        return records_select.get_records_with_count(
+            table=self.transformed_relation,
+            engine=self.engine,
+            fallback_to_default_ordering=fallback_to_default_ordering,
+            **kwargs,
+        )
+
     @property
     def _is_sorting_transform_used(self):
         """
@@ -137,29 +157,28 @@ class DBQuery:
             table=self.transformed_relation, engine=self.engine, **kwargs,
         )
 
-    # NOTE if too expensive, can be rewritten to parse DBQuery spec, instead of leveraging sqlalchemy
     @property
     def all_sa_columns_map(self):
         """
-        Expensive! use with care.
+        Maps each alias that occurs anywhere in the query (initial columns,
+        intermediate transform outputs and output columns) to its SA column.
+
+        The transformed relation is built once, and the columns of every
+        intermediate step are collected along the way.
         """
+        relations = self.transformed_relations
         initial_columns_map = {
             col.name: MathesarColumn.from_column(col, engine=self.engine)
-            for col in self.initial_relation.columns
+            for col in relations[0].columns
         }
-        output_columns_map = {
-            col.name: col for col in self.sa_output_columns
+        transforms_columns_map = {
+            col.name: MathesarColumn.from_column(col, engine=self.engine)
+            for relation in relations[:-1]
+            for col in relation.columns
         }
-        transforms_columns_map = {} if self.transformations is None else {
+        output_columns_map = {
             col.name: MathesarColumn.from_column(col, engine=self.engine)
-            for i in range(len(self.transformations))
-            for col in DBQuery(
-                base_table_oid=self.base_table_oid,
-                initial_columns=self.initial_columns,
-                engine=self.engine,
-                transformations=self.transformations[:i],
-                name=f'{self.name}_{i}'
-            ).transformed_relation.columns
+            for col in relations[-1].columns
         }
         map_of_alias_to_sa_col = initial_columns_map | transforms_columns_map | output_columns_map
         return map_of_alias_to_sa_col
@@ -192,11 +211,38 @@ class DBQuery:
         else:
             return self.initial_relation
 
+    @property
+    def ordered_relation(self):
+        """
+        The transformed relation, in the same order as get_records returns
+        its records.
+        """
+        return apply_transformations_deprecated(
+            table=self.transformed_relation,
+            fallback_to_default_ordering=not self._is_sorting_transform_used,
+        )
+
+    @property
+    def transformed_relations(self):
+        """
+        The relation after each step of the query: the initial relation,
+        followed by the relation resulting from each transformation.
+        """
+        transformations = self.transformations
+        if transformations:
+            return apply_transformations_stepwise(
+                self.initial_relation,
+                transformations,
+            )
+        else:
+            return [self.initial_relation]
+
     @property
     def initial_relation(self):
         metadata = self.metadata
         base_table = reflect_table_from_oid(
-            self.base_table_oid, self.engine, metadata=metadata
+            self.base_table_oid, self.engine, metadata=metadata,
+            keep_existing=self.keep_existing,
         )
         from_clause = base_table
 
@@ -235,7 +281,8 @@ class DBQuery:
                     right = map_of_jp_subpath_to_alias[previous_and_this_jps]
                 else:
                     right = reflect_table_from_oid(
-                        jp.right_oid, self.engine, metadata=metadata
+                        jp.right_oid, self.engine, metadata=metadata,
+                        keep_existing=self.keep_existing,
                     ).alias()
                     map_of_jp_subpath_to_alias[previous_and_this_jps] = right
                 left_col, right_col = jp._get_sa_cols(left, right, self.engine, metadata)
@@ -0,0 +1,87 @@
+"""
+Functions for exporting records by streaming them out of Postgres with COPY.
+
+Rows go straight from `COPY (...) TO STDOUT` to the caller in the chunks
+psycopg receives them, so memory use doesn't grow with the export size.
+"""
+import json
+
+from psycopg import sql
+from sqlalchemy import select
+
+from db import connection as db_conn
+
+EXPORT_FORMATS = ("csv", "tsv", "ndjson")
+
+_COPY_OPTIONS = {
+    "csv": "(FORMAT csv, HEADER true)",
+    "tsv": "(FORMAT csv, HEADER true, DELIMITER E'\\t')",
+    # Each row is a single JSON text value, which never contains these
+    # control characters (JSON escapes them). So, CSV output leaves each
+    # value unquoted and unescaped on its own line.
+    "ndjson": "(FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')",
+}
+
+
+def get_table_export_query(
+        conn, table_oid, columns=None, order=None, filter=None, as_json=False
+):
+    """
+    Get a query giving the rows of a table for export.
+
+    Only columns to which the user has access are exported.
+
+    Args:
+        table_oid: The OID of the table to export.
+        columns: A list of the attnums of the columns to export, in
+            order. All columns if None.
+        order: An array of ordering definition objects.
+        filter: An array of filter definition objects.
+        as_json: Whether each row should be a single JSON object.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'build_export_query',
+        table_oid,
+        json.dumps(columns) if columns is not None else None,
+        json.dumps(order) if order is not None else None,
+        json.dumps(filter) if filter is not None else None,
+        as_json,
+    ).fetchone()[0]
+
+
+def get_relation_export_query(relation, engine, as_json=False):
+    """
+    Get a query giving the rows of an SQLAlchemy relation for export.
+
+    Returns:
+        A (query, params) tuple. The query has placeholders for the
+        params in the "pyformat" style.
+    """
+    compiled = select(relation).compile(dialect=engine.dialect)
+    query = str(compiled)
+    if as_json:
+        query = f"SELECT to_json(r)::text FROM ({query}) r"
+    return query, compiled.params
+
+
+def get_copy_statement(query, format_):
+    """Wrap a query in a COPY statement writing the given format to STDOUT."""
+    if format_ not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format_}")
+    return sql.SQL("COPY ({}) TO STDOUT {}").format(
+        sql.SQL(query), sql.SQL(_COPY_OPTIONS[format_])
+    )
+
+
+def stream_copy(conn, copy_statement, params=None):
+    """
+    Yield the output of a COPY ... TO STDOUT statement as bytes chunks.
+
+    If the generator is closed early (e.g., because the client went
+    away), psycopg cancels the running COPY.
+    """
+    with conn.cursor() as cursor:
+        with cursor.copy(copy_statement, params) as copy:
+            for data in copy:
+                yield bytes(data)
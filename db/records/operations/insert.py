@@ -1,5 +1,4 @@
 import json
-import pandas
 import tempfile
 
 from psycopg2 import sql
@@ -8,12 +7,14 @@ from psycopg2.errors import NotNullViolation, ForeignKeyViolation, DatatypeMisma
 from db import connection as db_conn
 from db.columns.exceptions import NotNullError, ForeignKeyError, TypeMismatchError, UniqueValueError, ExclusionError
 from db.columns.base import MathesarColumn
-from db.constants import ID, ID_ORIGINAL
 from db.encoding_utils import get_sql_compatible_encoding
+from db.json_stream import flatten_json_object, iter_json_values
 from db.records.operations.select import get_record
 from sqlalchemy import select
 
 READ_SIZE = 20000
+# Number of characters passed to COPY at once by copy_records_into_table.
+COPY_READ_SIZE = 1024 * 1024
 
 
 def add_record_to_table(conn, record_def, table_oid, return_record_summaries=False):
@@ -28,6 +29,26 @@ def add_record_to_table(conn, record_def, table_oid, return_record_summaries=Fal
     return result
 
 
+def add_records_to_table(
+        conn,
+        record_defs,
+        table_oid,
+        return_records=True,
+        return_record_summaries=False,
+        continue_on_error=False,
+):
+    """Add a batch of records to a table."""
+    return db_conn.exec_msar_func(
+        conn,
+        'add_records_to_table',
+        table_oid,
+        json.dumps(record_defs),
+        return_records,
+        return_record_summaries,
+        continue_on_error,
+    ).fetchone()[0]
+
+
 def insert_record_or_records(table, engine, record_data):
     """
     record_data can be a dictionary, tuple, or list of dictionaries or tuples.
@@ -59,59 +80,109 @@ def get_records_from_dataframe(df):
     return json.loads(df.to_json(orient='records'))
 
 
-def insert_records_from_json(table, engine, json_filepath, column_names, max_level):
+def insert_records_from_json(table, engine, json_filepath, column_names, max_level, json_keys):
     """
-    Normalizes JSON data and inserts it into a table.
+    Normalizes JSON data and streams it into a table via COPY.
 
     Args:
         table: Table. The table to insert JSON data into.
         engine: MockConnection. The SQLAlchemy engine.
-        json_filepath: str. The path to the stored JSON data file.
+        json_filepath: str. The path to the stored JSON (or NDJSON) data file.
         column_names: List[str]. List of column names.
         max_level: int. The depth upto which JSON dict should be flattened.
+        json_keys: List[str]. The flattened JSON keys, in the same order as
+            the column names they're stored in.
 
     Algorithm:
-        1.  We convert JSON data into Python object using json.load().
-        2.  We normalize data into a pandas dataframe using pandas.json_normalize() method.
-            The method takes column names as meta. We provide all possible keys as column
-            names, hence it adds missing keys to JSON objects and marks their values as NaN.
-        3.  We get records from the dataframe using the method get_records_from_dataframe().
-        4.  The processed data is now a list of dict objects. Each dict has same keys, that are
-            the column names of the table. We loop through each dict object, and if any value is
-            a dict or a list, we stringify them before inserting them into the table. This way,
-            our type inference logic kicks in later on converting them into
+        1.  We read the JSON objects from the file one at a time, using
+            db.json_stream.iter_json_values().
+        2.  We flatten each object up to max_level levels (as pandas.json_normalize() does),
+            and pick its values for each of the keys. Missing keys become NULL.
+        3.  If any value is a dict or a list, we stringify it. This way, our type inference
+            logic kicks in later on converting them into
             'MathesarCustomType.MATHESAR_JSON_OBJECT' and 'MathesarCustomType.MATHESAR_JSON_ARRAY'
             respectively.
-        5.  We pass data (a list of dicts) to 'insert_record_or_records()' method which inserts
-            them into the table.
+        4.  Each row is written as a CSV line, and the lines are read by COPY in chunks,
+            so the file is never held in memory as a whole.
     """
+    with open(json_filepath, 'rb') as json_file:
+        records = (
+            _get_json_record_values(obj, max_level, json_keys)
+            for obj in iter_json_values(json_file)
+        )
+        copy_records_into_table(table, engine, column_names, records)
+
 
-    with open(json_filepath, 'r') as json_file:
-        data = json.load(json_file)
+def _get_json_record_values(json_dict, max_level, json_keys):
+    flat_record = dict(flatten_json_object(json_dict, max_level))
+    return [flat_record.get(key) for key in json_keys]
 
+
+def copy_records_into_table(table, engine, column_names, records):
     """
-    data: JSON object. The data we want to normalize.
-    max_level: int. Max number of levels(depth of dict) to normalize.
-        Normalizing a dict involes flattening it and if max_level is None,
-        pandas normalizes all levels. Default max_level is kept 0.
-    meta: Fields to use as metadata for each record in resulting table. Without meta,
-        the method chooses keys from the first JSON object it encounters as column names.
-        We provide column names as meta, because we want all possible keys as columns in
-        our table and not just the keys from the first JSON object.
+    Stream records into a table via COPY.
+
+    Args:
+        table: Table. The table to insert the records into.
+        engine: The SQLAlchemy engine.
+        column_names: List[str]. The columns to insert values into.
+        records: An iterable of sequences of values, one for each column.
+            None is inserted as NULL, dicts and lists as JSON text, and
+            everything else as its string representation.
     """
-    df = pandas.json_normalize(data, max_level=max_level, meta=column_names)
-    records = get_records_from_dataframe(df)
-
-    for i, row in enumerate(records):
-        if ID in row and ID_ORIGINAL in column_names:
-            row[ID_ORIGINAL] = row.pop("id")
-        records[i] = {
-            k: json.dumps(v)
-            if (isinstance(v, dict) or isinstance(v, list))
-            else v
-            for k, v in row.items()
-        }
-    insert_record_or_records(table, engine, records)
+    relation = sql.SQL(".").join(
+        sql.Identifier(part) for part in (table.schema, table.name)
+    )
+    formatted_columns = sql.SQL(",").join(
+        sql.Identifier(column_name) for column_name in column_names
+    )
+    copy_sql = sql.SQL("COPY {relation} ({formatted_columns}) FROM STDIN CSV").format(
+        relation=relation, formatted_columns=formatted_columns,
+    )
+    lines = (_get_csv_line(values) for values in records)
+    with engine.begin() as conn:
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(copy_sql, _LineReader(lines), size=COPY_READ_SIZE)
+
+
+def _get_csv_field(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        value = 'true' if value else 'false'
+    else:
+        value = str(value)
+    # Quoting every value keeps empty strings distinct from NULL.
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _get_csv_line(values):
+    return ','.join(_get_csv_field(value) for value in values) + '\n'
+
+
+class _LineReader:
+    """A minimal file-like object reading from an iterator of lines."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ''
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(parts)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
 
 
 def insert_records_from_excel(table, engine, dataframe):
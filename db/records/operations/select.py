@@ -1,3 +1,4 @@
+from functools import partial
 import json
 from sqlalchemy import select
 from sqlalchemy.sql.functions import count
@@ -10,6 +11,11 @@ from db.types.operations.convert import get_db_type_enum_from_id
 from db.utils import execute_pg_query
 from db.transforms.operations.apply import apply_transformations_deprecated
 
+COUNT_MODES = ("exact", "estimated", "exact_if_cheap", "none")
+# Mirrors `cheap_count_limit` in msar.build_count_cte_expr.
+CHEAP_COUNT_LIMIT = 100000
+WINDOW_COUNT_COLUMN = "__mathesar_window_count"
+
 
 def list_records_from_table(
         conn,
@@ -19,7 +25,9 @@ def list_records_from_table(
         order=None,
         filter=None,
         group=None,
-        return_record_summaries=False
+        return_record_summaries=False,
+        count_mode='exact',
+        cursor=None,
 ):
     """
     Get records from a table.
@@ -37,6 +45,12 @@ def list_records_from_table(
         order: An array of ordering definition objects.
         filter: An array of filter definition objects.
         group: An array of group definition objects.
+        count_mode: One of 'exact', 'estimated', 'exact_if_cheap', or
+                 'none'; determines how the total row count is found.
+        cursor: A list of values of the total ordering columns for the last
+                 row of the previous page. If given (even empty), only
+                 following rows are returned, and the result has a
+                 `next_cursor`.
     """
     result = db_conn.exec_msar_func(
         conn,
@@ -47,11 +61,39 @@ def list_records_from_table(
         json.dumps(order) if order is not None else None,
         json.dumps(filter) if filter is not None else None,
         json.dumps(group) if group is not None else None,
-        return_record_summaries
+        return_record_summaries,
+        count_mode,
+        json.dumps(cursor) if cursor is not None else None,
     ).fetchone()[0]
     return result
 
 
+def get_list_records_query(
+        conn,
+        table_oid,
+        limit=None,
+        offset=None,
+        order=None,
+        filter=None,
+        cursor=None,
+):
+    """
+    Get the main query `list_records_from_table` would run, without running it.
+
+    Args are as for `list_records_from_table`.
+    """
+    return db_conn.exec_msar_func(
+        conn,
+        'build_list_records_query',
+        table_oid,
+        limit,
+        offset,
+        json.dumps(order) if order is not None else None,
+        json.dumps(filter) if filter is not None else None,
+        json.dumps(cursor) if cursor is not None else None,
+    ).fetchone()[0]
+
+
 def get_record_from_table(
         conn,
         record_id,
@@ -83,6 +125,7 @@ def search_records_from_table(
         search=[],
         limit=10,
         return_record_summaries=False,
+        fuzzy=False,
 ):
     """
     Get records from a table, according to a search specification
@@ -93,6 +136,7 @@ def search_records_from_table(
         tab_id: The OID of the table whose records we'll get.
         search: A list of dictionaries defining a search.
         limit: The maximum number of rows we'll return.
+        fuzzy: Whether strings similar to a searched literal also match.
 
     The search definition objects should have the form
     {"attnum": <int>, "literal": <text>}
@@ -100,11 +144,23 @@ def search_records_from_table(
     search = search or []
     result = db_conn.exec_msar_func(
         conn, 'search_records_from_table',
-        table_oid, json.dumps(search), limit, return_record_summaries
+        table_oid, json.dumps(search), limit, return_record_summaries, fuzzy
     ).fetchone()[0]
     return result
 
 
+def get_search_records_query(conn, table_oid, search=[], limit=10, fuzzy=False):
+    """
+    Get the main query `search_records_from_table` would run, without running it.
+
+    Args are as for `search_records_from_table`.
+    """
+    return db_conn.exec_msar_func(
+        conn, 'build_search_records_query',
+        table_oid, json.dumps(search or []), limit, fuzzy
+    ).fetchone()[0]
+
+
 def get_record(table, engine, id_value):
     primary_key_column = get_primary_key_column(table)
     pg_query = select(table).where(primary_key_column == id_value)
@@ -162,9 +218,29 @@ def get_records(
     return execute_pg_query(engine, relation)
 
 
-def get_count(table, engine, filter=None, search=None):
+def get_count(table, engine, filter=None, search=None, count_mode="exact"):
+    """
+    Returns the number of rows of a relation, after filtering and searching.
+
+    Args:
+        count_mode: How to count the rows, as for get_records_with_count.
+                    For 'none', the count is None.
+    """
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {count_mode}")
     if search is None:
         search = []
+    if count_mode == "none":
+        return None
+    if count_mode != "exact":
+        estimate = get_estimated_count(
+            apply_transformations_deprecated(table=table, filter=filter, search=search),
+            engine,
+        )
+        if estimate is not None and (
+            count_mode == "estimated" or estimate > CHEAP_COUNT_LIMIT
+        ):
+            return estimate
     col_name = "_count"
     columns_to_select = [
         count(1).label(col_name)
@@ -182,6 +258,90 @@ def get_count(table, engine, filter=None, search=None):
     return execute_pg_query(engine, relation)[0][col_name]
 
 
+def get_records_with_count(
+    table,
+    engine,
+    limit=None,
+    offset=None,
+    fallback_to_default_ordering=False,
+    count_mode="exact",
+):
+    """
+    Returns a page of records from a relation, and its total row count.
+
+    For exact counts, the count is found in the same query as the page by
+    a `count(1) OVER ()` window, so the relation is only evaluated once.
+
+    Args:
+        table:           SQLAlchemy table or other relation
+        engine:          SQLAlchemy engine object
+        limit:           int, gives number of rows to return
+        offset:          int, gives number of rows to skip
+        count_mode:      How to count the rows. One of:
+                         - 'exact': Count all rows.
+                         - 'estimated': Use the planner's row estimate.
+                         - 'exact_if_cheap': Count exactly if the estimate is
+                           small, otherwise use the estimate.
+                         - 'none': Don't count. The count will be None.
+
+    Returns:
+        A (records, count) tuple.
+    """
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {count_mode}")
+    get_page = partial(
+        get_records,
+        engine=engine,
+        limit=limit,
+        offset=offset,
+        fallback_to_default_ordering=fallback_to_default_ordering,
+    )
+    if count_mode == "none":
+        return get_page(table=table), None
+    if count_mode != "exact":
+        estimate = get_estimated_count(table, engine)
+        if estimate is not None and (
+            count_mode == "estimated" or estimate > CHEAP_COUNT_LIMIT
+        ):
+            return get_page(table=table), estimate
+    counted = select(
+        *table.columns, count(1).over().label(WINDOW_COUNT_COLUMN)
+    ).select_from(table).cte()
+    records = []
+    total_count = None
+    for record in get_page(table=counted):
+        record_dict = record._asdict()
+        total_count = record_dict.pop(WINDOW_COUNT_COLUMN)
+        records.append(record_dict)
+    if total_count is None:
+        # An empty page carries no count, so we need to count separately,
+        # unless the page is empty because the relation is.
+        total_count = get_count(table, engine) if offset or limit == 0 else 0
+    return records, total_count
+
+
+def get_estimated_count(table, engine):
+    """
+    Returns the planner's estimate of the number of rows in a relation.
+
+    Returns None if the estimate couldn't be found.
+    """
+    compiled = select(table).compile(dialect=engine.dialect)
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            plan = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
 def get_column_cast_records(engine, table, column_definitions, num_records=20):
     assert len(column_definitions) == len(table.columns)
     cast_expression_list = [
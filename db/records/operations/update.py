@@ -20,6 +20,26 @@ def patch_record_in_table(conn, record_def, record_id, table_oid, return_record_
     return result
 
 
+def patch_records_in_table(
+        conn,
+        record_defs,
+        table_oid,
+        return_records=True,
+        return_record_summaries=False,
+        continue_on_error=False,
+):
+    """Update a batch of records in a table."""
+    return db_conn.exec_msar_func(
+        conn,
+        'patch_records_in_table',
+        table_oid,
+        json.dumps(record_defs),
+        return_records,
+        return_record_summaries,
+        continue_on_error,
+    ).fetchone()[0]
+
+
 def update_record(table, engine, id_value, record_data):
     primary_key_column = get_primary_key_column(table)
     with engine.begin() as connection:
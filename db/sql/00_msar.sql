@@ -3470,6 +3470,30 @@ END;
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION msar.get_type_inference_sequence() RETURNS regtype[] AS $$/*
+Return the types we try when inferring the type of a `text` column, in the order we try them.
+
+Types which don't exist in the database (e.g., if the mathesar_types schema is missing) are skipped.
+*/
+SELECT array_agg(pg_catalog.to_regtype(t) ORDER BY ord)
+  FILTER (WHERE pg_catalog.to_regtype(t) IS NOT NULL)
+FROM unnest(ARRAY[
+  'boolean',
+  'date',
+  'numeric',
+  'mathesar_types.mathesar_money',
+  'timestamp without time zone',
+  'timestamp with time zone',
+  'time without time zone',
+  'interval',
+  'mathesar_types.email',
+  'mathesar_types.mathesar_json_array',
+  'mathesar_types.mathesar_json_object',
+  'mathesar_types.uri'
+]) WITH ORDINALITY AS x(t, ord);
+$$ LANGUAGE SQL STABLE;
+
+
 CREATE OR REPLACE FUNCTION
 msar.infer_column_data_type(tab_id regclass, col_id smallint) RETURNS regtype AS $$/*
 Infer the best type for a given column.
@@ -3483,27 +3507,10 @@ Args:
 */
 DECLARE
   inferred_type regtype;
-  infer_sequence_raw text[] := ARRAY[
-    'boolean',
-    'date',
-    'numeric',
-    'mathesar_types.mathesar_money',
-    'timestamp without time zone',
-    'timestamp with time zone',
-    'time without time zone',
-    'interval',
-    'mathesar_types.email',
-    'mathesar_types.mathesar_json_array',
-    'mathesar_types.mathesar_json_object',
-    'mathesar_types.uri'
-  ];
-  infer_sequence regtype[];
+  infer_sequence regtype[] := msar.get_type_inference_sequence();
   column_nonempty boolean;
   test_type regtype;
 BEGIN
-  infer_sequence := array_agg(pg_catalog.to_regtype(t))
-    FILTER (WHERE pg_catalog.to_regtype(t) IS NOT NULL)
-    FROM unnest(infer_sequence_raw) AS x(t);
   EXECUTE format(
     'SELECT EXISTS (SELECT 1 FROM %1$I.%2$I WHERE %3$I IS NOT NULL)',
     msar.get_relation_schema_name(tab_id),
@@ -3563,6 +3570,191 @@ WHERE
 $$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.infer_table_column_data_types_sampled(
+  tab_id regclass,
+  sample_size integer DEFAULT 10000,
+  confirm boolean DEFAULT true
+) RETURNS jsonb AS $$/*
+Infer the best type for each column in the table from a sample of its rows.
+
+Whereas msar.infer_table_column_data_types scans the whole table once per candidate type per
+column, this reads at most `sample_size` rows of the table in a single query, and tests all
+candidate types for all `text` columns against that sample. Half of the sample comes from the start
+of the table, and the rest is drawn at random using TABLESAMPLE. Tables with no more rows than
+`sample_size` are read in full.
+
+Args:
+  tab_id: The OID of the table whose columns we're inferring types for.
+  sample_size: The maximum number of rows to read for the sample.
+  confirm: Whether to check each type inferred from the sample against the whole table. If that
+    check fails, we fall back to msar.infer_column_data_type for the column.
+
+The response JSON will have attnum keys, and values will be objects of the form:
+  {"type": <format_type of the inferred type>, "confidence": <number>, "confirmed": <boolean>}
+
+The confidence is 1 if the inferred type is known to work for every row (i.e., the column isn't
+`text`, the whole table was sampled, or the type was confirmed), and otherwise the estimated
+fraction of the table's rows that were sampled. If the table has more rows than `sample_size`, but
+its size isn't known (i.e., it was never analyzed, as right after an import), only the start of the
+table is sampled, and the confidence is null. Restricted to columns to which the user has access.
+
+All inferred types are confirmed in a single scan of the table. Only if that fails are they checked
+one column at a time.
+*/
+DECLARE
+  infer_sequence regtype[] := msar.get_type_inference_sequence();
+  text_col_ids smallint[];
+  estimated_rows double precision;
+  sample_expr text;
+  sample_values text[];
+  sampled_rows integer;
+  sample_confidence numeric;
+  col_idx integer;
+  col_values text[];
+  inferred_type regtype;
+  test_type regtype;
+  col_confirmed boolean;
+  inferred_types regtype[] := '{}';
+  col_confirmations boolean[] := '{}';
+  unconfirmed_col_idxs integer[] := '{}';
+  type_info jsonb;
+BEGIN
+  SELECT jsonb_object_agg(
+    attnum,
+    jsonb_build_object(
+      'type', pg_catalog.format_type(atttypid, null), 'confidence', 1, 'confirmed', true
+    )
+  ) FILTER (WHERE atttypid <> 'text'::regtype),
+  array_agg(attnum ORDER BY attnum) FILTER (WHERE atttypid = 'text'::regtype)
+  INTO type_info, text_col_ids
+  FROM pg_catalog.pg_attribute
+  WHERE
+    attrelid = tab_id
+    AND attnum > 0
+    AND NOT attisdropped
+    AND has_column_privilege(attrelid, attnum, 'SELECT');
+  type_info := COALESCE(type_info, '{}'::jsonb);
+  IF text_col_ids IS NULL THEN
+    RETURN type_info;
+  END IF;
+  -- A negative reltuples means the table was never analyzed. The count of live tuples kept by the
+  -- statistics system is then the best estimate, if there is one.
+  SELECT CASE WHEN c.reltuples >= 0 THEN c.reltuples ELSE nullif(s.n_live_tup, 0) END
+  INTO estimated_rows
+  FROM pg_catalog.pg_class c LEFT JOIN pg_catalog.pg_stat_all_tables s ON s.relid = c.oid
+  WHERE c.oid = tab_id;
+  sample_expr := format(
+    'SELECT ARRAY[%1$s] AS sample_row FROM %2$I.%3$I',
+    (
+      SELECT string_agg(format('%I', msar.get_column_name(tab_id, col_id)), ', ' ORDER BY col_id)
+      FROM unnest(text_col_ids) AS x(col_id)
+    ),
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id)
+  );
+  IF estimated_rows > sample_size THEN
+    sample_expr := format(
+      '(%1$s LIMIT %2$s) UNION ALL (%1$s TABLESAMPLE SYSTEM (%3$s) LIMIT %4$s)',
+      sample_expr,
+      sample_size / 2,
+      least(100, 200 * (sample_size - sample_size / 2) / estimated_rows),
+      sample_size - sample_size / 2
+    );
+  ELSE
+    -- One extra row tells us whether the whole table was read.
+    sample_expr := format('%s LIMIT %s', sample_expr, sample_size + 1);
+  END IF;
+  EXECUTE format(
+    'SELECT array_agg(sample_row), count(*) FROM (%s) AS sample_rows', sample_expr
+  ) INTO sample_values, sampled_rows;
+  sample_confidence := CASE
+    WHEN estimated_rows > sample_size THEN
+      round(sampled_rows / greatest(estimated_rows, sampled_rows + 1)::numeric, 4)
+    WHEN sampled_rows <= sample_size THEN 1
+    -- Otherwise, only the start of a table of unknown size was read.
+  END;
+  FOR col_idx IN 1..array_length(text_col_ids, 1) LOOP
+    inferred_type := 'text'::regtype;
+    col_values := ARRAY(
+      SELECT v FROM unnest(sample_values[:][col_idx:col_idx]) AS x(v) WHERE v IS NOT NULL
+    );
+    IF cardinality(col_values) > 0 THEN
+      FOREACH test_type IN ARRAY infer_sequence LOOP
+        BEGIN
+          EXECUTE format(
+            'SELECT count(%s) FROM unnest($1) AS x(v)', __msar.build_cast_expr('x.v', test_type::text)
+          ) USING col_values;
+          inferred_type := test_type;
+          EXIT;
+        EXCEPTION WHEN OTHERS THEN
+          -- do nothing, just try the next type.
+        END;
+      END LOOP;
+    END IF;
+    col_confirmed := COALESCE(sample_confidence = 1, false);
+    IF inferred_type = 'text'::regtype AND cardinality(col_values) > 0 THEN
+      -- No candidate type fits the sample, so none will fit the whole column.
+      col_confirmed := true;
+    ELSIF confirm AND NOT col_confirmed THEN
+      IF inferred_type = 'text'::regtype THEN
+        -- The sampled values were all null.
+        inferred_type := msar.infer_column_data_type(tab_id, text_col_ids[col_idx]);
+      ELSE
+        unconfirmed_col_idxs := unconfirmed_col_idxs || col_idx;
+      END IF;
+      col_confirmed := true;
+    END IF;
+    inferred_types := inferred_types || inferred_type;
+    col_confirmations := col_confirmations || col_confirmed;
+  END LOOP;
+  IF cardinality(unconfirmed_col_idxs) > 0 THEN
+    BEGIN
+      EXECUTE format(
+        'SELECT %1$s FROM %2$I.%3$I',
+        (
+          SELECT string_agg(
+            format(
+              'count(%s)', msar.build_cast_expr(tab_id, text_col_ids[i], inferred_types[i])
+            ),
+            ', '
+          )
+          FROM unnest(unconfirmed_col_idxs) AS x(i)
+        ),
+        msar.get_relation_schema_name(tab_id),
+        msar.get_relation_name(tab_id)
+      );
+    EXCEPTION WHEN OTHERS THEN
+      -- Some inferred type doesn't fit its whole column, so find which by checking each.
+      FOREACH col_idx IN ARRAY unconfirmed_col_idxs LOOP
+        BEGIN
+          EXECUTE format(
+            'SELECT count(%1$s) FROM %2$I.%3$I',
+            msar.build_cast_expr(tab_id, text_col_ids[col_idx], inferred_types[col_idx]),
+            msar.get_relation_schema_name(tab_id),
+            msar.get_relation_name(tab_id)
+          );
+        EXCEPTION WHEN OTHERS THEN
+          inferred_types[col_idx] := msar.infer_column_data_type(tab_id, text_col_ids[col_idx]);
+        END;
+      END LOOP;
+    END;
+  END IF;
+  FOR col_idx IN 1..array_length(text_col_ids, 1) LOOP
+    type_info := type_info || jsonb_build_object(
+      text_col_ids[col_idx],
+      jsonb_build_object(
+        'type', pg_catalog.format_type(inferred_types[col_idx], null),
+        'confidence', CASE WHEN col_confirmations[col_idx] THEN 1 ELSE sample_confidence END,
+        'confirmed', col_confirmations[col_idx]
+      )
+    );
+  END LOOP;
+  RETURN type_info;
+END;
+$$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
+
+
 CREATE OR REPLACE FUNCTION
 __msar.build_col_drop_default_expr(tab_id oid, col_id integer, new_type text, new_default jsonb)
   RETURNS TEXT AS $$/*
@@ -4287,6 +4479,185 @@ $$ LANGUAGE plpgsql;
 ----------------------------------------------------------------------------------------------------
 ----------------------------------------------------------------------------------------------------
 
+-- Catalog fragment caching
+--
+-- Building the SQL for listing records involves a lot of catalog lookups (e.g., finding the
+-- columns the user can see, foreign keys, and summary templates), but the resulting fragments only
+-- change with DDL. We cache them per session, keyed by table, role, and a catalog version which an
+-- event trigger bumps on every DDL command.
+--
+-- The version is kept in a sequence rather than a table row, since `nextval` takes no row lock, so
+-- concurrent DDL transactions don't wait on each other to bump it. As `nextval` isn't
+-- transactional, the DDL of a version may not be visible yet when it's read. DDL transactions hold
+-- a shared advisory lock until they end, so readers can tell, and don't cache fragments then.
+
+DROP TABLE IF EXISTS msar.catalog_version;
+CREATE SEQUENCE IF NOT EXISTS msar.catalog_version_seq AS bigint MINVALUE 0 START 0;
+
+
+CREATE OR REPLACE FUNCTION msar.lock_catalog_version(exclusive boolean) RETURNS boolean AS $$/*
+Take the advisory lock guarding the catalog version.
+
+Args:
+  exclusive: Whether to try to take the lock exclusively, at the session level. Otherwise, the
+    lock is taken shared, and held until the end of the transaction.
+
+Returns:
+  Whether the lock was taken. A shared lock is always taken.
+*/
+BEGIN
+  IF exclusive THEN
+    RETURN pg_catalog.pg_try_advisory_lock('msar.catalog_version_seq'::regclass::oid::integer, 0);
+  END IF;
+  PERFORM pg_catalog.pg_advisory_xact_lock_shared(
+    'msar.catalog_version_seq'::regclass::oid::integer, 0
+  );
+  RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION __msar.bump_catalog_version() RETURNS event_trigger AS $$/*
+Increment the catalog version, invalidating all cached catalog fragments.
+
+Run by the `msar_bump_catalog_version` event trigger at the end of each DDL command.
+*/
+BEGIN
+  -- Taken before bumping, so the lock is held whenever the version is ahead of committed DDL.
+  PERFORM msar.lock_catalog_version(false);
+  PERFORM pg_catalog.nextval('msar.catalog_version_seq');
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp;
+
+
+DO $$
+BEGIN
+  DROP EVENT TRIGGER IF EXISTS msar_bump_catalog_version;
+  CREATE EVENT TRIGGER msar_bump_catalog_version ON ddl_command_end
+    EXECUTE FUNCTION __msar.bump_catalog_version();
+EXCEPTION WHEN insufficient_privilege THEN
+  -- Only superusers may create event triggers. Without it, fragments are never cached.
+  RAISE NOTICE 'Could not create the msar_bump_catalog_version event trigger; catalog fragments will not be cached.';
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION msar.get_catalog_version() RETURNS bigint AS $$/*
+Return the current catalog version, or NULL if DDL isn't being tracked.
+
+DDL is tracked only if the `msar_bump_catalog_version` event trigger is installed and enabled.
+*/
+SELECT last_value FROM msar.catalog_version_seq
+WHERE EXISTS (
+  SELECT 1 FROM pg_catalog.pg_event_trigger
+  WHERE evtname = 'msar_bump_catalog_version' AND evtenabled <> 'D'
+);
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION msar.is_catalog_version_settled() RETURNS boolean AS $$/*
+Return whether the DDL of all catalog versions read so far is visible to new snapshots.
+
+That's the case unless another transaction running DDL hasn't ended yet. In a transaction using a
+single snapshot (i.e., not READ COMMITTED), DDL committed since it started isn't visible, so this
+returns false.
+*/
+BEGIN
+  IF current_setting('transaction_isolation') <> 'read committed' THEN
+    RETURN false;
+  END IF;
+  IF NOT msar.lock_catalog_version(true) THEN
+    RETURN false;
+  END IF;
+  PERFORM pg_catalog.pg_advisory_unlock('msar.catalog_version_seq'::regclass::oid::integer, 0);
+  RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION msar.get_settled_catalog_version() RETURNS bigint AS $$/*
+Return the current catalog version, or NULL if its DDL may not be visible to other sessions yet.
+
+Use this to cache what other sessions read from the catalog (e.g., tables reflected through another
+connection). Unlike with `msar.is_catalog_version_settled`, DDL run by the current transaction
+counts as not settled, since other sessions can't see it until the transaction commits.
+*/
+DECLARE
+  catalog_version bigint := msar.get_catalog_version();
+BEGIN
+  IF catalog_version IS NULL THEN
+    RETURN NULL;
+  END IF;
+  -- This transaction ran DDL. Our own shared lock wouldn't keep us from taking the exclusive one.
+  IF EXISTS (
+    SELECT 1 FROM pg_catalog.pg_locks
+    WHERE
+      locktype = 'advisory'
+      AND pid = pg_catalog.pg_backend_pid()
+      AND classid = 'msar.catalog_version_seq'::regclass::oid
+      AND objid = 0
+      AND objsubid = 2
+  ) THEN
+    RETURN NULL;
+  END IF;
+  IF NOT msar.lock_catalog_version(true) THEN
+    RETURN NULL;
+  END IF;
+  PERFORM pg_catalog.pg_advisory_unlock('msar.catalog_version_seq'::regclass::oid::integer, 0);
+  RETURN catalog_version;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_cached_fragment(tab_id oid, fragment_key text, build_query text) RETURNS text AS $$/*
+Return an SQL fragment for a table, building it only if it's not cached for the current catalog
+version and role.
+
+Fragments are cached in session-level settings, so they're kept across transactions on the same
+connection, and discarded if the transaction that cached them is rolled back. Note that changes to
+role membership aren't DDL, so fragments depending on privileges granted through role membership
+are only refreshed after the next DDL command.
+
+Args:
+  tab_id: The OID of the table the fragment is for.
+  fragment_key: Identifies the fragment among those for the table. Must consist of letters,
+    digits, and underscores.
+  build_query: A query returning the fragment, given the table OID as $1.
+*/
+DECLARE
+  catalog_version text := msar.get_catalog_version()::text;
+  setting_name text;
+  cached_value text;
+  fragment text;
+BEGIN
+  IF catalog_version IS NOT NULL THEN
+    setting_name := format(
+      'msar_fragment_cache.t%s_r%s_%s',
+      tab_id,
+      quote_ident(current_user)::regrole::oid,
+      fragment_key
+    );
+    cached_value := current_setting(setting_name, true);
+    -- Cached values are '<version>:' for NULL fragments, and '<version>:=<fragment>' otherwise.
+    IF starts_with(cached_value, catalog_version || ':') THEN
+      RETURN substr(cached_value, length(catalog_version) + 3);
+    END IF;
+  END IF;
+  -- Checked before building, so the build sees the DDL of the version. Otherwise, the fragment is
+  -- built but not cached.
+  IF catalog_version IS NOT NULL AND NOT msar.is_catalog_version_settled() THEN
+    catalog_version := NULL;
+  END IF;
+  EXECUTE build_query INTO fragment USING tab_id;
+  IF catalog_version IS NOT NULL THEN
+    PERFORM set_config(setting_name, catalog_version || ':' || COALESCE('=' || fragment, ''), false);
+  END IF;
+  RETURN fragment;
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- Data type formatting functions
 
 
@@ -4395,10 +4766,46 @@ INSERT INTO msar.expr_templates VALUES
   ('format_data', 'msar.format_data(%s)')
 ;
 
+CREATE OR REPLACE FUNCTION
+msar.build_in_json_array_expr(rel_id oid, col_tree jsonb, arr_tree jsonb) RETURNS text AS $$/*
+Build an expression checking whether a column's value is in a JSON array of literal values.
+
+The values are cast to the type of the column once, and compared with the raw column, so the
+expression can use an index on the column (unlike `element_in_json_array_untyped`).
+
+Args:
+  rel_id: The OID of the relation containing the column.
+  col_tree: An `attnum` expression tree defining the column.
+  arr_tree: A `literal` expression tree whose value is a JSON array.
+*/
+DECLARE
+  col_type text;
+BEGIN
+  IF col_tree ->> 'type' <> 'attnum' OR arr_tree ->> 'type' <> 'literal' THEN
+    RAISE EXCEPTION 'in_json_array requires an attnum and a literal argument';
+  END IF;
+  SELECT pg_catalog.format_type(atttypid, null) INTO col_type
+  FROM pg_catalog.pg_attribute
+  WHERE attrelid = rel_id AND attnum = (col_tree ->> 'value')::smallint AND NOT attisdropped;
+  IF col_type IS NULL THEN
+    RAISE EXCEPTION 'Column % does not exist', col_tree ->> 'value';
+  END IF;
+  RETURN format(
+    '(%1$s) = ANY(%2$L::%3$s[])',
+    msar.build_expr(rel_id, col_tree),
+    ARRAY(SELECT jsonb_array_elements_text(arr_tree -> 'value'))::text,
+    col_type
+  );
+END;
+$$ LANGUAGE plpgsql STABLE RETURNS NULL ON NULL INPUT;
+
+
 CREATE OR REPLACE FUNCTION msar.build_expr(rel_id oid, tree jsonb) RETURNS text AS $$
 SELECT CASE tree ->> 'type'
   WHEN 'literal' THEN format('%L', tree ->> 'value')
   WHEN 'attnum' THEN format('%I', msar.get_column_name(rel_id, (tree ->> 'value')::smallint))
+  WHEN 'in_json_array' THEN
+    msar.build_in_json_array_expr(rel_id, tree -> 'args' -> 0, tree -> 'args' -> 1)
   ELSE
     format(max(expr_template), VARIADIC array_agg(msar.build_expr(rel_id, inner_tree)))
 END
@@ -4460,24 +4867,145 @@ $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
 CREATE OR REPLACE FUNCTION
-msar.build_total_order_expr(tab_id oid, order_ jsonb) RETURNS text AS $$/*
-Build a deterministic order expression for the given table and order JSON.
+msar.get_total_order_list(tab_id oid, order_ jsonb) RETURNS jsonb AS $$/*
+Return a JSONB array of ordering definitions that totally (deterministically) orders the table.
+
+The given ordering is extended with either the primary key, or all orderable columns. Only columns
+to which the user has access are included.
+
 Args:
   tab_id: The OID of the table whose columns we'll order by.
   order_: A JSONB array defining any desired ordering of columns.
 */
-SELECT string_agg(format('%I %s', attnum, msar.sanitize_direction(direction)), ', ')
-FROM jsonb_to_recordset(
+SELECT COALESCE(
+  jsonb_agg(
+    jsonb_build_object('attnum', attnum, 'direction', msar.sanitize_direction(direction))
+    ORDER BY ordinality
+  ),
+  '[]'::jsonb
+)
+FROM ROWS FROM(
+  jsonb_to_recordset(
     COALESCE(
       COALESCE(order_, '[]'::jsonb) || msar.get_pkey_order(tab_id),
       COALESCE(order_, '[]'::jsonb) || msar.get_total_order(tab_id)
     )
-)
-  AS x(attnum smallint, direction text)
+  ) AS (attnum smallint, direction text)
+) WITH ORDINALITY AS x(attnum, direction, ordinality)
 WHERE has_column_privilege(tab_id, attnum, 'SELECT');
 $$ LANGUAGE SQL STABLE;
 
 
+CREATE OR REPLACE FUNCTION
+msar.build_total_order_expr(tab_id oid, order_ jsonb) RETURNS text AS $$/*
+Build a deterministic order expression for the given table and order JSON.
+Args:
+  tab_id: The OID of the table whose columns we'll order by.
+  order_: A JSONB array defining any desired ordering of columns.
+*/
+SELECT string_agg(format('%I %s', attnum, direction), ', ')
+FROM jsonb_to_recordset(msar.get_total_order_list(tab_id, order_))
+  AS x(attnum smallint, direction text);
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_seek_expr(tab_id oid, order_ jsonb, cursor_ jsonb) RETURNS text AS $$/*
+Build a boolean expression selecting the rows that come after the cursor in the total ordering.
+
+This lets us page through records by seeking past the last row of the previous page (keyset
+pagination), rather than by counting and discarding all preceding rows with OFFSET.
+
+The total ordering is the one produced by `msar.build_total_order_expr`. When every column of the
+ordering is NOT NULL, is ordered in the same direction, and the cursor holds no NULLs, we produce a
+single row-value comparison, e.g., `(msar.format_data(a), msar.format_data(id)) > ('x', '3')`, which
+can use a matching index. Otherwise, we expand the comparison column by column, taking into account
+that NULLs sort last for ascending columns and first for descending columns.
+
+Args:
+  tab_id: The OID of the table whose records we're paging through.
+  order_: A JSONB array defining any desired ordering of columns.
+  cursor_: A JSONB array of the values of the columns of the total ordering for the last row of the
+    previous page, as returned in the `next_cursor` of `msar.list_records_from_table`. An empty
+    array means we start from the beginning, and no expression is produced.
+*/
+WITH order_cte AS (
+  SELECT
+    ordinality,
+    direction,
+    format('msar.format_data(%I)', attname) AS col_expr,
+    cursor_ -> (ordinality::integer - 1) #>> '{}' AS val,
+    attnotnull
+  FROM ROWS FROM(
+    jsonb_to_recordset(msar.get_total_order_list(tab_id, order_))
+      AS (attnum smallint, direction text)
+  ) WITH ORDINALITY AS x(attnum, direction, ordinality)
+    INNER JOIN pg_catalog.pg_attribute ON attrelid = tab_id AND pg_attribute.attnum = x.attnum
+), comparison_cte AS (
+  SELECT
+    ordinality,
+    CASE
+      WHEN val IS NULL THEN col_expr || ' IS NULL'
+      ELSE format('%s = %L', col_expr, val)
+    END AS eq_expr,
+    CASE
+      WHEN direction = 'ASC' AND val IS NULL THEN 'false'
+      WHEN direction = 'ASC' THEN format('(%1$s > %2$L OR %1$s IS NULL)', col_expr, val)
+      WHEN val IS NULL THEN col_expr || ' IS NOT NULL'
+      ELSE format('%s < %L', col_expr, val)
+    END AS after_expr
+  FROM order_cte
+), seek_cte AS (
+  SELECT
+    concat_ws(
+      ' AND ',
+      string_agg(eq_expr, ' AND ') OVER (
+        ORDER BY ordinality ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+      ),
+      after_expr
+    ) AS seek_step_expr,
+    ordinality
+  FROM comparison_cte
+)
+SELECT CASE
+  WHEN jsonb_array_length(cursor_) = 0 THEN NULL
+  WHEN (SELECT count(DISTINCT direction) = 1 AND bool_and(attnotnull AND val IS NOT NULL) FROM order_cte)
+  THEN (
+    SELECT format(
+      '(%s) %s (%s)',
+      string_agg(col_expr, ', ' ORDER BY ordinality),
+      CASE WHEN max(direction) = 'ASC' THEN '>' ELSE '<' END,
+      string_agg(format('%L', val), ', ' ORDER BY ordinality)
+    )
+    FROM order_cte
+  )
+  ELSE (SELECT string_agg('(' || seek_step_expr || ')', ' OR ' ORDER BY ordinality) FROM seek_cte)
+END;
+$$ LANGUAGE SQL STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_next_cursor_expr(tab_id oid, cte_name text, order_ jsonb) RETURNS text AS $$/*
+Build an expression giving the cursor of the given row (in the given CTE) for keyset pagination.
+
+The cursor is a JSONB array of the row's values for the columns of the total ordering, and can be
+passed to `msar.build_seek_expr` to get the following rows.
+
+Args:
+  tab_id: The OID of the table whose records we're paging through.
+  cte_name: The name of the CTE whose row we'll make the cursor from.
+  order_: A JSONB array defining any desired ordering of columns.
+*/
+SELECT format(
+  'jsonb_build_array(%s)',
+  string_agg(format('%I.%I', cte_name, attnum), ', ' ORDER BY ordinality)
+)
+FROM ROWS FROM(
+  jsonb_to_recordset(msar.get_total_order_list(tab_id, order_)) AS (attnum smallint, direction text)
+) WITH ORDINALITY AS x(attnum, direction, ordinality);
+$$ LANGUAGE SQL STABLE;
+
+
 CREATE OR REPLACE FUNCTION
 msar.build_order_by_expr(tab_id oid, order_ jsonb) RETURNS text AS $$/*
 Build an ORDER BY expression for the given table and order JSON.
@@ -4495,9 +5023,16 @@ SELECT 'ORDER BY ' || msar.build_total_order_expr(tab_id, order_)
 $$ LANGUAGE SQL STABLE;
 
 
+DROP FUNCTION IF EXISTS msar.build_grouping_columns_expr(oid, jsonb);
+DROP FUNCTION IF EXISTS msar.build_group_id_expr(oid, jsonb);
+DROP FUNCTION IF EXISTS msar.build_group_count_expr(oid, jsonb);
 CREATE OR REPLACE FUNCTION
-msar.build_grouping_columns_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
-Build a column expression for use in grouping window functions.
+msar.get_grouping_column_exprs(tab_id oid, group_ jsonb)
+RETURNS TABLE (col_id text, ordinality bigint, expr_template text, expr text) AS $$/*
+List the (potentially transformed by preproc functions) column expressions of a grouping.
+
+Only columns to which the user has access are listed. Columns are referred to by their names, so the
+expressions are meant to be evaluated against the table itself.
 
 Args:
   tab_id: The OID of the table whose records we're grouping
@@ -4513,47 +5048,35 @@ The items in the preproc array should be keys appearing in the
 `expr_templates` table. The corresponding column will be wrapped
 in the preproc function before grouping.
 */
-SELECT string_agg(
+SELECT
+  col_id,
+  ordinality,
+  expr_template,
   COALESCE(
     format(expr_template, quote_ident(msar.get_column_name(tab_id, col_id::smallint))),
     quote_ident(msar.get_column_name(tab_id, col_id::smallint))
-  ), ', ' ORDER BY ordinality
-)
+  )
 FROM msar.expr_templates RIGHT JOIN ROWS FROM(
   jsonb_array_elements_text(group_ -> 'columns'),
   jsonb_array_elements_text(group_ -> 'preproc')
 ) WITH ORDINALITY AS x(col_id, preproc) ON expr_key = preproc
 WHERE has_column_privilege(tab_id, col_id::smallint, 'SELECT');
-$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
-
-
-CREATE OR REPLACE FUNCTION
-msar.build_group_id_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
-Build an expression to define an id value for each group.
-*/
-SELECT 'dense_rank() OVER (ORDER BY ' || msar.build_grouping_columns_expr(tab_id, group_) || ')';
-$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
-
-
-CREATE OR REPLACE FUNCTION
-msar.build_group_count_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
-Build an expression that adds a column with a count for each group.
-*/
-SELECT 'count(1) OVER (PARTITION BY ' || msar.build_grouping_columns_expr(tab_id, group_) || ')';
-$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+$$ LANGUAGE SQL STABLE;
 
 
 CREATE OR REPLACE FUNCTION
 msar.build_grouping_expr(tab_id oid, group_ jsonb) RETURNS TEXT AS $$/*
-Build an expression composed of an id and count for each group.
+Build a select-target expression giving the key of each record's group.
 
 A group is defined by distinct combinations of the (potentially transformed by preproc functions)
-columns passed in `group_`.
+columns passed in `group_`. Each part of the key is in its own `__mathesar_gkey_<n>` column, so
+that the groups of a page can be matched against the table by `msar.build_groups_cte_expr`.
 */
-SELECT concat(
-  COALESCE(msar.build_group_id_expr(tab_id, group_), 'NULL'), ' AS __mathesar_gid, ',
-  COALESCE(msar.build_group_count_expr(tab_id, group_), 'NULL'), ' AS __mathesar_gcount'
-);
+SELECT COALESCE(
+  string_agg(format('%s AS %I', expr, '__mathesar_gkey_' || ordinality), ', ' ORDER BY ordinality),
+  'NULL AS __mathesar_gkey_1'
+)
+FROM msar.get_grouping_column_exprs(tab_id, group_);
 $$ LANGUAGE SQL STABLE;
 
 
@@ -4577,18 +5100,43 @@ WHERE
 $$ LANGUAGE SQL STABLE;
 
 
+DROP FUNCTION IF EXISTS msar.build_groups_cte_expr(oid, text, jsonb);
 CREATE OR REPLACE FUNCTION
-msar.build_groups_cte_expr(tab_id oid, cte_name text, group_ jsonb) RETURNS TEXT AS $$/*
+msar.build_groups_cte_expr(tab_id oid, cte_name text, group_ jsonb, filter_ jsonb)
+RETURNS TEXT AS $$/*
+Build the body of a CTE describing the groups present on a page of records.
+
+Only the groups appearing on the page are considered, so the cost doesn't grow with the size of the
+table: the distinct group keys of the page are found first, and then the records of each group are
+counted (respecting the filter) with a lateral subquery, which can use an index on the grouping
+columns. Group ids rank the page's groups by their keys, starting from 1.
+
+Args:
+  tab_id: The OID of the table whose records we're grouping.
+  cte_name: The CTE holding the page of records, with `__mathesar_gkey_<n>` columns (see
+    `msar.build_grouping_expr`) and a `__mathesar_result_idx` column.
+  group_: A grouping definition.
+  filter_: A filter definition object, or NULL for no filter.
 */
 SELECT format(
-  $gj$
-    __mathesar_gid AS id,
-    __mathesar_gcount AS count,
-    jsonb_build_object(%1$s) AS results_eq,
-    jsonb_agg(__mathesar_result_idx) AS result_indices
-  FROM %2$I
-  GROUP BY id, count, results_eq
-  $gj$,
+  $gc$
+    dense_rank() OVER (ORDER BY %1$s) AS id,
+    __mathesar_group_count.count,
+    results_eq,
+    result_indices
+  FROM (
+    SELECT
+      %1$s,
+      jsonb_build_object(%2$s) AS results_eq,
+      jsonb_agg(__mathesar_result_idx ORDER BY __mathesar_result_idx) AS result_indices
+    FROM %3$I
+    GROUP BY %1$s, results_eq
+  ) AS __mathesar_page_groups
+  CROSS JOIN LATERAL (
+    SELECT count(1) AS count FROM %4$I.%5$I WHERE %6$s
+  ) AS __mathesar_group_count
+  $gc$,
+  string_agg(quote_ident('__mathesar_gkey_' || ordinality), ', ' ORDER BY ordinality),
   string_agg(
     format(
       '%1$L, %2$s',
@@ -4600,14 +5148,25 @@ SELECT format(
     ),
     ', ' ORDER BY ordinality
   ),
-  cte_name
+  cte_name,
+  msar.get_relation_schema_name(tab_id),
+  msar.get_relation_name(tab_id),
+  concat_ws(
+    ' AND ',
+    '(' || msar.build_expr(tab_id, filter_) || ')',
+    string_agg(
+      format(
+        '(%1$s = __mathesar_page_groups.%2$I OR (__mathesar_page_groups.%2$I IS NULL AND %1$s IS NULL))',
+        expr,
+        '__mathesar_gkey_' || ordinality
+      ),
+      ' AND ' ORDER BY ordinality
+    )
+  )
 )
-FROM msar.expr_templates RIGHT JOIN ROWS FROM(
-  jsonb_array_elements_text(group_ -> 'columns'),
-  jsonb_array_elements_text(group_ -> 'preproc')
-) WITH ORDINALITY AS x(col_id, preproc) ON expr_key = preproc
-WHERE has_column_privilege(tab_id, col_id::smallint, 'SELECT');
-$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+FROM msar.get_grouping_column_exprs(tab_id, group_)
+HAVING count(*) > 0;
+$$ LANGUAGE SQL STABLE;
 
 
 CREATE OR REPLACE FUNCTION
@@ -4620,13 +5179,16 @@ SELECT format(
   jsonb_build_object(
     'columns', %2$L::jsonb,
     'preproc', %3$L::jsonb,
-    'groups', jsonb_agg(
-      DISTINCT jsonb_build_object(
-        'id', %1$I.id,
-        'count', %1$I.count,
-        'results_eq', %1$I.results_eq,
-        'result_indices', %1$I.result_indices
+    'groups', (
+      SELECT jsonb_agg(
+        jsonb_build_object(
+          'id', %1$I.id,
+          'count', %1$I.count,
+          'results_eq', %1$I.results_eq,
+          'result_indices', %1$I.result_indices
+        ) ORDER BY %1$I.id
       )
+      FROM %1$I
     )
   )
   $gj$,
@@ -4694,39 +5256,85 @@ SELECT format(
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
-CREATE OR REPLACE FUNCTION msar.build_summary_cte_expr_for_table(tab_id oid) RETURNS TEXT AS $$/*
-Build an SQL text expression defining a sequence of CTEs that give summaries for linked records.
+CREATE OR REPLACE FUNCTION
+msar.build_summary_key_columns_expr(tab_id oid) RETURNS TEXT AS $$/*
+Build an SQL select-target expression of the raw (unformatted) foreign key columns of a table.
 
-This summary amounts to just the first string-like column value for that linked record.
+Each column is aliased as `__mathesar_fkey_<attnum>` and the expression has a leading comma, so it
+can be appended directly to the output of `msar.build_selectable_column_expr`. The raw values let
+the summary CTEs look up linked records by index, rather than by comparing formatted values.
 
 Args:
-  tab_id: The table for whose fkey values' linked records we'll get summaries.
+  tab_id: The OID of the table whose foreign key columns we'll select.
 */
-WITH fkey_map_cte AS (SELECT * FROM msar.get_fkey_map_table(tab_id))
-SELECT ', '
-  || NULLIF(
-    concat_ws(', ',
-      'summary_cte_self AS (SELECT msar.format_data('
-        || quote_ident(msar.get_column_name(tab_id, msar.get_selectable_pkey_attnum(tab_id)))
-        || format(
-          ') AS key, %1$s AS summary FROM %2$I.%3$I)',
-          msar.build_summary_expr(tab_id),
-          msar.get_relation_schema_name(tab_id),
-          msar.get_relation_name(tab_id)
-        ),
-      string_agg(
-        format(
+SELECT COALESCE(
+  string_agg(
+    format(', %I AS %I', msar.get_column_name(tab_id, conkey), '__mathesar_fkey_' || conkey),
+    '' ORDER BY conkey
+  ),
+  ''
+)
+FROM msar.get_fkey_map_table(tab_id);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_summary_key_column_names(tab_id oid) RETURNS text[] AS $$/*
+Return the aliases of the columns produced by `msar.build_summary_key_columns_expr`.
+
+Args:
+  tab_id: The OID of the table whose foreign key columns we'll select.
+*/
+SELECT COALESCE(array_agg('__mathesar_fkey_' || conkey ORDER BY conkey), ARRAY[]::text[])
+FROM msar.get_fkey_map_table(tab_id);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+DROP FUNCTION IF EXISTS msar.build_summary_cte_expr_for_table(oid);
+CREATE OR REPLACE FUNCTION
+msar.build_summary_cte_expr_for_table(tab_id oid, cte_name text) RETURNS TEXT AS $$/*
+Build an SQL text expression defining a sequence of CTEs that give summaries for linked records.
+
+This summary amounts to just the first string-like column value for that linked record.
+
+The CTEs only summarize records referenced by the rows of the main CTE (i.e., the page of results
+being returned). Linked records are found by comparing the raw foreign key values selected via
+`msar.build_summary_key_columns_expr` with the referenced column, so an index on that column can be
+used, and the cost doesn't depend on the size of the referenced table. The summaries of the
+returned records themselves are taken directly from the main CTE.
+
+Args:
+  tab_id: The table for whose fkey values' linked records we'll get summaries.
+  cte_name: The name of the main CTE. Its rows determine which records are summarized.
+*/
+WITH fkey_map_cte AS (SELECT * FROM msar.get_fkey_map_table(tab_id))
+SELECT ', '
+  || NULLIF(
+    concat_ws(', ',
+      CASE WHEN msar.get_selectable_pkey_attnum(tab_id) IS NOT NULL THEN
+        format(
+          'summary_cte_self AS (SELECT %1$I.%2$I AS key, %1$I.%3$I::text AS summary FROM %1$I)',
+          cte_name,
+          msar.get_selectable_pkey_attnum(tab_id)::text,
+          msar.get_default_summary_column(tab_id)::text
+        )
+      END,
+      string_agg(
+        format(
           $c$summary_cte_%1$s AS (
             SELECT
               msar.format_data(%2$I) AS fkey,
               %3$s AS summary
             FROM %4$I.%5$I
+            WHERE %2$I IN (SELECT %6$I.%7$I FROM %6$I)
           )$c$,
           conkey,
           msar.get_column_name(target_oid, confkey),
           msar.build_summary_expr(target_oid),
           msar.get_relation_schema_name(target_oid),
-          msar.get_relation_name(target_oid)
+          msar.get_relation_name(target_oid),
+          cte_name,
+          '__mathesar_fkey_' || conkey
         ), ', '
       )
     ),
@@ -4801,6 +5409,449 @@ END;
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_estimated_row_count(tab_id oid, filter_ jsonb) RETURNS bigint AS $$/*
+Estimate the number of rows of a table matching a filter, without scanning the table.
+
+For an unfiltered table, we use `pg_class.reltuples` if the table has been vacuumed or analyzed.
+Otherwise, we use the planner's row estimate for the (filtered) query.
+
+Args:
+  tab_id: The OID of the table whose rows we'll estimate.
+  filter_: A filter definition object, or NULL for no filter.
+*/
+DECLARE
+  estimate bigint;
+  plan json;
+BEGIN
+  IF filter_ IS NULL THEN
+    SELECT reltuples::bigint INTO estimate
+    FROM pg_catalog.pg_class
+    WHERE oid = tab_id AND reltuples >= 0;
+    IF estimate IS NOT NULL THEN
+      RETURN estimate;
+    END IF;
+  END IF;
+  EXECUTE format(
+    'EXPLAIN (FORMAT JSON) SELECT 1 FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_where_clause(tab_id, filter_)
+  ) INTO plan;
+  RETURN (plan -> 0 -> 'Plan' ->> 'Plan Rows')::numeric::bigint;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.has_fresh_column_stats(tab_id oid, col_id smallint) RETURNS boolean AS $$/*
+Check whether `pg_stats` has statistics for a column, gathered since most of the table changed.
+
+Statistics count as stale by the same rule autovacuum uses to decide whether to analyze a table
+(with the default settings), i.e., once more than 50 rows + 10% of the table have been modified.
+
+Args:
+  tab_id: The OID of the table containing the column.
+  col_id: The attnum of the column.
+*/
+SELECT EXISTS (
+  SELECT 1 FROM pg_catalog.pg_stats
+  WHERE
+    schemaname = msar.get_relation_schema_name(tab_id)
+    AND tablename = msar.get_relation_name(tab_id)
+    AND attname = msar.get_column_name(tab_id, col_id)
+) AND COALESCE(
+  (
+    SELECT n_mod_since_analyze <= 50 + 0.1 * GREATEST(n_live_tup, 0)
+    FROM pg_catalog.pg_stat_all_tables
+    WHERE relid = tab_id
+  ),
+  true
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_column_profile_from_stats(tab_id oid, col_id smallint) RETURNS jsonb AS $$/*
+Get a profile of a column from the statistics in `pg_stats`, or NULL if there are none.
+
+The min and max are the extremes of the most common values and histogram bounds, so they're those of
+the sample ANALYZE took, and are only approximate. They're NULL for types without an ordering.
+
+Args:
+  tab_id: The OID of the table containing the column.
+  col_id: The attnum of the column.
+*/
+DECLARE
+  stats record;
+  values_ text[];
+  min_ text;
+  max_ text;
+BEGIN
+  SELECT
+    s.null_frac,
+    CASE
+      WHEN s.n_distinct >= 0 THEN s.n_distinct
+      ELSE round(-s.n_distinct * GREATEST(c.reltuples, 0))
+    END AS distinct_count,
+    s.most_common_vals::text::text[] AS most_common_vals,
+    s.most_common_freqs,
+    s.histogram_bounds::text::text[] AS histogram_bounds
+  INTO stats
+  FROM pg_catalog.pg_stats s
+    JOIN pg_catalog.pg_class c ON c.oid = tab_id
+  WHERE
+    s.schemaname = msar.get_relation_schema_name(tab_id)
+    AND s.tablename = msar.get_relation_name(tab_id)
+    AND s.attname = msar.get_column_name(tab_id, col_id)
+  ORDER BY s.inherited
+  LIMIT 1;
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+  values_ := COALESCE(stats.most_common_vals, '{}') || COALESCE(stats.histogram_bounds, '{}');
+  BEGIN
+    EXECUTE format(
+      'SELECT min(v)::text, max(v)::text FROM unnest($1::%s[]) AS v',
+      msar.get_column_type(tab_id, col_id)
+    ) INTO min_, max_ USING values_;
+  EXCEPTION WHEN OTHERS THEN
+    -- The type has no ordering.
+    min_ := NULL;
+    max_ := NULL;
+  END;
+  RETURN jsonb_build_object(
+    'attnum', col_id,
+    'source', 'statistics',
+    'sampled_rows', NULL,
+    'null_fraction', stats.null_frac,
+    'distinct_count', stats.distinct_count,
+    'most_common_values', to_jsonb(stats.most_common_vals),
+    'most_common_frequencies', to_jsonb(stats.most_common_freqs),
+    'histogram_bounds', to_jsonb(stats.histogram_bounds),
+    'min', min_,
+    'max', max_
+  );
+END;
+$$ LANGUAGE plpgsql STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_column_profile_from_sample(tab_id oid, col_id smallint, sample_size integer)
+RETURNS jsonb AS $$/*
+Get a profile of a column by reading a sample of at most `sample_size` rows of the table.
+
+The rows come from `TABLESAMPLE SYSTEM`, which reads whole randomly chosen blocks, so the cost
+doesn't depend on the size of the table. The distinct count is extrapolated from the sample with
+the same estimator ANALYZE uses (Haas and Stokes' Duj1). For types without equality or ordering
+(e.g., json), the column's text representation is profiled instead.
+
+If the table was never analyzed, its size is estimated from `pg_stat_all_tables`. Failing that, the
+sample is read from the start of the table, and the distinct count is null unless that reaches the
+end of the table.
+
+Args:
+  tab_id: The OID of the table containing the column.
+  col_id: The attnum of the column.
+  sample_size: The maximum number of rows to read.
+*/
+DECLARE
+  total_rows float8;
+  sample_percent float8;
+  sample_limit integer;
+  profile_query text := $q$
+    WITH read_rows AS (
+      SELECT %1$s AS v FROM %2$I.%3$I TABLESAMPLE SYSTEM (%4$s) LIMIT %5$s
+    ), sample AS (
+      SELECT v FROM read_rows LIMIT %8$s
+    ), counts AS (
+      SELECT v, count(1) AS n FROM sample WHERE v IS NOT NULL GROUP BY v
+    ), totals AS (
+      SELECT
+        (SELECT count(1) FROM read_rows) AS read_,
+        (SELECT count(1) FROM sample) AS sampled,
+        (SELECT count(1) FROM sample WHERE v IS NOT NULL) AS non_null,
+        (SELECT count(1) FROM counts) AS distinct_,
+        (SELECT count(1) FROM counts WHERE n = 1) AS singletons,
+        (SELECT GREATEST(%6$L::float8, count(1)) FROM sample) AS total
+    ), common AS (
+      SELECT v, n FROM counts WHERE n > 1 ORDER BY n DESC, v LIMIT 10
+    )
+    SELECT jsonb_build_object(
+      'sampled_rows', sampled,
+      'null_fraction', CASE WHEN sampled > 0 THEN 1 - non_null::float8 / sampled END,
+      'distinct_count', CASE
+        WHEN sampled = 0 THEN NULL
+        -- We read the whole table.
+        WHEN %7$L::boolean AND read_ <= %8$s THEN distinct_
+        WHEN non_null = 0 THEN 0
+        -- We don't know how many rows the table has, so we can't extrapolate.
+        WHEN %6$L IS NULL THEN NULL
+        -- Every value was unique, so we assume the column is unique.
+        WHEN singletons = non_null THEN round(total * non_null::float8 / sampled)
+        ELSE round(LEAST(GREATEST(
+          non_null::float8 * distinct_
+            / (non_null - singletons + singletons * non_null::float8 / total),
+          distinct_
+        ), total))
+      END,
+      'most_common_values', (SELECT jsonb_agg(v::text ORDER BY n DESC, v) FROM common),
+      'most_common_frequencies', (
+        SELECT jsonb_agg(n::float8 / sampled ORDER BY n DESC, v) FROM common
+      ),
+      'histogram_bounds', (
+        SELECT to_jsonb((
+          percentile_disc(ARRAY[0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1])
+          WITHIN GROUP (ORDER BY v)
+        )::text[])
+        FROM sample WHERE v IS NOT NULL HAVING count(1) > 0
+      ),
+      'min', (SELECT min(v)::text FROM sample),
+      'max', (SELECT max(v)::text FROM sample)
+    )
+    FROM totals
+  $q$;
+  col_expr text := quote_ident(msar.get_column_name(tab_id, col_id));
+  profile jsonb;
+BEGIN
+  -- reltuples is -1 if the table was never vacuumed or analyzed. Then, the count of live tuples kept
+  -- by the statistics system is the best estimate, if there is one.
+  SELECT CASE WHEN c.reltuples >= 0 THEN c.reltuples ELSE nullif(s.n_live_tup, 0) END
+  INTO total_rows
+  FROM pg_catalog.pg_class c LEFT JOIN pg_catalog.pg_stat_all_tables s ON s.relid = c.oid
+  WHERE c.oid = tab_id;
+  -- Without an estimate, we read from the start of the table until we have enough rows.
+  sample_percent := CASE
+    WHEN total_rows IS NULL OR total_rows <= sample_size THEN 100
+    ELSE GREATEST(100.0 * sample_size / total_rows, 0.0001)
+  END;
+  -- Reading one row more than we sample tells us whether we read the whole table.
+  sample_limit := CASE WHEN sample_percent = 100 THEN sample_size + 1 ELSE sample_size END;
+  BEGIN
+    EXECUTE format(
+      profile_query,
+      col_expr,
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      sample_percent,
+      sample_limit,
+      total_rows,
+      sample_percent = 100,
+      sample_size
+    ) INTO profile;
+  EXCEPTION WHEN undefined_function THEN
+    -- The type has no equality or ordering operators.
+    EXECUTE format(
+      profile_query,
+      col_expr || '::text',
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      sample_percent,
+      sample_limit,
+      total_rows,
+      sample_percent = 100,
+      sample_size
+    ) INTO profile;
+  END;
+  RETURN jsonb_build_object('attnum', col_id, 'source', 'sample') || profile;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_column_profiles(
+  tab_id regclass,
+  col_ids smallint[] DEFAULT NULL,
+  sample_size integer DEFAULT 10000,
+  analyze_ boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Get summary statistics for columns of a table, without scanning the table.
+
+Profiles come from `pg_stats` where possible. For columns without statistics, or whose statistics
+are stale (see `msar.has_fresh_column_stats`), a bounded sample of the table is read instead. If
+`analyze_` is true, the table is first analyzed when any of the columns lack fresh statistics (if
+the user may not analyze the table, Postgres skips it with a warning).
+
+Only columns to which the user has access are profiled.
+
+Args:
+  tab_id: The OID of the table whose columns we'll profile.
+  col_ids: The attnums of the columns to profile. All columns if NULL.
+  sample_size: The maximum number of rows to read for each sampled column.
+  analyze_: Whether to analyze the table if its statistics are missing or stale.
+
+Returns a JSON array of objects of the form:
+  {
+    "attnum": <int>,
+    "source": <"statistics" | "sample">,
+    "sampled_rows": <int>,
+    "null_fraction": <float>,
+    "distinct_count": <float>,
+    "most_common_values": [<str>, ...],
+    "most_common_frequencies": [<float>, ...],
+    "histogram_bounds": [<str>, ...],
+    "min": <str>,
+    "max": <str>
+  }
+*/
+DECLARE
+  cols smallint[];
+  analyzed boolean := false;
+BEGIN
+  SELECT array_agg(attnum ORDER BY attnum) INTO cols
+  FROM pg_catalog.pg_attribute
+  WHERE
+    attrelid = tab_id
+    AND attnum > 0
+    AND NOT attisdropped
+    AND (col_ids IS NULL OR attnum = ANY(col_ids))
+    AND has_column_privilege(attrelid, attnum, 'SELECT');
+  IF cols IS NULL THEN
+    RETURN '[]'::jsonb;
+  END IF;
+  IF analyze_ AND EXISTS (
+    SELECT 1 FROM unnest(cols) AS x(col_id) WHERE NOT msar.has_fresh_column_stats(tab_id, col_id)
+  ) THEN
+    EXECUTE format(
+      'ANALYZE %I.%I (%s)',
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      (
+        SELECT string_agg(quote_ident(msar.get_column_name(tab_id, col_id)), ', ')
+        FROM unnest(cols) AS x(col_id)
+      )
+    );
+    -- The modification counts used by `msar.has_fresh_column_stats` are only reset once the
+    -- transaction commits, so we rely on the new statistics directly.
+    analyzed := true;
+  END IF;
+  RETURN jsonb_agg(
+    COALESCE(
+      CASE WHEN analyzed OR msar.has_fresh_column_stats(tab_id, col_id) THEN
+        msar.get_column_profile_from_stats(tab_id, col_id)
+      END,
+      msar.get_column_profile_from_sample(tab_id, col_id, sample_size)
+    )
+    ORDER BY col_id
+  )
+  FROM unnest(cols) AS x(col_id);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_count_cte_expr(tab_id oid, filter_ jsonb, count_mode text) RETURNS text AS $$/*
+Build the body of a CTE giving the number of rows for a record listing in a `count` column.
+
+Args:
+  tab_id: The OID of the table whose rows we'll count.
+  filter_: A filter definition object, or NULL for no filter.
+  count_mode: How to count the rows. One of:
+    - 'exact': Count the matching rows. This scans the (filtered) table.
+    - 'estimated': Use `msar.get_estimated_row_count`.
+    - 'exact_if_cheap': Count exactly if the estimate is at most 100000 rows, otherwise estimate.
+    - 'none': Don't count. The count will be NULL.
+*/
+DECLARE
+  cheap_count_limit CONSTANT bigint := 100000;
+  estimate bigint;
+BEGIN
+  IF count_mode = 'none' THEN
+    RETURN 'SELECT NULL::bigint AS count';
+  ELSIF count_mode NOT IN ('exact', 'estimated', 'exact_if_cheap') THEN
+    RAISE EXCEPTION 'Unknown count mode: %', count_mode;
+  END IF;
+  IF count_mode <> 'exact' THEN
+    estimate := msar.get_estimated_row_count(tab_id, filter_);
+    IF count_mode = 'estimated' OR estimate > cheap_count_limit THEN
+      RETURN format('SELECT %L::bigint AS count', estimate);
+    END IF;
+  END IF;
+  RETURN format(
+    'SELECT count(1) AS count FROM %I.%I %s',
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_where_clause(tab_id, filter_)
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_page_where_clause(
+  tab_id oid,
+  filter_ jsonb,
+  order_ jsonb,
+  cursor_ jsonb
+) RETURNS text AS $$/*
+Build a WHERE clause combining a filter with a seek past a keyset pagination cursor.
+
+Args:
+  tab_id: The OID of the table whose records we're paging through.
+  filter_: A filter definition object, or NULL for no filter.
+  order_: A JSONB array defining any desired ordering of columns.
+  cursor_: A keyset pagination cursor (see `msar.build_seek_expr`), or NULL.
+*/
+DECLARE
+  seek_expr text := msar.build_seek_expr(tab_id, order_, cursor_);
+BEGIN
+  IF seek_expr IS NULL THEN
+    RETURN msar.build_where_clause(tab_id, filter_);
+  ELSIF filter_ IS NULL THEN
+    RETURN format('WHERE %s', seek_expr);
+  END IF;
+  RETURN format('WHERE (%s) AND (%s)', msar.build_expr(tab_id, filter_), seek_expr);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_list_records_query(
+  tab_id oid,
+  limit_ integer,
+  offset_ integer,
+  order_ jsonb,
+  filter_ jsonb,
+  cursor_ jsonb DEFAULT null
+) RETURNS text AS $$/*
+Build the main query of a record listing by `msar.list_records_from_table`.
+
+The query gives the page of records, without the count, grouping, or summaries. It's what's
+reported (and explained) when a listing is slow, even if the listing itself didn't finish.
+
+Args:
+  tab_id: The OID of the table whose records we'll get
+  limit_: The maximum number of rows we'll return
+  offset_: The number of rows to skip before returning records from following rows.
+  order_: An array of ordering definition objects.
+  filter_: An array of filter definition objects.
+  cursor_: A keyset pagination cursor, or NULL.
+*/
+BEGIN
+  RETURN format(
+    'SELECT %1$s FROM %2$I.%3$I %4$s %5$s LIMIT %6$L OFFSET %7$L',
+    msar.get_cached_fragment(
+      tab_id, 'selectable_columns', 'SELECT msar.build_selectable_column_expr($1)'
+    ),
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    msar.build_page_where_clause(tab_id, filter_, order_, cursor_),
+    CASE WHEN order_ IS NULL THEN
+      msar.get_cached_fragment(tab_id, 'default_order_by', 'SELECT msar.build_order_by_expr($1, null)')
+    ELSE
+      msar.build_order_by_expr(tab_id, order_)
+    END,
+    limit_,
+    offset_
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+DROP FUNCTION IF EXISTS msar.list_records_from_table(oid, integer, integer, jsonb, jsonb, jsonb, boolean);
+DROP FUNCTION IF EXISTS msar.list_records_from_table(
+  oid, integer, integer, jsonb, jsonb, jsonb, boolean, text
+);
 CREATE OR REPLACE FUNCTION
 msar.list_records_from_table(
   tab_id oid,
@@ -4809,7 +5860,9 @@ msar.list_records_from_table(
   order_ jsonb,
   filter_ jsonb,
   group_ jsonb,
-  return_record_summaries boolean DEFAULT false
+  return_record_summaries boolean DEFAULT false,
+  count_mode text DEFAULT 'exact',
+  cursor_ jsonb DEFAULT null
 ) RETURNS jsonb AS $$/*
 Get records from a table. Only columns to which the user has access are returned.
 
@@ -4821,6 +5874,10 @@ Args:
   filter_: An array of filter definition objects.
   group_: An array of group definition objects.
   return_record_summaries : Whether to return a summary for each record listed.
+  count_mode: How to count the rows. See `msar.build_count_cte_expr` for options.
+  cursor_: A keyset pagination cursor. If not NULL, we only return rows after the cursor, and the
+    result has a `next_cursor` key holding the cursor for the following page (NULL if this page
+    isn't full). Pass an empty array to get the first page.
 
 The order definition objects should have the form
   {"attnum": <int>, "direction": <text>}
@@ -4831,9 +5888,9 @@ BEGIN
   EXECUTE format(
     $q$
     WITH count_cte AS (
-      SELECT count(1) AS count FROM %2$I.%3$I %7$s
+      %17$s
     ), enriched_results_cte AS (
-      SELECT %1$s, %8$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$L OFFSET %5$L
+      SELECT %1$s, %8$s%16$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$L OFFSET %5$L
     ), results_ranked_cte AS (
       SELECT *, row_number() OVER (%6$s) - 1 AS __mathesar_result_idx FROM enriched_results_cte
     ), groups_cte AS (
@@ -4841,42 +5898,109 @@ BEGIN
     )%12$s
     SELECT jsonb_build_object(
       'results', %9$s,
-      'count', coalesce(max(count_cte.count), 0),
+      'count', %18$s,
       'grouping', %10$s,
       'linked_record_summaries', %14$s,
       'record_summaries', %15$s,
-      'query', $iq$SELECT %1$s FROM %2$I.%3$I %7$s %6$s LIMIT %4$L OFFSET %5$L$iq$
-    )
+      'query', %20$L
+    ) || %19$s
     FROM enriched_results_cte
-      LEFT JOIN groups_cte ON enriched_results_cte.__mathesar_gid = groups_cte.id %13$s
+      %13$s
       CROSS JOIN count_cte
     $q$,
-    msar.build_selectable_column_expr(tab_id),
+    msar.get_cached_fragment(
+      tab_id, 'selectable_columns', 'SELECT msar.build_selectable_column_expr($1)'
+    ),
     msar.get_relation_schema_name(tab_id),
     msar.get_relation_name(tab_id),
     limit_,
     offset_,
-    msar.build_order_by_expr(tab_id, order_),
-    msar.build_where_clause(tab_id, filter_),
+    CASE WHEN order_ IS NULL THEN
+      msar.get_cached_fragment(tab_id, 'default_order_by', 'SELECT msar.build_order_by_expr($1, null)')
+    ELSE
+      msar.build_order_by_expr(tab_id, order_)
+    END,
+    msar.build_page_where_clause(tab_id, filter_, order_, cursor_),
     msar.build_grouping_expr(tab_id, group_),
-    msar.build_results_jsonb_expr(tab_id, 'enriched_results_cte', order_),
+    CASE WHEN order_ IS NULL THEN
+      msar.get_cached_fragment(
+        tab_id,
+        'list_results_json',
+        $f$SELECT msar.build_results_jsonb_expr($1, 'enriched_results_cte', null)$f$
+      )
+    ELSE
+      msar.build_results_jsonb_expr(tab_id, 'enriched_results_cte', order_)
+    END,
     COALESCE(msar.build_grouping_results_jsonb_expr(tab_id, 'groups_cte', group_), 'NULL'),
-    COALESCE(msar.build_groups_cte_expr(tab_id, 'results_ranked_cte', group_), 'NULL AS id'),
-    msar.build_summary_cte_expr_for_table(tab_id),
-    msar.build_summary_join_expr_for_table(tab_id, 'enriched_results_cte'),
-    COALESCE(msar.build_summary_json_expr_for_table(tab_id), 'NULL'),
+    COALESCE(msar.build_groups_cte_expr(tab_id, 'results_ranked_cte', group_, filter_), 'NULL AS id'),
+    msar.get_cached_fragment(
+      tab_id,
+      'list_summary_cte',
+      $f$SELECT msar.build_summary_cte_expr_for_table($1, 'enriched_results_cte')$f$
+    ),
+    msar.get_cached_fragment(
+      tab_id,
+      'list_summary_join',
+      $f$SELECT msar.build_summary_join_expr_for_table($1, 'enriched_results_cte')$f$
+    ),
     COALESCE(
-      CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END,
+      msar.get_cached_fragment(
+        tab_id, 'summary_json', 'SELECT msar.build_summary_json_expr_for_table($1)'
+      ),
       'NULL'
-    )
+    ),
+    COALESCE(
+      CASE WHEN return_record_summaries THEN
+        msar.get_cached_fragment(
+          tab_id, 'self_summary_json', 'SELECT msar.build_self_summary_json_expr($1)'
+        )
+      END,
+      'NULL'
+    ),
+    msar.get_cached_fragment(
+      tab_id, 'summary_key_columns', 'SELECT msar.build_summary_key_columns_expr($1)'
+    ),
+    msar.build_count_cte_expr(tab_id, filter_, count_mode),
+    CASE WHEN count_mode = 'none' THEN 'NULL' ELSE 'coalesce(max(count_cte.count), 0)' END,
+    CASE WHEN cursor_ IS NOT NULL THEN
+      format(
+        $n$jsonb_build_object(
+          'next_cursor', (SELECT %1$s FROM results_ranked_cte WHERE __mathesar_result_idx = %2$L)
+        )$n$,
+        msar.build_next_cursor_expr(tab_id, 'results_ranked_cte', order_),
+        limit_ - 1
+      )
+    ELSE 'jsonb_build_object()' END,
+    msar.build_list_records_query(tab_id, limit_, offset_, order_, filter_, cursor_)
   ) INTO records;
   RETURN records;
 END;
 $$ LANGUAGE plpgsql STABLE;
 
 
+CREATE OR REPLACE FUNCTION msar.get_trgm_schema_name() RETURNS text AS $$/*
+Return the name of the schema containing the pg_trgm extension, or NULL if it's not installed.
+*/
+SELECT pgn.nspname
+FROM pg_catalog.pg_extension pge JOIN pg_catalog.pg_namespace pgn ON pge.extnamespace = pgn.oid
+WHERE pge.extname = 'pg_trgm';
+$$ LANGUAGE SQL STABLE;
+
+
+DROP FUNCTION IF EXISTS msar.get_score_expr(oid, jsonb);
 CREATE OR REPLACE FUNCTION
-msar.get_score_expr(tab_id oid, parameters_ jsonb) RETURNS text AS $$
+msar.get_score_expr(tab_id oid, parameters_ jsonb, fuzzy boolean DEFAULT false) RETURNS text AS $$/*
+Build an expression scoring how well each row of a table matches a search specification.
+
+Exact, prefix and substring (case-insensitive) matches of string columns score 4, 3 and 2, and
+exact matches of other columns score 4. If `fuzzy` is true, string columns that are merely similar
+(per the pg_trgm `%` operator) to the literal score between 1 and 2, according to their similarity.
+
+Args:
+  tab_id: The OID of the table whose rows we're scoring.
+  parameters_: An array of search definition objects.
+  fuzzy: Whether to score similar strings. Requires the pg_trgm extension.
+*/
 SELECT string_agg(
   CASE WHEN pgt.typcategory = 'S' THEN
     format(
@@ -4884,10 +6008,19 @@ SELECT string_agg(
         WHEN %1$I ILIKE %2$L THEN 4
         WHEN %1$I ILIKE %2$L || '%%' THEN 3
         WHEN %1$I ILIKE '%%' || %2$L || '%%' THEN 2
+        %3$s
         ELSE 0
       END)$s$,
       pga.attname,
-      x.literal
+      x.literal,
+      CASE WHEN fuzzy THEN
+        format(
+          'WHEN %1$I OPERATOR(%3$I.%%) %2$L THEN 1 + %3$I.similarity(%1$I, %2$L)',
+          pga.attname,
+          x.literal,
+          msar.get_trgm_schema_name()
+        )
+      ELSE '' END
     )
   ELSE
     format('(CASE WHEN %1$I = %2$L THEN 4 ELSE 0 END)', pga.attname, x.literal)
@@ -4904,21 +6037,282 @@ WHERE
 $$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.get_search_predicate_expr(
+  tab_id oid,
+  parameters_ jsonb,
+  fuzzy boolean DEFAULT false
+) RETURNS text AS $$/*
+Build a boolean expression true for exactly the rows to which `msar.get_score_expr` gives a
+positive score.
+
+Unlike `msar.get_score_expr(...) > 0`, the expression compares columns directly with constants, so
+it can use B-tree indexes for exact matches, and pg_trgm GIN indexes (see
+`msar.add_search_indexes`) for substring and similarity matches of string columns.
+
+Args:
+  tab_id: The OID of the table whose rows we're searching.
+  parameters_: An array of search definition objects.
+  fuzzy: Whether similar strings match. Requires the pg_trgm extension.
+*/
+SELECT string_agg(
+  CASE WHEN pgt.typcategory = 'S' THEN
+    format(
+      '%1$I ILIKE %2$L%3$s',
+      pga.attname,
+      '%' || x.literal || '%',
+      CASE WHEN fuzzy THEN
+        format(' OR %1$I OPERATOR(%3$I.%%) %2$L', pga.attname, x.literal, msar.get_trgm_schema_name())
+      ELSE '' END
+    )
+  ELSE
+    format('%1$I = %2$L', pga.attname, x.literal)
+  END,
+  ' OR '
+)
+FROM jsonb_to_recordset(parameters_) AS x(attnum smallint, literal text)
+  INNER JOIN pg_catalog.pg_attribute AS pga ON x.attnum = pga.attnum
+  INNER JOIN pg_catalog.pg_type AS pgt ON pga.atttypid = pgt.oid
+WHERE
+  pga.attrelid = tab_id
+  AND NOT pga.attisdropped
+  AND has_column_privilege(tab_id, x.attnum, 'SELECT')
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.get_search_index_info(tab_id oid) RETURNS jsonb AS $$/*
+Describe the trigram indexes accelerating searches of a table's string columns.
+
+A column counts as indexed if it has a valid, non-partial, single-column GIN or GiST index with a
+pg_trgm operator class, whether or not it was made by `msar.add_search_indexes`.
+
+The result has the form:
+  {
+    "pg_trgm_installed": <bool>,
+    "columns": [{"attnum": <int>, "indexed": <bool>, "index_names": [<str>, ...]}, ...]
+  }
+
+Only string columns to which the user has access are listed.
+
+Args:
+  tab_id: The OID of the table.
+*/
+SELECT jsonb_build_object(
+  'pg_trgm_installed', msar.get_trgm_schema_name() IS NOT NULL,
+  'columns', coalesce(
+    jsonb_agg(
+      jsonb_build_object(
+        'attnum', pga.attnum,
+        'indexed', idx.index_names IS NOT NULL,
+        'index_names', coalesce(idx.index_names, jsonb_build_array())
+      ) ORDER BY pga.attnum
+    ),
+    jsonb_build_array()
+  )
+)
+FROM pg_catalog.pg_attribute pga
+  JOIN pg_catalog.pg_type pgt ON pga.atttypid = pgt.oid
+  LEFT JOIN LATERAL (
+    SELECT jsonb_agg(ic.relname ORDER BY ic.relname) AS index_names
+    FROM pg_catalog.pg_index ix
+      JOIN pg_catalog.pg_class ic ON ic.oid = ix.indexrelid
+      JOIN pg_catalog.pg_opclass opc ON opc.oid = ix.indclass[0]
+    WHERE ix.indrelid = tab_id
+      AND ix.indnatts = 1
+      AND ix.indkey[0] = pga.attnum
+      AND ix.indisvalid
+      AND ix.indpred IS NULL
+      AND opc.opcname IN ('gin_trgm_ops', 'gist_trgm_ops')
+  ) idx ON true
+WHERE pga.attrelid = tab_id
+  AND pga.attnum > 0
+  AND NOT pga.attisdropped
+  AND pgt.typcategory = 'S'
+  AND has_column_privilege(pga.attrelid, pga.attnum, 'SELECT');
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.prepare_search_indexes(
+  tab_id regclass,
+  col_ids smallint[] DEFAULT NULL,
+  concurrently boolean DEFAULT false
+) RETURNS text[] AS $$/*
+Build the statements creating pg_trgm GIN indexes for the given string columns of a table.
+
+The pg_trgm extension is installed if needed. Columns that already have a trigram index (see
+`msar.get_search_index_info`) are skipped, as are non-string columns. If a column has an index
+named as ours which doesn't count (e.g., left invalid by a failed `CREATE INDEX CONCURRENTLY`), a
+statement dropping it comes first.
+
+A plain `CREATE INDEX` holds a SHARE lock on the table while the index is built, blocking writes to
+it. `CREATE INDEX CONCURRENTLY` doesn't, but can't be run in a transaction block (hence in a
+function), so the caller runs the statements.
+
+Args:
+  tab_id: The OID of the table.
+  col_ids: The attnums of the columns to index. NULL for all string columns.
+  concurrently: Whether to build the indexes with `CREATE INDEX CONCURRENTLY`.
+*/
+DECLARE
+  statements text[] := ARRAY[]::text[];
+  col record;
+  index_name text;
+BEGIN
+  IF msar.get_trgm_schema_name() IS NULL THEN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+  END IF;
+  FOR col IN
+    SELECT (c ->> 'attnum')::smallint AS attnum
+    FROM jsonb_array_elements(msar.get_search_index_info(tab_id) -> 'columns') c
+    WHERE NOT (c ->> 'indexed')::boolean
+      AND (col_ids IS NULL OR (c ->> 'attnum')::smallint = ANY(col_ids))
+  LOOP
+    index_name := format('msar_trgm_%s_%s', tab_id::oid, col.attnum);
+    IF EXISTS (
+      SELECT 1 FROM pg_catalog.pg_index ix JOIN pg_catalog.pg_class ic ON ic.oid = ix.indexrelid
+      WHERE ix.indrelid = tab_id AND ic.relname = index_name
+    ) THEN
+      statements := statements || format(
+        'DROP INDEX %s%I.%I',
+        CASE WHEN concurrently THEN 'CONCURRENTLY ' ELSE '' END,
+        msar.get_relation_schema_name(tab_id),
+        index_name
+      );
+    END IF;
+    statements := statements || format(
+      'CREATE INDEX %s%I ON %I.%I USING gin (%I %I.gin_trgm_ops)',
+      CASE WHEN concurrently THEN 'CONCURRENTLY ' ELSE '' END,
+      index_name,
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      msar.get_column_name(tab_id, col.attnum),
+      msar.get_trgm_schema_name()
+    );
+  END LOOP;
+  RETURN statements;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.add_search_indexes(tab_id regclass, col_ids smallint[] DEFAULT NULL) RETURNS jsonb AS $$/*
+Create pg_trgm GIN indexes to accelerate searching the given string columns of a table.
+
+The pg_trgm extension is installed if needed. Columns that already have a trigram index (see
+`msar.get_search_index_info`) are skipped, as are non-string columns.
+
+The indexes are built with a plain `CREATE INDEX`, so writes to the table are blocked until they're
+done. See `msar.prepare_search_indexes` to build them concurrently instead.
+
+Args:
+  tab_id: The OID of the table.
+  col_ids: The attnums of the columns to index. NULL for all string columns.
+
+Returns:
+  The search index info of the table, as from `msar.get_search_index_info`.
+*/
+DECLARE
+  statement text;
+BEGIN
+  FOREACH statement IN ARRAY msar.prepare_search_indexes(tab_id, col_ids) LOOP
+    EXECUTE statement;
+  END LOOP;
+  RETURN msar.get_search_index_info(tab_id);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.drop_search_indexes(tab_id regclass, col_ids smallint[] DEFAULT NULL) RETURNS jsonb AS $$/*
+Drop the search indexes made by `msar.add_search_indexes` for the given columns of a table.
+
+Trigram indexes not made by `msar.add_search_indexes` are left alone.
+
+Args:
+  tab_id: The OID of the table.
+  col_ids: The attnums of the columns whose indexes we'll drop. NULL for all columns.
+
+Returns:
+  The search index info of the table, as from `msar.get_search_index_info`.
+*/
+DECLARE
+  index_name text;
+BEGIN
+  FOR index_name IN
+    SELECT ic.relname
+    FROM pg_catalog.pg_index ix JOIN pg_catalog.pg_class ic ON ic.oid = ix.indexrelid
+    WHERE ix.indrelid = tab_id
+      AND ix.indnatts = 1
+      AND (col_ids IS NULL OR ix.indkey[0] = ANY(col_ids))
+      AND ic.relname = format('msar_trgm_%s_%s', tab_id::oid, ix.indkey[0])
+  LOOP
+    EXECUTE format(
+      'DROP INDEX %I.%I', msar.get_relation_schema_name(tab_id), index_name
+    );
+  END LOOP;
+  RETURN msar.get_search_index_info(tab_id);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_search_records_query(
+  tab_id oid,
+  search_ jsonb,
+  limit_ integer,
+  fuzzy boolean DEFAULT false
+) RETURNS text AS $$/*
+Build the main query of a search by `msar.search_records_from_table`.
+
+The query gives the ranked records, without the count or summaries. It's what's reported (and
+explained) when a search is slow, even if the search itself didn't finish.
+
+Args:
+  tab_id: The OID of the table whose records we'll get
+  search_: An array of search definition objects.
+  limit_: The maximum number of rows we'll return.
+  fuzzy: Whether strings similar to the search literal also match.
+*/
+BEGIN
+  RETURN format(
+    'SELECT %1$s, %2$s AS __mathesar_score FROM %3$I.%4$I %5$s'
+    ' ORDER BY __mathesar_score DESC, %6$s LIMIT %7$L',
+    msar.build_selectable_column_expr(tab_id),
+    COALESCE(msar.get_score_expr(tab_id, search_, fuzzy), '0'),
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    'WHERE ' || msar.get_search_predicate_expr(tab_id, search_, fuzzy),
+    msar.build_total_order_expr(tab_id, null),
+    limit_
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+DROP FUNCTION IF EXISTS msar.search_records_from_table(oid, jsonb, integer, boolean);
 CREATE OR REPLACE FUNCTION
 msar.search_records_from_table(
   tab_id oid,
   search_ jsonb,
   limit_ integer,
-  return_record_summaries boolean DEFAULT false
+  return_record_summaries boolean DEFAULT false,
+  fuzzy boolean DEFAULT false
 ) RETURNS jsonb AS $$/*
 Get records from a table, filtering and sorting according to a search specification.
 
 Only columns to which the user has access are returned.
 
+Rows are filtered with `msar.get_search_predicate_expr`, which can use indexes, and each matching
+row is scored once with `msar.get_score_expr`.
+
 Args:
   tab_id: The OID of the table whose records we'll get
   search_: An array of search definition objects.
   limit_: The maximum number of rows we'll return.
+  return_record_summaries: Whether to return summaries of the retrieved records.
+  fuzzy: Whether strings similar to the search literal also match. Requires the pg_trgm extension.
 
 The search definition objects should have the form
   {"attnum": <int>, "literal": <any>}
@@ -4926,19 +6320,26 @@ The search definition objects should have the form
 DECLARE
   records jsonb;
 BEGIN
+  IF fuzzy AND msar.get_trgm_schema_name() IS NULL THEN
+    RAISE EXCEPTION 'Fuzzy search requires the pg_trgm extension';
+  END IF;
   EXECUTE format(
     $q$
     WITH count_cte AS (
       SELECT count(1) AS count FROM %2$I.%3$I %4$s
     ), results_cte AS (
-      SELECT %1$s FROM %2$I.%3$I %4$s ORDER BY %6$s LIMIT %5$L
+      SELECT %1$s%11$s, %13$s AS __mathesar_score FROM %2$I.%3$I %4$s
+      ORDER BY __mathesar_score DESC, %6$s LIMIT %5$L
     )%7$s
     SELECT jsonb_build_object(
-      'results', coalesce(jsonb_agg(row_to_json(results_cte.*)), jsonb_build_array()),
+      'results', coalesce(
+        jsonb_agg(to_jsonb(results_cte.*) - %12$L::text[] - '__mathesar_score'),
+        jsonb_build_array()
+      ),
       'count', coalesce(max(count_cte.count), 0),
       'linked_record_summaries', %9$s,
       'record_summaries', %10$s,
-      'query', $iq$SELECT %1$s FROM %2$I.%3$I %4$s ORDER BY %6$s LIMIT %5$L$iq$
+      'query', %14$L
     )
     FROM results_cte %8$s
       CROSS JOIN count_cte
@@ -4946,25 +6347,107 @@ BEGIN
     msar.build_selectable_column_expr(tab_id),
     msar.get_relation_schema_name(tab_id),
     msar.get_relation_name(tab_id),
-    'WHERE ' || msar.get_score_expr(tab_id, search_) || ' > 0',
+    'WHERE ' || msar.get_search_predicate_expr(tab_id, search_, fuzzy),
     limit_,
-    concat(
-      msar.get_score_expr(tab_id, search_) || ' DESC, ',
-      msar.build_total_order_expr(tab_id, null)
-    ),
-    msar.build_summary_cte_expr_for_table(tab_id),
+    msar.build_total_order_expr(tab_id, null),
+    msar.build_summary_cte_expr_for_table(tab_id, 'results_cte'),
     msar.build_summary_join_expr_for_table(tab_id, 'results_cte'),
     COALESCE(msar.build_summary_json_expr_for_table(tab_id), 'NULL'),
     COALESCE(
       CASE WHEN return_record_summaries THEN msar.build_self_summary_json_expr(tab_id) END,
       'NULL'
-    )
+    ),
+    msar.build_summary_key_columns_expr(tab_id),
+    msar.get_summary_key_column_names(tab_id),
+    COALESCE(msar.get_score_expr(tab_id, search_, fuzzy), '0'),
+    msar.build_search_records_query(tab_id, search_, limit_, fuzzy)
   ) INTO records;
   RETURN records;
 END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION
+msar.build_export_query(
+  tab_id oid,
+  columns_ jsonb,
+  order_ jsonb,
+  filter_ jsonb,
+  as_json boolean DEFAULT false
+) RETURNS text AS $$/*
+Build a query giving the rows of a table for export, e.g., with `COPY (...) TO STDOUT`.
+
+Rows are filtered and ordered as in `msar.list_records_from_table`, and values are formatted with
+`msar.format_data`. Output columns are named by column name rather than attnum. As with
+`msar.build_selectable_column_expr`, columns to which the user has no access are left out.
+
+Args:
+  tab_id: The OID of the table to export.
+  columns_: A JSON array of the attnums of the columns to export, in order. NULL for all columns.
+  order_: An array of ordering definition objects.
+  filter_: An array of filter definition objects.
+  as_json: If true, the query gives a single text column with a JSON object for each row.
+*/
+DECLARE
+  columns_expr text;
+BEGIN
+  SELECT string_agg(format('i.%I AS %I', pga.attnum, pga.attname), ', ' ORDER BY x.ord)
+  INTO columns_expr
+  FROM (
+    SELECT value::smallint AS attnum, ord
+    FROM jsonb_array_elements_text(columns_) WITH ORDINALITY AS r(value, ord)
+    UNION ALL
+    SELECT attnum, attnum AS ord
+    FROM pg_catalog.pg_attribute
+    WHERE attrelid = tab_id AND columns_ IS NULL
+  ) x JOIN pg_catalog.pg_attribute pga ON pga.attrelid = tab_id AND pga.attnum = x.attnum
+  WHERE pga.attnum > 0
+    AND NOT pga.attisdropped
+    AND has_column_privilege(pga.attrelid, pga.attnum, 'SELECT');
+  IF columns_expr IS NULL THEN
+    RAISE EXCEPTION 'No columns to export';
+  END IF;
+  RETURN format(
+    CASE WHEN as_json
+      THEN 'SELECT to_json(r)::text FROM (SELECT %1$s FROM (%2$s) i) r'
+      ELSE 'SELECT %1$s FROM (%2$s) i'
+    END,
+    columns_expr,
+    format(
+      'SELECT %s FROM %I.%I %s %s',
+      msar.build_selectable_column_expr(tab_id),
+      msar.get_relation_schema_name(tab_id),
+      msar.get_relation_name(tab_id),
+      msar.build_where_clause(tab_id, filter_),
+      msar.build_order_by_expr(tab_id, order_)
+    )
+  );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION
+msar.build_pk_in_filter(tab_id oid, rec_ids jsonb) RETURNS jsonb AS $$/*
+Build a filter matching the records of a table with the given primary key values.
+
+The filter compares the raw primary key column with the values cast to its type, so that it can
+use the primary key index.
+
+Args:
+  tab_id: The OID of the table.
+  rec_ids: A JSON array of primary key values.
+
+The table must have a single primary key column.
+*/
+SELECT jsonb_build_object(
+  'type', 'in_json_array', 'args', jsonb_build_array(
+    jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id)),
+    jsonb_build_object('type', 'literal', 'value', rec_ids)
+  )
+);
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
 DROP FUNCTION IF EXISTS msar.get_record_from_table(oid, anyelement);
 DROP FUNCTION IF EXISTS msar.get_record_from_table(oid, anyelement, boolean);
 CREATE OR REPLACE FUNCTION
@@ -4983,12 +6466,7 @@ The table must have a single primary key column.
 */
 SELECT msar.list_records_from_table(
   tab_id, null, null, null,
-  jsonb_build_object(
-    'type', 'equal', 'args', jsonb_build_array(
-      jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id)),
-      jsonb_build_object('type', 'literal', 'value', rec_id)
-    )
-  ),
+  msar.build_pk_in_filter(tab_id, jsonb_build_array(rec_id)),
   null,
   return_record_summaries
 )
@@ -5015,18 +6493,7 @@ BEGIN
     $d$,
     msar.get_relation_schema_name(tab_id),
     msar.get_relation_name(tab_id),
-    msar.build_where_clause(
-      tab_id, jsonb_build_object(
-        'type', 'element_in_json_array_untyped', 'args', jsonb_build_array(
-          jsonb_build_object(
-            'type', 'format_data', 'args', jsonb_build_array(
-              jsonb_build_object('type', 'attnum', 'value', msar.get_pk_column(tab_id))
-            )
-          ),
-          jsonb_build_object('type', 'literal', 'value', rec_ids)
-        )
-      )
-    )
+    msar.build_where_clause(tab_id, msar.build_pk_in_filter(tab_id, rec_ids))
   ) INTO num_deleted;
   RETURN num_deleted;
 END;
@@ -5159,6 +6626,282 @@ END;
 $$ LANGUAGE plpgsql RETURNS NULL ON NULL INPUT;
 
 
+CREATE OR REPLACE FUNCTION
+msar.build_rec_def_value_expr(tab_id oid, col_id smallint, rec_def_expr text) RETURNS text AS $$/*
+Build an expression getting the value for a column from a record definition.
+
+The value is cast to the type of the column (without any type modifiers, so that assigning it to
+the column behaves as it would for a literal).
+
+Args:
+  tab_id: The OID of the table containing the column.
+  col_id: The attnum of the column.
+  rec_def_expr: An expression giving a record definition JSON object, keyed by attnum.
+*/
+SELECT format(
+  '(%1$s ->> %2$L)::%3$s', rec_def_expr, col_id, pg_catalog.format_type(atttypid, null)
+)
+FROM pg_catalog.pg_attribute
+WHERE attrelid = tab_id AND attnum = col_id AND NOT attisdropped;
+$$ LANGUAGE SQL STABLE RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+__msar.insert_rec_defs(tab_id oid, col_ids smallint[], rec_defs jsonb) RETURNS jsonb AS $$/*
+Insert records, all defining the same columns, with a single statement.
+
+Returns a JSON array of the (formatted) primary key values of the inserted records.
+
+Args:
+  tab_id: The OID of the table where we'll insert the records.
+  col_ids: The attnums of the columns defined by each record definition.
+  rec_defs: A JSON array of record definitions.
+*/
+DECLARE
+  rec_ids jsonb;
+BEGIN
+  EXECUTE format(
+    $i$
+    WITH insert_cte AS (
+      INSERT INTO %1$I.%2$I %3$s
+      SELECT %4$s FROM jsonb_array_elements($1) WITH ORDINALITY AS x(rec_def, idx) ORDER BY idx
+      RETURNING %5$I
+    )
+    SELECT COALESCE(jsonb_agg(msar.format_data(%5$I)::text), '[]'::jsonb) FROM insert_cte
+    $i$,
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    -- Records defining no columns get the default for every column.
+    COALESCE(
+      '(' || (
+        SELECT string_agg(format('%I', msar.get_column_name(tab_id, c)), ', ') FROM unnest(col_ids) c
+      ) || ')',
+      ''
+    ),
+    COALESCE(
+      (
+        SELECT string_agg(msar.build_rec_def_value_expr(tab_id, c, 'rec_def'), ', ')
+        FROM unnest(col_ids) c
+      ),
+      ''
+    ),
+    msar.get_column_name(tab_id, msar.get_pk_column(tab_id))
+  ) USING rec_defs INTO rec_ids;
+  RETURN rec_ids;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+__msar.update_rec_defs(tab_id oid, col_ids smallint[], rec_defs jsonb) RETURNS jsonb AS $$/*
+Update records, all defining the same columns, with a single statement.
+
+Each record definition must include the primary key of the record to update. Returns a JSON array
+of the (formatted) primary key values of the updated records.
+
+Args:
+  tab_id: The OID of the table whose records we'll update.
+  col_ids: The attnums of the columns defined by each record definition.
+  rec_defs: A JSON array of record definitions.
+*/
+DECLARE
+  pk_col_id smallint := msar.get_pk_column(tab_id);
+  set_col_ids smallint[] := array_remove(col_ids, pk_col_id);
+  rec_ids jsonb;
+BEGIN
+  IF NOT pk_col_id = ANY(col_ids) THEN
+    RAISE EXCEPTION 'Record definitions must include the primary key column (%)', pk_col_id;
+  ELSIF cardinality(set_col_ids) = 0 THEN
+    RAISE EXCEPTION 'Record definitions must include a column other than the primary key';
+  ELSIF (
+    SELECT count(DISTINCT rec_def ->> pk_col_id::text) < count(*)
+    FROM jsonb_array_elements(rec_defs) AS x(rec_def)
+  ) THEN
+    RAISE EXCEPTION 'Each record may only be modified once per batch';
+  END IF;
+  EXECUTE format(
+    $u$
+    WITH update_cte AS (
+      UPDATE %1$I.%2$I AS __mathesar_target SET (%3$s) = ROW(%4$s)
+      FROM jsonb_array_elements($1) AS x(rec_def)
+      WHERE __mathesar_target.%5$I = %6$s
+      RETURNING __mathesar_target.%5$I
+    )
+    SELECT COALESCE(jsonb_agg(msar.format_data(%5$I)::text), '[]'::jsonb) FROM update_cte
+    $u$,
+    msar.get_relation_schema_name(tab_id),
+    msar.get_relation_name(tab_id),
+    (SELECT string_agg(format('%I', msar.get_column_name(tab_id, c)), ', ') FROM unnest(set_col_ids) c),
+    (
+      SELECT string_agg(msar.build_rec_def_value_expr(tab_id, c, 'x.rec_def'), ', ')
+      FROM unnest(set_col_ids) c
+    ),
+    msar.get_column_name(tab_id, pk_col_id),
+    msar.build_rec_def_value_expr(tab_id, pk_col_id, 'x.rec_def')
+  ) USING rec_defs INTO rec_ids;
+  RETURN rec_ids;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+__msar.write_rec_defs(
+  tab_id oid,
+  rec_defs jsonb,
+  write_type text,
+  return_records boolean,
+  return_record_summaries boolean,
+  continue_on_error boolean
+) RETURNS jsonb AS $$/*
+Insert or update a batch of records, returning the modified records along with any errors.
+
+Record definitions defining the same set of columns are written with a single statement (so the
+typical batch, e.g., pasted from a spreadsheet, is written with one statement). If that statement
+fails and `continue_on_error` is set, its records are retried one at a time, so that we can report
+which of them failed while still writing the rest. Otherwise, the error is raised.
+
+Args:
+  tab_id: The OID of the table whose records we'll insert or update.
+  rec_defs: A JSON array of record definitions.
+  write_type: Either 'insert' or 'update'.
+  return_records: Whether to return the written records.
+  return_record_summaries: Whether to return summaries of the written records.
+  continue_on_error: Whether to keep writing other records when some fail.
+
+The returned errors have the form
+  {"index": <index in rec_defs>, "message": <error message>, "sql_state": <SQLSTATE code>}
+*/
+DECLARE
+  rec_group record;
+  rec_ids jsonb := '[]'::jsonb;
+  errors jsonb := '[]'::jsonb;
+  rec_idx integer;
+  written_recs jsonb;
+BEGIN
+  IF msar.get_pk_column(tab_id) IS NULL THEN
+    RAISE EXCEPTION 'Table must have a single primary key column';
+  END IF;
+  FOR rec_group IN
+    SELECT col_ids, jsonb_agg(rec_def ORDER BY idx) AS group_rec_defs, array_agg(idx ORDER BY idx) AS idxs
+    FROM (
+      SELECT
+        rec_def,
+        idx - 1 AS idx,
+        ARRAY(SELECT k::smallint FROM jsonb_object_keys(rec_def) AS y(k) ORDER BY 1) AS col_ids
+      FROM jsonb_array_elements(rec_defs) WITH ORDINALITY AS x(rec_def, idx)
+    ) AS indexed_rec_defs
+    GROUP BY col_ids
+    ORDER BY min(idx)
+  LOOP
+    IF NOT continue_on_error THEN
+      rec_ids := rec_ids || CASE write_type
+        WHEN 'insert' THEN __msar.insert_rec_defs(tab_id, rec_group.col_ids, rec_group.group_rec_defs)
+        WHEN 'update' THEN __msar.update_rec_defs(tab_id, rec_group.col_ids, rec_group.group_rec_defs)
+      END;
+      CONTINUE;
+    END IF;
+    BEGIN
+      rec_ids := rec_ids || CASE write_type
+        WHEN 'insert' THEN __msar.insert_rec_defs(tab_id, rec_group.col_ids, rec_group.group_rec_defs)
+        WHEN 'update' THEN __msar.update_rec_defs(tab_id, rec_group.col_ids, rec_group.group_rec_defs)
+      END;
+    EXCEPTION WHEN OTHERS THEN
+      FOR rec_idx IN 1..cardinality(rec_group.idxs) LOOP
+        BEGIN
+          rec_ids := rec_ids || CASE write_type
+            WHEN 'insert' THEN __msar.insert_rec_defs(
+              tab_id, rec_group.col_ids, jsonb_build_array(rec_group.group_rec_defs -> (rec_idx - 1))
+            )
+            WHEN 'update' THEN __msar.update_rec_defs(
+              tab_id, rec_group.col_ids, jsonb_build_array(rec_group.group_rec_defs -> (rec_idx - 1))
+            )
+          END;
+        EXCEPTION WHEN OTHERS THEN
+          errors := errors || jsonb_build_object(
+            'index', rec_group.idxs[rec_idx], 'message', SQLERRM, 'sql_state', SQLSTATE
+          );
+        END;
+      END LOOP;
+    END;
+  END LOOP;
+  IF return_records AND jsonb_array_length(rec_ids) > 0 THEN
+    written_recs := msar.list_records_from_table(
+      tab_id, null, null, null,
+      msar.build_pk_in_filter(tab_id, rec_ids),
+      null,
+      return_record_summaries,
+      'none'
+    );
+  END IF;
+  RETURN jsonb_build_object(
+    'count', jsonb_array_length(rec_ids),
+    'results', CASE WHEN return_records THEN COALESCE(written_recs -> 'results', '[]'::jsonb) END,
+    'record_summaries', written_recs -> 'record_summaries',
+    'linked_record_summaries', written_recs -> 'linked_record_summaries',
+    'errors', errors
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION
+msar.add_records_to_table(
+  tab_id oid,
+  rec_defs jsonb,
+  return_records boolean DEFAULT true,
+  return_record_summaries boolean DEFAULT false,
+  continue_on_error boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Add a batch of records to a table.
+
+Args:
+  tab_id: The OID of the table where we'll add the records.
+  rec_defs: A JSON array of objects, each defining a record as for msar.add_record_to_table.
+  return_records: Whether to return the added records.
+  return_record_summaries: Whether to return summaries of the added records.
+  continue_on_error: Whether to add the valid records and report errors for the others, rather
+    than raising the first error.
+
+The result is a JSON object with the `count` of added records, their `results` (ordered by primary
+key), `record_summaries` and `linked_record_summaries`, and a list of `errors` as described in
+__msar.write_rec_defs.
+*/
+SELECT __msar.write_rec_defs(
+  tab_id, rec_defs, 'insert', return_records, return_record_summaries, continue_on_error
+);
+$$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION
+msar.patch_records_in_table(
+  tab_id oid,
+  rec_defs jsonb,
+  return_records boolean DEFAULT true,
+  return_record_summaries boolean DEFAULT false,
+  continue_on_error boolean DEFAULT false
+) RETURNS jsonb AS $$/*
+Modify (update/patch) a batch of records in a table.
+
+Args:
+  tab_id: The OID of the table whose records we'll modify.
+  rec_defs: A JSON array of objects, each defining the parts of a record to patch as for
+    msar.patch_record_in_table. Each object must also include the primary key value of the record,
+    under the attnum of the primary key column.
+  return_records: Whether to return the modified records.
+  return_record_summaries: Whether to return summaries of the modified records.
+  continue_on_error: Whether to modify the valid records and report errors for the others, rather
+    than raising the first error.
+
+The result is a JSON object with the `count` of modified records, their `results` (ordered by
+primary key), `record_summaries` and `linked_record_summaries`, and a list of `errors` as described
+in __msar.write_rec_defs.
+*/
+SELECT __msar.write_rec_defs(
+  tab_id, rec_defs, 'update', return_records, return_record_summaries, continue_on_error
+);
+$$ LANGUAGE SQL RETURNS NULL ON NULL INPUT;
+
+
 ----------------------------------------------------------------------------------------------------
 ----------------------------------------------------------------------------------------------------
 -- FUNCTIONS/COMMANDS RELATED TO GRANTING APPROPRIATE PERMISSIONS FOR msar, __msar AND mathesar_types
@@ -5193,4 +6936,5 @@ $$ LANGUAGE plpgsql;
 GRANT USAGE ON SCHEMA __msar, msar, mathesar_types TO PUBLIC;
 GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA msar, __msar, mathesar_types TO PUBLIC;
 GRANT SELECT ON ALL TABLES IN SCHEMA msar, __msar, mathesar_types TO PUBLIC;
+GRANT SELECT ON SEQUENCE msar.catalog_version_seq TO PUBLIC;
 SELECT msar.grant_usage_on_custom_mathesar_types_to_public();
@@ -0,0 +1,81 @@
+-- Generate a benchmark dataset in the {schema} schema.
+--
+-- This is a template for `psycopg.sql.SQL.format`: {schema} is replaced by the schema name, and
+-- {rows} by the number of rows in the `books` table. Other tables are sized relative to that.
+--
+-- The data is derived from hashes of the row numbers rather than from random(), so a dataset of
+-- a given size is the same on every run.
+
+DROP SCHEMA IF EXISTS {schema} CASCADE;
+CREATE SCHEMA {schema};
+
+CREATE TABLE {schema}.authors (
+  id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+  name text NOT NULL,
+  country text,
+  born date
+);
+
+INSERT INTO {schema}.authors (id, name, country, born)
+SELECT
+  i,
+  'Author ' || i || ' ' || left(md5('author' || i), 8),
+  (ARRAY['Argentina', 'Brazil', 'Canada', 'Denmark', 'Egypt', 'France', 'Ghana', 'India', 'Japan',
+    'Kenya', 'Mexico', 'Nepal', 'Peru', 'Spain', 'Togo', 'Uganda', 'Vietnam'])[1 + i % 17],
+  date '1900-01-01' + abs(hashint4(i)) % 36500
+FROM generate_series(1, greatest({rows} / 100, 10)) AS i;
+
+CREATE TABLE {schema}.books (
+  id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+  title text NOT NULL,
+  author_id integer REFERENCES {schema}.authors (id),
+  -- Functionally dependent on author_id, so it can be moved to the authors table.
+  author_country text,
+  price numeric(8, 2),
+  pages integer,
+  published date,
+  rating real,
+  details jsonb
+);
+
+INSERT INTO {schema}.books (id, title, author_id, author_country, price, pages, published, rating, details)
+SELECT
+  i,
+  'Book ' || i || ' ' || md5('book' || i),
+  a.id,
+  a.country,
+  (abs(hashint4(i)) % 10000) / 100.0,
+  -- Leave some NULLs in.
+  nullif(abs(hashint4(i + 1)) % 1200, 0),
+  date '1950-01-01' + abs(hashint4(i + 2)) % 27000,
+  (abs(hashint4(i + 3)) % 50) / 10.0,
+  jsonb_build_object(
+    'format', (ARRAY['hardcover', 'paperback', 'ebook', 'audio'])[1 + i % 4],
+    'tags', jsonb_build_array('tag' || i % 13, 'tag' || i % 29),
+    'edition', 1 + i % 5
+  )
+FROM generate_series(1, {rows}) AS i
+  JOIN {schema}.authors AS a ON a.id = 1 + abs(hashint4(i + 4)) % greatest({rows} / 100, 10);
+
+-- A copy of the books with every column as text, as after an import.
+CREATE TABLE {schema}.books_text (
+  id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+  title text,
+  price text,
+  pages text,
+  published text,
+  rating text,
+  in_print text
+);
+
+INSERT INTO {schema}.books_text (id, title, price, pages, published, rating, in_print)
+SELECT
+  id, title, price::text, pages::text, published::text, rating::text,
+  CASE WHEN id % 3 = 0 THEN 'false' ELSE 'true' END
+FROM {schema}.books;
+
+SELECT setval(pg_get_serial_sequence('{schema}.authors', 'id'), max(id)) FROM {schema}.authors;
+SELECT setval(pg_get_serial_sequence('{schema}.books', 'id'), max(id)) FROM {schema}.books;
+SELECT setval(pg_get_serial_sequence('{schema}.books_text', 'id'), max(id)) FROM {schema}.books_text;
+
+ANALYZE {schema}.authors, {schema}.books, {schema}.books_text;
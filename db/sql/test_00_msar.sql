@@ -1467,6 +1467,77 @@ END;
 $f$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_infer_table_column_data_types_sampled_whole_table() RETURNS SETOF TEXT AS $f$
+BEGIN
+  PERFORM __setup_type_inference();
+  RETURN NEXT is(
+    msar.infer_table_column_data_types_sampled('"Types Test"'::regclass, 100, false),
+    jsonb_build_object(
+      1, jsonb_build_object('type', 'integer', 'confidence', 1, 'confirmed', true),
+      2, jsonb_build_object('type', 'text', 'confidence', 1, 'confirmed', true),
+      3, jsonb_build_object('type', 'boolean', 'confidence', 1, 'confirmed', true),
+      4, jsonb_build_object('type', 'date', 'confidence', 1, 'confirmed', true),
+      5, jsonb_build_object('type', 'numeric', 'confidence', 1, 'confirmed', true),
+      6, jsonb_build_object('type', 'interval', 'confidence', 1, 'confirmed', true),
+      7, jsonb_build_object('type', 'text', 'confidence', 1, 'confirmed', true)
+    )
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_infer_table_column_data_types_sampled_confirm() RETURNS SETOF TEXT AS $f$
+DECLARE
+  type_info jsonb;
+BEGIN
+  CREATE TABLE sample_types (id integer PRIMARY KEY, "Numeric" text, "Mostly Numeric" text);
+  INSERT INTO sample_types
+    SELECT i, i::text, CASE WHEN i = 5000 THEN 'abc' ELSE i::text END
+    FROM generate_series(1, 5000) AS x(i);
+  ANALYZE sample_types;
+  type_info := msar.infer_table_column_data_types_sampled('sample_types'::regclass, 10, false);
+  RETURN NEXT is(type_info -> '2' ->> 'type', 'numeric');
+  RETURN NEXT is((type_info -> '2' ->> 'confirmed')::boolean, false);
+  RETURN NEXT cmp_ok((type_info -> '2' ->> 'confidence')::numeric, '<', 1::numeric);
+  type_info := msar.infer_table_column_data_types_sampled('sample_types'::regclass, 10, true);
+  RETURN NEXT is(
+    type_info -> '2', jsonb_build_object('type', 'numeric', 'confidence', 1, 'confirmed', true)
+  );
+  -- The sample will most likely miss the bad value, but confirming catches it regardless.
+  RETURN NEXT is(
+    type_info -> '3', jsonb_build_object('type', 'text', 'confidence', 1, 'confirmed', true)
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_infer_table_column_data_types_sampled_not_analyzed() RETURNS SETOF TEXT AS $f$
+DECLARE
+  type_info jsonb;
+BEGIN
+  CREATE TABLE unanalyzed_types (id integer PRIMARY KEY, "Numeric" text, "Mostly Numeric" text);
+  INSERT INTO unanalyzed_types
+    SELECT i, i::text, CASE WHEN i = 5000 THEN 'abc' ELSE i::text END
+    FROM generate_series(1, 5000) AS x(i);
+  -- Without ANALYZE, the size of the table isn't known, so only its start is sampled.
+  type_info := msar.infer_table_column_data_types_sampled('unanalyzed_types'::regclass, 10, false);
+  RETURN NEXT is(
+    type_info -> '2', jsonb_build_object('type', 'numeric', 'confidence', null, 'confirmed', false)
+  );
+  RETURN NEXT is(
+    type_info -> '3', jsonb_build_object('type', 'numeric', 'confidence', null, 'confirmed', false)
+  );
+  type_info := msar.infer_table_column_data_types_sampled('unanalyzed_types'::regclass, 10, true);
+  RETURN NEXT is(
+    type_info -> '2', jsonb_build_object('type', 'numeric', 'confidence', 1, 'confirmed', true)
+  );
+  RETURN NEXT is(
+    type_info -> '3', jsonb_build_object('type', 'text', 'confidence', 1, 'confirmed', true)
+  );
+END;
+$f$ LANGUAGE plpgsql;
+
+
 -- msar.add_mathesar_table
 
 CREATE OR REPLACE FUNCTION __setup_create_table() RETURNS SETOF TEXT AS $f$
@@ -3235,6 +3306,212 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_list_records_count_modes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id, limit_ => 1, offset_ => null, order_ => null, filter_ => null,
+      group_ => null, count_mode => 'none'
+    ) -> 'count',
+    'null'::jsonb
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id, limit_ => 1, offset_ => null, order_ => null, filter_ => null,
+      group_ => null, count_mode => 'exact_if_cheap'
+    ) -> 'count',
+    '3'::jsonb
+  );
+  ANALYZE atable;
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id, limit_ => 1, offset_ => null, order_ => null, filter_ => null,
+      group_ => null, count_mode => 'estimated'
+    ) -> 'count',
+    '3'::jsonb
+  );
+  RETURN NEXT is(
+    msar.get_estimated_row_count(
+      rel_id, '{"type": "equal", "args": [{"type": "attnum", "value": 1}, {"type": "literal", "value": 2}]}'
+    ),
+    1::bigint
+  );
+  RETURN NEXT throws_ok(
+    format(
+      'SELECT msar.list_records_from_table(%s, null, null, null, null, null, false, ''bogus'')',
+      rel_id
+    ),
+    'P0001',
+    'Unknown count mode: bogus'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_build_export_query() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  result jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  EXECUTE format(
+    'SELECT jsonb_agg(to_jsonb(t)) FROM (%s) t',
+    msar.build_export_query(rel_id, '[3, 1]', '[{"attnum": 2, "direction": "desc"}]', null)
+  ) INTO result;
+  RETURN NEXT is(
+    result,
+    '[{"col2": "sdflfflsk", "id": 2}, {"col2": "sdflkj", "id": 1}, {"col2": "abcde", "id": 3}]'
+  );
+  EXECUTE format(
+    'SELECT jsonb_agg(j::jsonb) FROM (%s) t(j)',
+    msar.build_export_query(
+      rel_id,
+      '[3, 1]',
+      null,
+      '{"type": "equal", "args": [{"type": "attnum", "value": 1}, {"type": "literal", "value": 2}]}',
+      true
+    )
+  ) INTO result;
+  RETURN NEXT is(result, '[{"col2": "sdflfflsk", "id": 2}]');
+  EXECUTE format(
+    'SELECT jsonb_agg(to_jsonb(t)) FROM (%s) t',
+    msar.build_export_query(rel_id, null, null, null)
+  ) INTO result;
+  RETURN NEXT is(jsonb_array_length(result), 3);
+  RETURN NEXT results_eq(
+    format('SELECT jsonb_object_keys(%L::jsonb -> 0) ORDER BY 1', result),
+    ARRAY['col1', 'col2', 'col3', 'col4', 'id']
+  );
+  RETURN NEXT throws_ok(
+    format('SELECT msar.build_export_query(%s, ''[42]'', null, null)', rel_id),
+    'P0001',
+    'No columns to export'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_get_column_profiles() RETURNS SETOF TEXT AS $$
+DECLARE
+  profiles jsonb;
+BEGIN
+  CREATE TABLE profiled (
+    id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    num integer,
+    label text,
+    doc json
+  );
+  INSERT INTO profiled (num, label, doc)
+  SELECT i % 4, CASE WHEN i % 2 = 0 THEN 'even' END, json_build_object('i', i)
+  FROM generate_series(1, 100) AS i;
+  -- There are no statistics yet, so we sample. The table is small enough to be read whole.
+  profiles := msar.get_column_profiles('profiled'::regclass, '{2, 3, 4}');
+  RETURN NEXT is(jsonb_array_length(profiles), 3);
+  RETURN NEXT is(profiles -> 0 ->> 'source', 'sample');
+  RETURN NEXT is((profiles -> 0 ->> 'sampled_rows')::integer, 100);
+  RETURN NEXT is((profiles -> 0 ->> 'distinct_count')::numeric, 4::numeric);
+  RETURN NEXT is(profiles -> 0 ->> 'min', '0');
+  RETURN NEXT is(profiles -> 0 ->> 'max', '3');
+  RETURN NEXT is((profiles -> 1 ->> 'null_fraction')::float8, 0.5::float8);
+  RETURN NEXT is(profiles -> 1 -> 'most_common_values', '["even"]'::jsonb);
+  -- json has no equality operator, so its text representation is profiled.
+  RETURN NEXT is((profiles -> 2 ->> 'distinct_count')::numeric, 100::numeric);
+  -- Once analyzed, the statistics are used.
+  profiles := msar.get_column_profiles('profiled'::regclass, '{2}', analyze_ => true);
+  RETURN NEXT is(profiles -> 0 ->> 'source', 'statistics');
+  RETURN NEXT is((profiles -> 0 ->> 'distinct_count')::numeric, 4::numeric);
+  RETURN NEXT is(profiles -> 0 ->> 'min', '0');
+  RETURN NEXT is(profiles -> 0 ->> 'max', '3');
+  RETURN NEXT is((profiles -> 0 ->> 'null_fraction')::float8, 0::float8);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_get_column_profiles_not_analyzed() RETURNS SETOF TEXT AS $$
+DECLARE
+  profiles jsonb;
+BEGIN
+  CREATE TABLE profiled_big (id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY, num integer);
+  INSERT INTO profiled_big (num) SELECT i % 4 FROM generate_series(1, 5000) AS i;
+  -- The table was never analyzed, so its size is unknown, and only its start is read.
+  profiles := msar.get_column_profiles('profiled_big'::regclass, '{1, 2}', sample_size => 100);
+  RETURN NEXT is(profiles -> 0 ->> 'source', 'sample');
+  RETURN NEXT is((profiles -> 0 ->> 'sampled_rows')::integer, 100);
+  RETURN NEXT is(profiles -> 0 -> 'distinct_count', 'null'::jsonb);
+  RETURN NEXT is(profiles -> 1 -> 'distinct_count', 'null'::jsonb);
+  RETURN NEXT is(profiles -> 1 ->> 'min', '0');
+  RETURN NEXT is(profiles -> 1 ->> 'max', '3');
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_list_records_with_cursor() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  list_result jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.build_seek_expr(rel_id, null, '[1]'),
+    '(msar.format_data(id)) > (''1'')'
+  );
+  RETURN NEXT is(
+    msar.build_seek_expr(rel_id, '[{"attnum": 2, "direction": "desc"}]', '[5, 1]'),
+    concat(
+      '(msar.format_data(col1) < ''5'') OR ',
+      '(msar.format_data(col1) = ''5'' AND (msar.format_data(id) > ''1'' OR msar.format_data(id) IS NULL))'
+    )
+  );
+  RETURN NEXT is(msar.build_seek_expr(rel_id, null, '[]'), null);
+  list_result := msar.list_records_from_table(
+    tab_id => rel_id,
+    limit_ => 2,
+    offset_ => null,
+    order_ => '[{"attnum": 2, "direction": "desc"}]',
+    filter_ => null,
+    group_ => null,
+    cursor_ => '[]'
+  );
+  RETURN NEXT is(list_result -> 'results' -> 0 -> '1', '2'::jsonb);
+  RETURN NEXT is(list_result -> 'results' -> 1 -> '1', '1'::jsonb);
+  RETURN NEXT is(list_result -> 'next_cursor', '[5, 1]'::jsonb);
+  RETURN NEXT is(list_result -> 'count', '3'::jsonb);
+  list_result := msar.list_records_from_table(
+    tab_id => rel_id,
+    limit_ => 2,
+    offset_ => null,
+    order_ => '[{"attnum": 2, "direction": "desc"}]',
+    filter_ => null,
+    group_ => null,
+    cursor_ => list_result -> 'next_cursor'
+  );
+  RETURN NEXT is(
+    list_result -> 'results',
+    '[{"1": 3, "2": 2, "3": "abcde", "4": {"k": 3242348}, "5": true}]'::jsonb
+  );
+  RETURN NEXT is(list_result -> 'next_cursor', 'null'::jsonb);
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 2,
+      offset_ => null,
+      order_ => null,
+      filter_ => '{"type": "greater", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 3}]}',
+      group_ => null,
+      cursor_ => '[1]'
+    ) -> 'results',
+    '[{"1": 2, "2": 34, "3": "sdflfflsk", "4": null, "5": [1, 2, 3, 4]}]'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_list_records_with_grouping() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -3417,6 +3694,36 @@ BEGIN
       )
     )
   );
+  -- Groups are computed for the page only, but counts cover the whole (filtered) table.
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 3,
+      offset_ => 2,
+      order_ => '[{"attnum": 3, "direction": "asc"}]',
+      filter_ => '{"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": "Aaron"}]}',
+      group_ => '{"columns": [3]}'
+    ) -> 'grouping',
+    $j${
+      "columns": [3],
+      "preproc": null,
+      "groups": [
+        {"id": 1, "count": 1, "results_eq": {"3": "Acosta"}, "result_indices": [0]},
+        {"id": 2, "count": 4, "results_eq": {"3": "Adams"}, "result_indices": [1, 2]}
+      ]
+    }$j$
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(
+      tab_id => rel_id,
+      limit_ => 3,
+      offset_ => 30,
+      order_ => '[{"attnum": 3, "direction": "asc"}]',
+      filter_ => null,
+      group_ => '{"columns": [3]}'
+    ) -> 'grouping' -> 'groups',
+    'null'::jsonb
+  );
 END;
 $$ LANGUAGE plpgsql;
 
@@ -3951,6 +4258,141 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_search_records_with_search_indexes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  index_info jsonb;
+  search_result jsonb;
+BEGIN
+  PERFORM __setup_search_records_table();
+  rel_id := 'atable'::regclass::oid;
+  index_info := msar.get_search_index_info(rel_id);
+  RETURN NEXT is(
+    index_info -> 'columns',
+    '[{"attnum": 3, "indexed": false, "index_names": []}]'::jsonb
+  );
+
+  index_info := msar.add_search_indexes(rel_id);
+  RETURN NEXT is((index_info ->> 'pg_trgm_installed')::boolean, true);
+  RETURN NEXT is(
+    index_info -> 'columns',
+    jsonb_build_array(
+      jsonb_build_object(
+        'attnum', 3,
+        'indexed', true,
+        'index_names', jsonb_build_array(format('msar_trgm_%s_3', rel_id))
+      )
+    )
+  );
+  -- Adding indexes again is a no-op.
+  RETURN NEXT is(msar.add_search_indexes(rel_id), index_info);
+
+  search_result := msar.search_records_from_table(
+    rel_id, jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'abcdx')), 10
+  );
+  RETURN NEXT is((search_result -> 'count')::integer, 0);
+  search_result := msar.search_records_from_table(
+    rel_id,
+    jsonb_build_array(jsonb_build_object('attnum', 3, 'literal', 'abcdx')),
+    10,
+    fuzzy => true
+  );
+  RETURN NEXT is(
+    search_result -> 'results',
+    jsonb_build_array(jsonb_build_object('1', 4, '2', 2, '3', 'abcde'))
+  );
+  RETURN NEXT is((search_result -> 'count')::integer, 1);
+
+  index_info := msar.drop_search_indexes(rel_id);
+  RETURN NEXT is(
+    index_info -> 'columns',
+    '[{"attnum": 3, "indexed": false, "index_names": []}]'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_prepare_search_indexes() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  statements text[];
+BEGIN
+  PERFORM __setup_search_records_table();
+  rel_id := 'atable'::regclass::oid;
+  -- pg_trgm is installed (if needed) by the first call.
+  statements := msar.prepare_search_indexes(rel_id, concurrently => true);
+  RETURN NEXT is(
+    statements,
+    ARRAY[
+      format(
+        'CREATE INDEX CONCURRENTLY msar_trgm_%s_3 ON public.atable USING gin (col2 %I.gin_trgm_ops)',
+        rel_id, msar.get_trgm_schema_name()
+      )
+    ]
+  );
+  -- An index named as ours that doesn't count (e.g., left invalid by a failed concurrent build)
+  -- is dropped first.
+  EXECUTE format('CREATE INDEX msar_trgm_%s_3 ON atable (col2) WHERE col1 > 0', rel_id);
+  RETURN NEXT is(
+    msar.prepare_search_indexes(rel_id),
+    ARRAY[
+      format('DROP INDEX public.msar_trgm_%s_3', rel_id),
+      format(
+        'CREATE INDEX msar_trgm_%s_3 ON public.atable USING gin (col2 %I.gin_trgm_ops)',
+        rel_id, msar.get_trgm_schema_name()
+      )
+    ]
+  );
+  RETURN NEXT is(
+    msar.add_search_indexes(rel_id) -> 'columns' -> 0 -> 'indexed', 'true'::jsonb
+  );
+  RETURN NEXT is(msar.prepare_search_indexes(rel_id), ARRAY[]::text[]);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_get_cached_fragment() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  version_before bigint;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  RETURN NEXT is(
+    msar.get_cached_fragment(rel_id, 'test_columns', 'SELECT msar.build_selectable_column_expr($1)'),
+    msar.build_selectable_column_expr(rel_id)
+  );
+  -- While cached, the fragment isn't rebuilt.
+  RETURN NEXT is(
+    msar.get_cached_fragment(rel_id, 'test_columns', $b$SELECT 'rebuilt'$b$),
+    msar.build_selectable_column_expr(rel_id)
+  );
+  RETURN NEXT is(msar.get_cached_fragment(rel_id, 'test_null', 'SELECT NULL::text'), NULL);
+  RETURN NEXT is(msar.get_cached_fragment(rel_id, 'test_null', $b$SELECT 'rebuilt'$b$), NULL);
+  -- DDL bumps the catalog version, so the fragment is rebuilt.
+  version_before := msar.get_catalog_version();
+  ALTER TABLE atable ADD COLUMN newcol integer;
+  RETURN NEXT cmp_ok(msar.get_catalog_version(), '>', version_before);
+  -- The transaction's own DDL doesn't keep it from caching fragments.
+  RETURN NEXT ok(msar.is_catalog_version_settled());
+  -- Other sessions can't see that DDL until the transaction commits, though.
+  RETURN NEXT is(msar.get_settled_catalog_version(), NULL);
+  RETURN NEXT is(
+    msar.get_cached_fragment(rel_id, 'test_columns', 'SELECT msar.build_selectable_column_expr($1)'),
+    msar.build_selectable_column_expr(rel_id)
+  );
+  RETURN NEXT ok(
+    msar.get_cached_fragment(rel_id, 'test_columns', $b$SELECT 'rebuilt'$b$) LIKE '%"6"%',
+    'The rebuilt fragment includes the new column'
+  );
+  RETURN NEXT is(
+    msar.list_records_from_table(rel_id, 1, null, null, null, null) -> 'results',
+    '[{"1": 1, "2": 5, "3": "sdflkj", "4": "s", "5": {"a": "val"}, "6": null}]'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_get_record_from_table() RETURNS SETOF TEXT AS $$
 DECLARE
   rel_id oid;
@@ -4127,6 +4569,36 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_pk_lookups_use_index() RETURNS SETOF TEXT AS $$
+DECLARE
+  rel_id oid;
+  pk_where_clause text;
+  plan jsonb;
+BEGIN
+  PERFORM __setup_list_records_table();
+  rel_id := 'atable'::regclass::oid;
+  INSERT INTO atable (col1, col2) SELECT i, i::text FROM generate_series(1, 50000) AS x(i);
+  ANALYZE atable;
+  pk_where_clause := msar.build_where_clause(rel_id, msar.build_pk_in_filter(rel_id, '[2, "30", 400]'));
+  RETURN NEXT is(pk_where_clause, $w$WHERE ("id") = ANY('{2,30,400}'::integer[])$w$);
+  EXECUTE 'EXPLAIN (FORMAT JSON) DELETE FROM atable ' || pk_where_clause INTO plan;
+  RETURN NEXT ok(
+    plan::text LIKE '%"Index Scan"%' OR plan::text LIKE '%"Bitmap Index Scan"%',
+    'Deleting by primary key uses the primary key index'
+  );
+  RETURN NEXT ok(plan::text NOT LIKE '%"Seq Scan"%', 'Deleting by primary key avoids a seq scan');
+  EXECUTE 'EXPLAIN (FORMAT JSON) SELECT * FROM atable '
+    || msar.build_where_clause(rel_id, msar.build_pk_in_filter(rel_id, '[2]'))
+  INTO plan;
+  RETURN NEXT ok(plan::text LIKE '%"Index Scan"%', 'Getting a record uses the primary key index');
+  RETURN NEXT is(msar.delete_records_from_table(rel_id, '[2, "30", 400]'), 3);
+  RETURN NEXT is(
+    msar.get_record_from_table(rel_id, 31) -> 'results' -> 0 -> '3', '"28"'::jsonb
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION __setup_add_record_table() RETURNS SETOF TEXT AS $$
 BEGIN
   PERFORM __setup_list_records_table();
@@ -4577,6 +5049,108 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION test_add_records_to_table() RETURNS SETOF TEXT AS $$
+BEGIN
+  PERFORM __setup_add_record_table();
+  RETURN NEXT is(
+    msar.add_records_to_table(
+      'atable'::regclass::oid,
+      '[{"2": 234, "3": "ab234"}, {"3": "cd567"}, {"2": 235, "3": "ef890"}, {}]'
+    ),
+    $a${
+      "count": 4,
+      "results": [
+        {"1": 4, "2": 234, "3": "ab234", "4": null, "5": null},
+        {"1": 5, "2": 235, "3": "ef890", "4": null, "5": null},
+        {"1": 6, "2": 200, "3": "cd567", "4": null, "5": null},
+        {"1": 7, "2": 200, "3": null, "4": null, "5": null}
+      ],
+      "linked_record_summaries": null,
+      "record_summaries": null,
+      "errors": []
+    }$a$
+  );
+  RETURN NEXT is((SELECT count(*) FROM atable), 7::bigint);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_add_records_to_table_errors() RETURNS SETOF TEXT AS $$
+DECLARE
+  result jsonb;
+BEGIN
+  PERFORM __setup_add_record_table();
+  -- col2 is unique, and 'abcde' already exists.
+  RETURN NEXT throws_ok(
+    $t$SELECT msar.add_records_to_table(
+      'atable'::regclass::oid, '[{"3": "new1"}, {"3": "abcde"}, {"3": "new2"}]'
+    )$t$,
+    '23505'
+  );
+  RETURN NEXT is((SELECT count(*) FROM atable), 3::bigint);
+  result := msar.add_records_to_table(
+    'atable'::regclass::oid,
+    '[{"3": "new1"}, {"3": "abcde"}, {"3": "new2"}, {"2": "notanumber"}]',
+    false,
+    false,
+    true
+  );
+  RETURN NEXT is(result -> 'count', '2'::jsonb);
+  RETURN NEXT is(result -> 'results', 'null'::jsonb);
+  RETURN NEXT is(
+    jsonb_path_query_array(result, '$.errors[*].index'), '[1, 3]'::jsonb
+  );
+  RETURN NEXT is(
+    jsonb_path_query_array(result, '$.errors[*].sql_state'), '["23505", "22P02"]'::jsonb
+  );
+  RETURN NEXT is((SELECT count(*) FROM atable), 5::bigint);
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION test_patch_records_in_table() RETURNS SETOF TEXT AS $$
+DECLARE
+  result jsonb;
+BEGIN
+  PERFORM __setup_add_record_table();
+  RETURN NEXT is(
+    msar.patch_records_in_table(
+      'atable'::regclass::oid,
+      '[{"1": 3, "2": 30}, {"1": 1, "2": 10}, {"1": 2, "3": "changed"}]'
+    ),
+    $a${
+      "count": 3,
+      "results": [
+        {"1": 1, "2": 10, "3": "sdflkj", "4": "s", "5": {"a": "val"}},
+        {"1": 2, "2": 34, "3": "changed", "4": null, "5": [1, 2, 3, 4]},
+        {"1": 3, "2": 30, "3": "abcde", "4": {"k": 3242348}, "5": true}
+      ],
+      "linked_record_summaries": null,
+      "record_summaries": null,
+      "errors": []
+    }$a$
+  );
+  RETURN NEXT throws_ok(
+    $t$SELECT msar.patch_records_in_table(
+      'atable'::regclass::oid, '[{"1": 1, "2": 11}, {"1": 1, "2": 12}]'
+    )$t$,
+    'P0001',
+    'Each record may only be modified once per batch'
+  );
+  result := msar.patch_records_in_table(
+    'atable'::regclass::oid,
+    '[{"1": 1, "3": "abcde"}, {"1": 2, "3": "unique"}, {"2": 5}]',
+    true,
+    false,
+    true
+  );
+  RETURN NEXT is(result -> 'count', '1'::jsonb);
+  RETURN NEXT is(jsonb_path_query_array(result, '$.results[*]."1"'), '[2]'::jsonb);
+  RETURN NEXT is(jsonb_path_query_array(result, '$.errors[*].index'), '[0, 2]'::jsonb);
+END;
+$$ LANGUAGE plpgsql;
+
+
 CREATE OR REPLACE FUNCTION test_search_records_in_table_with_preview() RETURNS SETOF TEXT AS $$
 BEGIN
   PERFORM __setup_preview_fkey_cols();
@@ -4595,6 +5169,55 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+CREATE OR REPLACE FUNCTION
+test_list_records_linked_summaries_scoped_to_page() RETURNS SETOF TEXT AS $$/*
+Linked record summaries should only read the referenced records present on the page, so the cost
+of listing a page doesn't depend on the size of the referenced table.
+*/
+DECLARE
+  seq_read_before bigint;
+  idx_fetch_before bigint;
+  seq_read_after bigint;
+  idx_fetch_after bigint;
+  list_result jsonb;
+BEGIN
+  CREATE TABLE lookup (id integer PRIMARY KEY, "Name" text);
+  INSERT INTO lookup SELECT i, 'Name ' || i FROM generate_series(1, 50000) AS i;
+  CREATE TABLE referrer (id integer PRIMARY KEY, "Lookup" integer REFERENCES lookup (id));
+  INSERT INTO referrer SELECT i, (i * 7) % 50000 + 1 FROM generate_series(1, 1000) AS i;
+  ANALYZE lookup, referrer;
+  SELECT seq_tup_read, coalesce(idx_tup_fetch, 0) INTO seq_read_before, idx_fetch_before
+  FROM pg_catalog.pg_stat_xact_user_tables WHERE relid = 'lookup'::regclass;
+
+  list_result := msar.list_records_from_table(
+    tab_id => 'referrer'::regclass::oid,
+    limit_ => 5,
+    offset_ => 10,
+    order_ => null,
+    filter_ => null,
+    group_ => null,
+    return_record_summaries => true
+  );
+
+  SELECT seq_tup_read, coalesce(idx_tup_fetch, 0) INTO seq_read_after, idx_fetch_after
+  FROM pg_catalog.pg_stat_xact_user_tables WHERE relid = 'lookup'::regclass;
+  RETURN NEXT is(
+    list_result -> 'linked_record_summaries',
+    $j${"2": {"78": "Name 78", "85": "Name 85", "92": "Name 92", "99": "Name 99", "106": "Name 106"}}$j$
+  );
+  RETURN NEXT is(
+    list_result -> 'record_summaries',
+    $j${"11": "11", "12": "12", "13": "13", "14": "14", "15": "15"}$j$
+  );
+  RETURN NEXT is(seq_read_after - seq_read_before, 0::bigint, 'Referenced table is not scanned');
+  RETURN NEXT cmp_ok(
+    idx_fetch_after - idx_fetch_before, '<=', 5::bigint,
+    'Only the referenced records on the page are fetched'
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- msar.replace_database_privileges_for_roles ------------------------------------------------------
 
 CREATE OR REPLACE FUNCTION
@@ -1,5 +1,5 @@
+import codecs
 import json
-import tempfile
 
 import clevercsv as csv
 
@@ -10,6 +10,9 @@ from db.encoding_utils import get_sql_compatible_encoding
 from mathesar.models.deprecated import DataFile
 from mathesar.imports.csv import get_file_encoding, get_sv_reader, process_column_names
 
+# Number of characters read from the file for each write to COPY.
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
 def import_csv(data_file_id, table_name, schema_oid, conn, comment=None):
     data_file = DataFile.objects.get(id=data_file_id)
@@ -56,24 +59,26 @@ def insert_csv_records(
     conversion_encoding,
     conn
 ):
+    """
+    Stream the records of a CSV file into the table via COPY.
+
+    The file is read (and if necessary, transcoded into an encoding that
+    Postgres supports) one chunk at a time, so memory usage doesn't
+    depend on the size of the file.
+    """
     cursor = conn.cursor()
     with open(file_path, 'r', encoding=encoding) as csv_file:
-        if conversion_encoding == encoding:
-            with cursor.copy(copy_sql) as copy:
-                while data := csv_file.read():
+        with cursor.copy(copy_sql) as copy:
+            if conversion_encoding == encoding:
+                while data := csv_file.read(COPY_CHUNK_SIZE):
                     copy.write(data)
-        else:
-            # File needs to be converted to compatible database supported encoding
-            with tempfile.SpooledTemporaryFile(mode='wb+', encoding=conversion_encoding) as temp_file:
-                while True:
-                    contents = csv_file.read().encode(conversion_encoding, "replace")
-                    if not contents:
-                        break
-                    temp_file.write(contents)
-                temp_file.seek(0)
-                with cursor.copy(copy_sql) as copy:
-                    while data := temp_file.read():
-                        copy.write(data)
+            else:
+                # File needs to be converted to compatible database supported encoding
+                encoder = codecs.getincrementalencoder(conversion_encoding)("replace")
+                while data := csv_file.read(COPY_CHUNK_SIZE):
+                    copy.write(encoder.encode(data))
+                if remainder := encoder.encode('', final=True):
+                    copy.write(remainder)
 
 
 def get_preview(table_oid, column_list, conn, limit=20):
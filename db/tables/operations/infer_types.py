@@ -36,6 +36,25 @@ def infer_table_column_data_types(conn, table_oid):
     ).fetchone()[0]
 
 
+def infer_table_column_data_types_sampled(conn, table_oid, sample_size, confirm=True):
+    """
+    Infer the best type for each column in the table from a sample of rows.
+
+    Args:
+        table_oid: The OID of the table whose columns we're inferring types for.
+        sample_size: The maximum number of rows to read for the sample.
+        confirm: Whether to check the inferred types against the whole table.
+
+    The response JSON will have attnum keys, and values will be dicts
+    with the `type` (the result of `format_type`), the `confidence` of
+    the inference, and whether the type was `confirmed` for every row.
+    """
+    return exec_msar_func(
+        conn, 'infer_table_column_data_types_sampled',
+        table_oid, sample_size, confirm
+    ).fetchone()[0]
+
+
 def update_table_column_types(schema, table_name, engine, metadata=None, columns_might_have_defaults=True):
     metadata = metadata if metadata else get_empty_metadata()
     table = reflect_table(table_name, schema, engine, metadata=metadata)
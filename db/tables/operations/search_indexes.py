@@ -0,0 +1,39 @@
+from db.connection import exec_msar_func
+
+
+def get_search_index_info(table_oid, conn):
+    return exec_msar_func(conn, 'get_search_index_info', table_oid).fetchone()[0]
+
+
+def add_search_indexes(table_oid, conn, column_attnums=None):
+    return exec_msar_func(
+        conn, 'add_search_indexes', table_oid, column_attnums
+    ).fetchone()[0]
+
+
+def add_search_indexes_concurrently(table_oid, conn, column_attnums=None):
+    """
+    Add search indexes with `CREATE INDEX CONCURRENTLY`, not blocking writes.
+
+    `CREATE INDEX CONCURRENTLY` can't run in a transaction block, so the
+    transaction of `conn` is committed (installing pg_trgm, if needed),
+    and the indexes are built in autocommit mode. So, `conn` mustn't be
+    within a `conn.transaction()` block.
+    """
+    statements = exec_msar_func(
+        conn, 'prepare_search_indexes', table_oid, column_attnums, True
+    ).fetchone()[0]
+    conn.commit()
+    conn.autocommit = True
+    try:
+        for statement in statements:
+            conn.execute(statement)
+    finally:
+        conn.autocommit = False
+    return get_search_index_info(table_oid, conn)
+
+
+def drop_search_indexes(table_oid, conn, column_attnums=None):
+    return exec_msar_func(
+        conn, 'drop_search_indexes', table_oid, column_attnums
+    ).fetchone()[0]
@@ -1,9 +1,19 @@
+import os
+import time
+
+import pytest
+
+from db.queries import base as queries_base
 from db.queries.base import DBQuery, InitialColumn, JoinParameter
 from db.columns.operations.select import get_column_attnum_from_name as get_attnum
 from db.tables.operations.select import get_oid_from_table
 from db.transforms import base as tbase
 from db.metadata import get_empty_metadata
 
+BENCHMARK_MAX_TRANSFORMS = int(
+    os.environ.get('MATHESAR_DBQUERY_BENCHMARK_MAX_TRANSFORMS', 0)
+)
+
 
 def _extract_col_properties_dict(col):
     return {
@@ -323,3 +333,88 @@ def test_DBQuery_all_sa_columns_map_overwriting(engine_with_library):
         for k, v in dbq.all_sa_columns_map.items()
     }
     assert actual_columns == expect_columns
+
+
+def _get_checkouts_dbquery(engine, schema, num_filters):
+    checkouts_oid = get_oid_from_table("Checkouts", schema, engine)
+    metadata = get_empty_metadata()
+    initial_columns = [
+        InitialColumn(
+            checkouts_oid,
+            get_attnum(checkouts_oid, 'id', engine, metadata=metadata),
+            alias='Checkout'
+        ),
+        InitialColumn(
+            checkouts_oid,
+            get_attnum(checkouts_oid, 'Due Date', engine, metadata=metadata),
+            alias='Due Date'
+        ),
+    ]
+    transformations = [
+        tbase.Filter(
+            spec={"greater": [{"column_name": ["Checkout"]}, {"literal": [i]}]}
+        )
+        for i in range(num_filters)
+    ]
+    return DBQuery(
+        checkouts_oid,
+        initial_columns,
+        engine,
+        transformations=transformations,
+        metadata=metadata,
+    )
+
+
+def test_DBQuery_all_sa_columns_map_reflects_once(engine_with_library, monkeypatch):
+    engine, schema = engine_with_library
+    dbq = _get_checkouts_dbquery(engine, schema, 5)
+    reflected_oids = []
+    reflect_table_from_oid = queries_base.reflect_table_from_oid
+
+    def _counting_reflect_table_from_oid(oid, *args, **kwargs):
+        reflected_oids.append(oid)
+        return reflect_table_from_oid(oid, *args, **kwargs)
+
+    monkeypatch.setattr(
+        queries_base, 'reflect_table_from_oid', _counting_reflect_table_from_oid
+    )
+    actual_columns = {
+        k: _extract_col_properties_dict(v)
+        for k, v in dbq.all_sa_columns_map.items()
+    }
+    assert actual_columns == {
+        'Checkout': {'name': 'Checkout', 'type': 'integer'},
+        'Due Date': {'name': 'Due Date', 'type': 'date'},
+    }
+    assert reflected_oids == [dbq.base_table_oid]
+
+
+@pytest.mark.skipif(
+    not BENCHMARK_MAX_TRANSFORMS,
+    reason='MATHESAR_DBQUERY_BENCHMARK_MAX_TRANSFORMS is not set'
+)
+def test_DBQuery_all_sa_columns_map_benchmark(engine_with_library):
+    """
+    Times all_sa_columns_map for growing numbers of transforms, e.g.:
+
+        MATHESAR_DBQUERY_BENCHMARK_MAX_TRANSFORMS=64 pytest -n0 \\
+            db/tests/queries/test_base.py -k benchmark
+
+    The timings are reported if the cost grows too fast.
+    """
+    engine, schema = engine_with_library
+    num_transforms = 1
+    timings = {}
+    while num_transforms <= BENCHMARK_MAX_TRANSFORMS:
+        dbq = _get_checkouts_dbquery(engine, schema, num_transforms)
+        start = time.perf_counter()
+        dbq.all_sa_columns_map
+        timings[num_transforms] = time.perf_counter() - start
+        num_transforms *= 2
+    largest = max(timings)
+    if largest >= 8:
+        # Doubling the transforms should roughly double the cost; a
+        # quadratic implementation would roughly quadruple it.
+        assert timings[largest] / timings[largest // 2] < 3, ', '.join(
+            f'{n} transforms: {t * 1000:.1f}ms' for n, t in timings.items()
+        )
@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+
+import pytest
+
+from db.records.operations import export
+
+
+class MockCopy:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+
+class MockCursor:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.copied = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @contextmanager
+    def copy(self, statement, params=None):
+        self.copied.append((statement, params))
+        yield MockCopy(self.chunks)
+
+
+class MockConnection:
+    def __init__(self, chunks):
+        self.mock_cursor = MockCursor(chunks)
+
+    def cursor(self):
+        return self.mock_cursor
+
+
+def test_stream_copy_yields_chunks():
+    conn = MockConnection([memoryview(b'id,name\n'), memoryview(b'1,a\n')])
+    chunks = export.stream_copy(conn, 'COPY', {'param_1': 1})
+    assert list(chunks) == [b'id,name\n', b'1,a\n']
+    assert conn.mock_cursor.copied == [('COPY', {'param_1': 1})]
+
+
+def test_stream_copy_is_lazy():
+    conn = MockConnection([b'1\n'])
+    chunks = export.stream_copy(conn, 'COPY')
+    assert conn.mock_cursor.copied == []
+    next(chunks)
+    assert conn.mock_cursor.copied == [('COPY', None)]
+
+
+def test_get_copy_statement_unknown_format():
+    with pytest.raises(ValueError):
+        export.get_copy_statement('SELECT 1', 'xlsx')
+
+
+@pytest.mark.parametrize('format_', export.EXPORT_FORMATS)
+def test_get_copy_statement(format_):
+    statement = export.get_copy_statement('SELECT 1', format_)
+    assert statement.as_string(None).startswith('COPY (SELECT 1) TO STDOUT (FORMAT csv')
@@ -1,3 +1,4 @@
+from db.records.operations import insert
 from db.records.operations.insert import insert_from_select
 from db.records.operations.select import get_records
 
@@ -39,3 +40,24 @@ def test_insert_from_select_with_mappings(books_table_import_from_obj, books_tab
     assert res_table.c['title'] == target_table.c[1]
     assert res_table.c['author'] == target_table.c[2]
     assert records == records_with_mappings
+
+
+def test_get_csv_line():
+    values = ['say "hi"', "", None, 1, 1.5, False, {"a": 1}, [1, "b"]]
+    assert insert._get_csv_line(values) == (
+        '"say ""hi""","",,"1","1.5","false","{""a"": 1}","[1, ""b""]"\n'
+    )
+
+
+def test_get_json_record_values():
+    json_dict = {"a": {"b": 1, "c": 2}, "id": 3}
+    keys = ["id", "a.c", "missing", "a.b"]
+    assert insert._get_json_record_values(json_dict, 1, keys) == [3, 2, None, 1]
+
+
+def test_line_reader_reads_sized_chunks():
+    reader = insert._LineReader(iter(['abc\n', 'defgh\n', 'i\n']))
+    assert reader.read(5) == 'abc\nd'
+    assert reader.read(5) == 'efgh\n'
+    assert reader.read(5) == 'i\n'
+    assert reader.read(5) == ''
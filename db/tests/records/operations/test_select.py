@@ -1,6 +1,10 @@
 from decimal import Decimal
 from collections import Counter
-from db.records.operations.select import get_records, get_column_cast_records
+import pytest
+
+from db.records.operations.select import (
+    get_count, get_records, get_column_cast_records, get_records_with_count
+)
 from db.tables.operations.create import create_mathesar_table
 from db.types.base import PostgresType
 from db.schemas.utils import get_schema_oid_from_name
@@ -27,6 +31,66 @@ def test_get_records_gets_limited_offset_records(roster_table_obj):
     assert len(offset_records) == 10 and offset_records[0] == base_records[5]
 
 
+def test_get_records_with_count(roster_table_obj):
+    roster, engine = roster_table_obj
+    base_records = get_records(roster, engine, limit=10, offset=5)
+    records, count = get_records_with_count(roster, engine, limit=10, offset=5)
+    assert count == 1000
+    assert records == [record._asdict() for record in base_records]
+
+
+def test_get_records_with_count_past_end(roster_table_obj):
+    roster, engine = roster_table_obj
+    records, count = get_records_with_count(roster, engine, limit=10, offset=2000)
+    assert records == []
+    assert count == 1000
+
+
+def test_get_records_with_count_zero_limit(roster_table_obj):
+    roster, engine = roster_table_obj
+    records, count = get_records_with_count(roster, engine, limit=0)
+    assert records == []
+    assert count == 1000
+
+
+@pytest.mark.parametrize("count_mode", ["estimated", "exact_if_cheap"])
+def test_get_records_with_count_estimated(roster_table_obj, count_mode):
+    roster, engine = roster_table_obj
+    records, count = get_records_with_count(
+        roster, engine, limit=10, count_mode=count_mode
+    )
+    assert len(records) == 10
+    assert isinstance(count, int)
+
+
+def test_get_records_with_count_none(roster_table_obj):
+    roster, engine = roster_table_obj
+    records, count = get_records_with_count(roster, engine, limit=10, count_mode="none")
+    assert len(records) == 10
+    assert count is None
+
+
+GRADE_FILTER = {"lesser": [{"column_name": ["Grade"]}, {"literal": [50]}]}
+
+
+def test_get_count_filtered(roster_table_obj):
+    roster, engine = roster_table_obj
+    count = get_count(roster, engine, filter=GRADE_FILTER)
+    assert count == len([r for r in get_records(roster, engine) if r.Grade is not None and r.Grade < 50])
+
+
+@pytest.mark.parametrize("count_mode", ["estimated", "exact_if_cheap"])
+def test_get_count_filtered_estimated(roster_table_obj, count_mode):
+    roster, engine = roster_table_obj
+    count = get_count(roster, engine, filter=GRADE_FILTER, count_mode=count_mode)
+    assert isinstance(count, int)
+
+
+def test_get_count_none(roster_table_obj):
+    roster, engine = roster_table_obj
+    assert get_count(roster, engine, filter=GRADE_FILTER, count_mode="none") is None
+
+
 def test_get_column_cast_records(engine_with_schema):
     COL1 = "col1"
     COL2 = "col2"
@@ -0,0 +1,64 @@
+from io import BytesIO, StringIO
+import json
+
+import pytest
+
+from db import json_stream
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    # Make every value span several chunks of the file.
+    monkeypatch.setattr(json_stream, 'READ_SIZE', 3)
+
+
+def _get_values(contents):
+    return list(json_stream.iter_json_values(StringIO(contents)))
+
+
+def test_iter_json_values_array(small_reads):
+    contents = '[{"a": 1}, {"b": [1, 2]} , {"c": "x\\u00e9"}]'
+    assert _get_values(contents) == [{"a": 1}, {"b": [1, 2]}, {"c": "xé"}]
+
+
+def test_iter_json_values_single_object(small_reads):
+    assert _get_values('{"a": {"b": 1}}') == [{"a": {"b": 1}}]
+
+
+def test_iter_json_values_ndjson(small_reads):
+    contents = '{"a": 1}\n{"b": 2}\r\n\n{"c": 3}\n'
+    assert _get_values(contents) == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+def test_iter_json_values_empty_array(small_reads):
+    assert _get_values(' [ ] ') == []
+
+
+def test_iter_json_values_number_across_chunks(small_reads):
+    assert _get_values('[12345, 678]') == [12345, 678]
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'utf-16', 'utf-32'])
+def test_iter_json_values_binary_file(small_reads, encoding):
+    json_file = BytesIO('[{"name": "Åsa"}, {"name": "José"}]'.encode(encoding))
+    values = list(json_stream.iter_json_values(json_file))
+    assert values == [{"name": "Åsa"}, {"name": "José"}]
+
+
+@pytest.mark.parametrize('contents', ['', '  ', '[{"a": 1},', '[1 2]', '[1] [2]', '{"a": }'])
+def test_iter_json_values_invalid(small_reads, contents):
+    with pytest.raises(json.JSONDecodeError):
+        _get_values(contents)
+
+
+def test_flatten_json_object():
+    json_dict = {"a": {"b": {"c": 1}, "d": 2}, "e": [{"f": 3}]}
+    assert list(json_stream.flatten_json_object(json_dict, 0)) == [
+        ("a", {"b": {"c": 1}, "d": 2}), ("e", [{"f": 3}])
+    ]
+    assert list(json_stream.flatten_json_object(json_dict, 1)) == [
+        ("a.b", {"c": 1}), ("a.d", 2), ("e", [{"f": 3}])
+    ]
+    assert list(json_stream.flatten_json_object(json_dict, 2)) == [
+        ("a.b.c", 1), ("a.d", 2), ("e", [{"f": 3}])
+    ]
@@ -9,6 +9,21 @@ def apply_transformations(relation, transformations):
     return relation
 
 
+def apply_transformations_stepwise(relation, transformations):
+    """
+    Like apply_transformations, but returns the relation as it is after
+    each step: the input relation, followed by one relation per transform.
+
+    Each step builds on the previous one, so getting every intermediate
+    relation costs no more than getting the last one.
+    """
+    enforce_relation_type_expectations(relation)
+    relations = [relation]
+    for transform in transformations:
+        relations.append(_apply_transform(relations[-1], transform))
+    return relations
+
+
 def _apply_transform(relation, transform):
     assert isinstance(transform, Transform)
     relation = transform.apply_to_relation(relation)
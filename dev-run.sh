@@ -12,4 +12,10 @@ npm run dev &
 cd ..
 python -m mathesar.install --skip-confirm
 python manage.py createsuperuser --no-input --username admin --email admin@example.com
+# Run background jobs in a separate process, restarted whenever it dies
+# (e.g., crashing or being OOM-killed). It exits cleanly once stopped.
+until python manage.py run_job_worker; do
+  echo "Job worker exited with status $?, restarting it" >&2
+  sleep 1
+done &
 python manage.py runserver 0.0.0.0:8000 && fg
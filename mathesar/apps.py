@@ -19,3 +19,6 @@ class MathesarConfig(AppConfig):
         """Perform initialization tasks."""
         import mathesar.signals  # noqa
         post_migrate.connect(_prepare_database_model)
+        if settings.MATHESAR_METRICS['ENABLED']:
+            from mathesar.utils import metrics
+            metrics.install()
@@ -1,3 +1,4 @@
+import codecs
 from io import TextIOWrapper
 
 import clevercsv as csv
@@ -19,6 +20,8 @@ from mathesar.state import reset_reflection
 ALLOWED_DELIMITERS = ",\t:|;"
 SAMPLE_SIZE = 20000
 CHECK_ROWS = 10
+# Number of bytes from the start of a file used to detect its encoding.
+ENCODING_SAMPLE_SIZE = 1024 * 1024
 
 
 def is_valid_csv(data):
@@ -36,11 +39,14 @@ def get_file_encoding(file):
     libraries are missing.
     """
     from charset_normalizer import detect
-    # Sample Size reduces the accuracy
-    encoding = detect(file.read()).get('encoding', None)
+    # Only a prefix of the file is read, so that detection doesn't load
+    # the whole file into memory.
+    encoding = detect(file.read(ENCODING_SAMPLE_SIZE)).get('encoding', None)
     file.seek(0)
-    if encoding is not None:
+    if encoding is not None and codecs.lookup(encoding).name != 'ascii':
         return encoding
+    # Non-ASCII characters may appear after the prefix, so we use a
+    # superset of ASCII in that case.
     return "utf-8"
 
 
@@ -1,9 +1,16 @@
+from collections import Counter
+import json
+import os
+import tempfile
+
+import openpyxl
 import pandas
+import pyxlsb
 
 from db.constants import ID, ID_ORIGINAL
 from db.tables.operations.alter import update_pk_sequence_to_latest
 from mathesar.database.base import create_mathesar_engine
-from db.records.operations.insert import insert_records_from_excel
+from db.records.operations.insert import copy_records_into_table, insert_records_from_excel
 from db.tables.operations.create import create_string_column_table
 from db.tables.operations.drop import drop_table
 from mathesar.imports.utils import get_alternate_column_names, process_column_names
@@ -12,6 +19,9 @@ from sqlalchemy.exc import IntegrityError as sqlalchemy_integrity_error
 
 from mathesar.state import reset_reflection
 
+# Formats with a read-only, streaming reader in openpyxl.
+OPENPYXL_EXTENSIONS = ['xlsx', 'xlsm']
+
 
 def insert_records_from_dataframe(name, schema, column_names, engine, comment, dataframe):
     table = create_string_column_table(
@@ -47,9 +57,163 @@ def remove_empty_rows_and_columns_from_dataframe(df):
     return df
 
 
+def iter_sheet_rows(file_path, sheet_index):
+    """
+    Yield the rows of a sheet as tuples of cell values, without loading the
+    whole workbook into memory.
+
+    Returns None if there's no streaming reader for the file's format.
+    """
+    extension = os.path.splitext(file_path)[1][1:].lower()
+    if extension in OPENPYXL_EXTENSIONS:
+        return _iter_openpyxl_rows(file_path, sheet_index)
+    elif extension == 'xlsb':
+        return _iter_pyxlsb_rows(file_path, sheet_index)
+
+
+def _iter_openpyxl_rows(file_path, sheet_index):
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[sheet_index].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_pyxlsb_rows(file_path, sheet_index):
+    with pyxlsb.open_workbook(file_path) as workbook:
+        # pyxlsb sheet indexes start at 1
+        with workbook.get_sheet(sheet_index + 1) as sheet:
+            for row in sheet.rows():
+                yield tuple(cell.v for cell in row)
+
+
+def _normalize_cell_value(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores all numbers as floats.
+        return int(value)
+    if isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def _deduplicate_column_names(column_names):
+    """Rename repeated column names the way pandas does, i.e., `a`, `a.1`, ..."""
+    counts = Counter()
+    used_names = set()
+    deduplicated = []
+    for column_name in column_names:
+        new_name = column_name
+        while new_name in used_names:
+            counts[column_name] += 1
+            new_name = f"{column_name}.{counts[column_name]}"
+        used_names.add(new_name)
+        deduplicated.append(new_name)
+    return deduplicated
+
+
+class SheetSpool:
+    """
+    The rows of a sheet, copied into a temporary file in a single pass.
+
+    While spooling, we keep track of which columns have any values, so that
+    empty columns can be left out, and which columns hold only integers, so
+    that we know whether an `id` column can be kept. The column names are
+    therefore known before any data is written to the database, and
+    retrying the insert reads the spool rather than the workbook.
+    """
+
+    def __init__(self, rows, header):
+        self.file = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.header = None
+        self.num_records = 0
+        non_empty_counts = Counter()
+        integer_counts = Counter()
+        for row in rows:
+            values = [_normalize_cell_value(value) for value in row]
+            while values and values[-1] is None:
+                values.pop()
+            if not values:
+                # Like pandas, we skip blank rows.
+                continue
+            non_empty_counts.update(i for i, value in enumerate(values) if value is not None)
+            if header and self.header is None:
+                self.header = values
+                continue
+            integer_counts.update(
+                i for i, value in enumerate(values)
+                if isinstance(value, int) and not isinstance(value, bool)
+            )
+            self.file.write(json.dumps(values) + '\n')
+            self.num_records += 1
+        self.column_indexes = sorted(non_empty_counts)
+        self._integer_counts = integer_counts
+
+    @property
+    def column_names(self):
+        header = self.header or []
+        return _deduplicate_column_names(process_column_names(
+            str(header[i]) if i < len(header) and header[i] is not None else ''
+            for i in self.column_indexes
+        ))
+
+    def is_integer_column(self, position):
+        """Whether every record has an integer at the given column position."""
+        return self._integer_counts[self.column_indexes[position]] == self.num_records
+
+    def iter_records(self):
+        self.file.seek(0)
+        for line in self.file:
+            values = json.loads(line)
+            yield [values[i] if i < len(values) else None for i in self.column_indexes]
+
+    def close(self):
+        self.file.close()
+
+
+def insert_records_from_sheet_spool(name, schema, column_names, engine, comment, spool):
+    table = create_string_column_table(
+        name=name,
+        schema_oid=schema.oid,
+        column_names=column_names,
+        engine=engine,
+        comment=comment,
+    )
+    copy_records_into_table(table, engine, column_names, spool.iter_records())
+    return table
+
+
+def create_db_table_from_sheet_rows(rows, header, name, schema, engine, comment=None):
+    spool = SheetSpool(rows, header)
+    try:
+        column_names = spool.column_names
+        if ID in column_names and not spool.is_integer_column(column_names.index(ID)):
+            # The values can't go into our default id column, so there's no
+            # point in trying.
+            column_names = get_alternate_column_names(column_names)
+        try:
+            table = insert_records_from_sheet_spool(name, schema, column_names, engine, comment, spool)
+            update_pk_sequence_to_latest(engine, table)
+        except (IntegrityError, DataError, sqlalchemy_integrity_error):
+            drop_table(name=name, schema=schema.name, engine=engine)
+            column_names_alt = get_alternate_column_names(column_names)
+            table = insert_records_from_sheet_spool(name, schema, column_names_alt, engine, comment, spool)
+    finally:
+        spool.close()
+    return table
+
+
 def create_db_table_from_excel_data_file(data_file, name, schema, comment=None):
     db_model = schema.database
     engine = create_mathesar_engine(db_model)
+    rows = iter_sheet_rows(data_file.file.path, data_file.sheet_index)
+    if rows is not None:
+        table = create_db_table_from_sheet_rows(
+            rows, data_file.header, name, schema, engine, comment
+        )
+        reset_reflection(db_name=db_model.name)
+        return table
     header_row = 0 if data_file.header else None
     dataframe = remove_empty_rows_and_columns_from_dataframe(
         pandas.read_excel(data_file.file.path, data_file.sheet_index, header=header_row)
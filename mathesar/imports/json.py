@@ -1,6 +1,7 @@
 import json
 from json.decoder import JSONDecodeError
 
+from db.json_stream import flatten_json_object, iter_json_values
 from db.tables.operations.alter import update_pk_sequence_to_latest
 from mathesar.database.base import create_mathesar_engine
 from db.records.operations.insert import insert_records_from_json
@@ -20,51 +21,56 @@ def is_valid_json(data):
     try:
         json.loads(data)
     except (JSONDecodeError, ValueError):
-        return False
+        return is_valid_ndjson(data)
     return True
 
 
+def is_valid_ndjson(data):
+    """Check whether `data` is newline delimited JSON, with an object per line."""
+    if not isinstance(data, (str, bytes)):
+        return False
+    lines = [line for line in data.splitlines() if line.strip()]
+    try:
+        return len(lines) > 0 and all(isinstance(json.loads(line), dict) for line in lines)
+    except (JSONDecodeError, ValueError):
+        return False
+
+
 def validate_json_format(data_file_content):
+    """
+    Check that a JSON file holds an object, an array of objects, or objects
+    separated by whitespace (e.g., NDJSON).
+
+    The file is read incrementally, so it's never held in memory as a whole.
+    """
     try:
-        data = json.load(data_file_content)
+        for value in iter_json_values(data_file_content):
+            if not isinstance(value, dict):
+                raise database_api_exceptions.UnsupportedJSONFormat()
     except (JSONDecodeError, ValueError) as e:
         raise database_api_exceptions.InvalidJSONFormat(e)
 
-    is_list_of_dicts = isinstance(data, list) and all(isinstance(val, dict) for val in data)
-    if is_list_of_dicts:
-        return
-    if isinstance(data, dict):
-        return
-    raise database_api_exceptions.UnsupportedJSONFormat()
-
 
 def get_flattened_keys(json_dict, max_level, prefix=''):
-    keys = []
-    for key, value in json_dict.items():
-        flattened_key = f"{prefix}{key}"
-        if isinstance(value, dict) and max_level > 0:
-            keys += get_flattened_keys(value, max_level - 1, f"{flattened_key}.")
-        else:
-            keys.append(flattened_key)
-    return keys
+    return [key for key, _ in flatten_json_object(json_dict, max_level, prefix)]
 
 
 def get_column_names_from_json(data_file, max_level):
-    with open(data_file, 'r') as f:
-        data = json.load(f)
+    """
+    Get the flattened keys of all objects in a JSON file, in a single pass.
 
-    if isinstance(data, list):
-        all_keys = []
-        for obj in data:
-            for key in get_flattened_keys(obj, max_level):
-                if key not in all_keys:
-                    all_keys.append(key)
-        return all_keys
-    else:
-        return get_flattened_keys(data, max_level)
+    Keys are in order of their first appearance.
+    """
+    all_keys = {}
+    with open(data_file, 'rb') as f:
+        for obj in iter_json_values(f):
+            all_keys.update(dict.fromkeys(get_flattened_keys(obj, max_level)))
+    return list(all_keys)
 
 
-def insert_records_from_json_data_file(name, schema, column_names, engine, comment, json_filepath, max_level):
+def insert_records_from_json_data_file(
+        name, schema, column_names, engine, comment, json_filepath, max_level, json_keys
+):
     table = create_string_column_table(
         name=name,
         schema_oid=schema.oid,
@@ -77,7 +83,8 @@ def insert_records_from_json_data_file(name, schema, column_names, engine, comme
         engine,
         json_filepath,
         column_names,
-        max_level
+        max_level,
+        json_keys,
     )
     return table
 
@@ -87,16 +94,19 @@ def create_db_table_from_json_data_file(data_file, name, schema, comment=None):
     engine = create_mathesar_engine(db_model)
     json_filepath = data_file.file.path
     max_level = data_file.max_level
-    column_names = process_column_names(
-        get_column_names_from_json(json_filepath, max_level)
-    )
+    json_keys = get_column_names_from_json(json_filepath, max_level)
+    column_names = process_column_names(json_keys)
     try:
-        table = insert_records_from_json_data_file(name, schema, column_names, engine, comment, json_filepath, max_level)
+        table = insert_records_from_json_data_file(
+            name, schema, column_names, engine, comment, json_filepath, max_level, json_keys
+        )
         update_pk_sequence_to_latest(engine, table)
     except (IntegrityError, DataError, sqlalchemy_integrity_error):
         drop_table(name=name, schema=schema.name, engine=engine)
         column_names_alt = get_alternate_column_names(column_names)
-        table = insert_records_from_json_data_file(name, schema, column_names_alt, engine, comment, json_filepath, max_level)
+        table = insert_records_from_json_data_file(
+            name, schema, column_names_alt, engine, comment, json_filepath, max_level, json_keys
+        )
 
     reset_reflection(db_name=db_model.name)
     return table
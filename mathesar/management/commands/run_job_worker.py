@@ -0,0 +1,21 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from mathesar.utils.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run background jobs (e.g., imports submitted with `run_async`) until stopped."
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+
+        def _stop(_signum, _frame):
+            self.stdout.write("Stopping once running jobs finish...")
+            stop.set()
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        self.stdout.write("Running background jobs.")
+        run_worker(stop)
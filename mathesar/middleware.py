@@ -1,10 +1,15 @@
 import time
 import warnings
 
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from sqlalchemy.exc import InterfaceError
 
+from mathesar.utils import metrics
+
 
 class CursorClosedHandlerMiddleware:
     def __init__(self, get_response):
@@ -33,3 +38,24 @@ class PasswordChangeNeededMiddleware:
             return HttpResponseRedirect(reverse('password_reset_confirm'))
         response = self.get_response(request)
         return response
+
+
+class MetricsMiddleware:
+    """
+    Collect the timings of each request while metrics are enabled.
+
+    Also counts the Django ORM queries run, and optionally sends the
+    timings to the client in a `Server-Timing` header.
+    """
+    def __init__(self, get_response):
+        if not settings.MATHESAR_METRICS['ENABLED']:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with metrics.request_timings() as timings:
+            with connection.execute_wrapper(timings.count_orm_query):
+                response = self.get_response(request)
+        if settings.MATHESAR_METRICS['SERVER_TIMING']:
+            response['Server-Timing'] = timings.get_server_timing_header()
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0020_job_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordCountVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('table_oid', models.PositiveBigIntegerField()),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('database', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='mathesar.database')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='recordcountversion',
+            constraint=models.UniqueConstraint(fields=('database', 'table_oid'), name='unique_record_count_version'),
+        ),
+    ]
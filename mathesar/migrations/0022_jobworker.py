@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0021_recordcountversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobWorker',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('hostname', models.CharField(max_length=255)),
+                ('pid', models.IntegerField()),
+                ('heartbeat_at', models.DateTimeField()),
+            ],
+        ),
+    ]
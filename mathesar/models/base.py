@@ -147,6 +147,21 @@ class TableMetaData(BaseModel):
         ]
 
 
+class RecordCountVersion(BaseModel):
+    """A version of a table's records, bumped when records are written."""
+    database = models.ForeignKey('Database', on_delete=models.CASCADE)
+    table_oid = models.PositiveBigIntegerField()
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["database", "table_oid"],
+                name="unique_record_count_version"
+            )
+        ]
+
+
 class Explorations(BaseModel):
     database = models.ForeignKey('Database', on_delete=models.CASCADE)
     name = models.CharField(max_length=128, unique=True)
@@ -157,3 +172,47 @@ class Explorations(BaseModel):
     display_options = models.JSONField(null=True)
     display_names = models.JSONField(null=True)
     description = models.CharField(null=True)
+
+
+class Job(BaseModel):
+    """A long-running RPC method call, run in the background."""
+    user = models.ForeignKey('User', on_delete=models.CASCADE)
+    database = models.ForeignKey('Database', on_delete=models.CASCADE)
+    method = models.CharField(max_length=255)
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=16,
+        choices=[
+            ("pending", "pending"),
+            ("running", "running"),
+            ("succeeded", "succeeded"),
+            ("failed", "failed"),
+            ("cancelled", "cancelled"),
+        ],
+        default="pending"
+    )
+    result = models.JSONField(null=True)
+    error = models.JSONField(null=True)
+    backend_pid = models.IntegerField(null=True)
+    cancel_requested = models.BooleanField(default=False)
+    started_at = models.DateTimeField(null=True)
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+
+class JobWorker(BaseModel):
+    """A running job worker process, so that we can tell if jobs will run."""
+    hostname = models.CharField(max_length=255)
+    pid = models.IntegerField()
+    heartbeat_at = models.DateTimeField()
+
+
+class SlowCall(BaseModel):
+    """An RPC method call that took longer than the slow call threshold."""
+    user = models.ForeignKey('User', on_delete=models.SET_NULL, null=True)
+    database = models.ForeignKey('Database', on_delete=models.CASCADE)
+    method = models.CharField(max_length=255)
+    duration = models.FloatField()
+    params = models.JSONField()
+    sql = models.TextField(null=True)
+    plan = models.JSONField(null=True)
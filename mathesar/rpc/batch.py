@@ -0,0 +1,143 @@
+"""
+JSON-RPC 2.0 batch requests with shared connections.
+
+The calls in a batch are grouped by their `database_id` param. The calls
+of a group run in order on one connection to their database, in one
+transaction, which is committed after the last call of the group (see
+`mathesar.rpc.utils.SharedConnection`). Each call runs in a savepoint, so
+a failing call doesn't affect the others. If all calls of a group only
+read, the transaction is read-only and repeatable read, so that the calls
+see one snapshot. Side effects that must follow a commit (e.g.,
+invalidating cached record counts) are deferred with
+`mathesar.rpc.utils.on_commit`.
+
+Groups for different databases run concurrently, in up to
+`MATHESAR_RPC_BATCH['WORKERS']` threads. Calls without a `database_id`
+run afterwards, on their own.
+"""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+from django.conf import settings
+from django.db import close_old_connections
+from modernrpc.exceptions import RPCException
+from modernrpc.handlers import JSONRPCHandler
+
+from mathesar.rpc.utils import (
+    is_read_only_method, shared_connection, shared_connection_context
+)
+
+# Methods which manage their own transactions, and so can't share one.
+UNSHARED_CONNECTION_METHODS = frozenset({
+    'databases.configured.disconnect',
+    'databases.delete',
+})
+
+
+class BatchJSONRPCHandler(JSONRPCHandler):
+    """A JSON-RPC handler running batch requests with `run_batch`."""
+
+    def process_request(self, request_body, context):
+        try:
+            parsed_request = self.parse_request(request_body)
+        except RPCException:
+            # Let the default handling report the parse error.
+            return super().process_request(request_body, context)
+        if not isinstance(parsed_request, list):
+            return self.dumps_result(self.process_single_request(parsed_request, context))
+        results = run_batch(
+            parsed_request,
+            lambda call: self.process_single_request(call, context),
+            context.request.user,
+        )
+        dumped_results = [
+            self.dumps_result(result) for result in results if not result.is_notification
+        ]
+        # Nothing is returned for a batch of notifications only.
+        return f"[{', '.join(dumped_results)}]" if dumped_results else ""
+
+
+def run_batch(calls, process_call, user):
+    """
+    Run the calls of a batch request, sharing connections between them.
+
+    Args:
+        calls: The parsed calls of the batch.
+        process_call: A function running a call, and returning its result.
+        user: The user making the request.
+
+    Returns:
+        The results of the calls, in the same order.
+    """
+    results = [None] * len(calls)
+    groups = defaultdict(list)
+    for index, call in enumerate(calls):
+        groups[_get_database_id(call)].append(index)
+    unshared_indices = groups.pop(None, [])
+
+    def run_group(database_id, indices):
+        group_calls = [calls[i] for i in indices]
+        if any(_get_method(call) in UNSHARED_CONNECTION_METHODS for call in group_calls):
+            for i in indices:
+                results[i] = process_call(calls[i])
+            return
+        read_only = all(_is_read_only(call) for call in group_calls)
+        with shared_connection(database_id, user, read_only) as shared:
+            with shared_connection_context(shared):
+                for i in indices:
+                    results[i] = process_call(calls[i])
+
+    group_items = list(groups.items())
+    workers = min(settings.MATHESAR_RPC_BATCH['WORKERS'], len(group_items))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers - 1) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, _run_in_thread, run_group, *item
+                )
+                for item in group_items[1:]
+            ]
+            # The request's thread runs a group too, rather than just waiting.
+            run_group(*group_items[0])
+            for future in futures:
+                future.result()
+    else:
+        for item in group_items:
+            run_group(*item)
+    for i in unshared_indices:
+        results[i] = process_call(calls[i])
+    return results
+
+
+def _run_in_thread(func, *args):
+    try:
+        func(*args)
+    finally:
+        # Each thread gets its own Django connection, which would otherwise
+        # stay open.
+        close_old_connections()
+
+
+def _get_params(call):
+    params = call.get('params') if isinstance(call, dict) else None
+    return params if isinstance(params, dict) else {}
+
+
+def _get_method(call):
+    return call.get('method') if isinstance(call, dict) else None
+
+
+def _get_database_id(call):
+    database_id = _get_params(call).get('database_id')
+    if isinstance(database_id, int) and not isinstance(database_id, bool):
+        return database_id
+
+
+def _is_read_only(call):
+    method = _get_method(call)
+    if not isinstance(method, str):
+        return False
+    if method == 'columns.get_profile' and _get_params(call).get('analyze'):
+        return False
+    return is_read_only_method(method)
@@ -9,11 +9,16 @@ from modernrpc.auth.basic import http_basic_auth_login_required
 from db.columns.operations.alter import alter_columns_in_table
 from db.columns.operations.create import add_columns_to_table
 from db.columns.operations.drop import drop_columns_from_table
-from db.columns.operations.select import get_column_info_for_table
+from db.columns.operations.select import get_column_info_for_table, get_column_profiles
 from mathesar.rpc.columns.metadata import ColumnMetaDataBlob
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
 from mathesar.rpc.utils import connect
 from mathesar.utils.columns import get_columns_meta_data
+from mathesar.utils.jobs import register_job, submit_job
+
+# The most rows `columns.get_profile` reads for a sample, however many are
+# asked for.
+MAX_PROFILE_SAMPLE_SIZE = 100000
 
 
 class TypeOptions(TypedDict, total=False):
@@ -193,6 +198,56 @@ class ColumnInfo(TypedDict):
         )
 
 
+class ColumnProfile(TypedDict):
+    """
+    Summary statistics for a column.
+
+    All statistics are estimates. Values are given as their text
+    representation.
+
+    Attributes:
+        id: The `attnum` of the column in the table.
+        source: Where the statistics come from. Either `statistics`
+            (i.e., the Postgres planner statistics), or `sample`.
+        sampled_rows: The number of rows read, if sampled.
+        null_fraction: The fraction of values that are null.
+        distinct_count: The estimated number of distinct values. Null if
+            it can't be estimated, e.g. if the size of the table is unknown.
+        most_common_values: The most common values, most common first.
+        most_common_frequencies: The fractions of rows holding each of
+            the most common values.
+        histogram_bounds: Values dividing the remaining values into
+            groups of approximately equal size.
+        min: The smallest value seen, if the type is ordered.
+        max: The largest value seen, if the type is ordered.
+    """
+    id: int
+    source: Literal['statistics', 'sample']
+    sampled_rows: Optional[int]
+    null_fraction: Optional[float]
+    distinct_count: Optional[float]
+    most_common_values: Optional[list[str]]
+    most_common_frequencies: Optional[list[float]]
+    histogram_bounds: Optional[list[str]]
+    min: Optional[str]
+    max: Optional[str]
+
+    @classmethod
+    def from_dict(cls, profile):
+        return cls(
+            id=profile["attnum"],
+            source=profile["source"],
+            sampled_rows=profile.get("sampled_rows"),
+            null_fraction=profile.get("null_fraction"),
+            distinct_count=profile.get("distinct_count"),
+            most_common_values=profile.get("most_common_values"),
+            most_common_frequencies=profile.get("most_common_frequencies"),
+            histogram_bounds=profile.get("histogram_bounds"),
+            min=profile.get("min"),
+            max=profile.get("max"),
+        )
+
+
 @rpc_method(name="columns.list")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -251,6 +306,7 @@ def patch(
         column_data_list: list[SettableColumnInfo],
         table_oid: int,
         database_id: int,
+        run_async: bool = False,
         **kwargs
 ) -> int:
     """
@@ -262,13 +318,24 @@ def patch(
         column_data_list: A list describing desired column alterations.
         table_oid: Identity of the table whose columns we'll modify.
         database_id: The Django id of the database containing the table.
+        run_async: Whether to alter the columns in a background job,
+            e.g., when changing the type of columns in a big table.
 
     Returns:
-        The number of columns altered.
+        The number of columns altered. If `run_async` is set, the Django
+        id of the submitted job is returned instead.
     """
     user = kwargs.get(REQUEST_KEY).user
+    params = dict(column_data_list=column_data_list, table_oid=table_oid)
+    if run_async:
+        return submit_job(user, database_id, "columns.patch", params).id
     with connect(database_id, user) as conn:
-        return alter_columns_in_table(table_oid, column_data_list, conn)
+        return _patch(conn, **params)
+
+
+@register_job("columns.patch")
+def _patch(conn, *, column_data_list, table_oid):
+    return alter_columns_in_table(table_oid, column_data_list, conn)
 
 
 @rpc_method(name="columns.delete")
@@ -313,3 +380,46 @@ def list_with_metadata(*, table_oid: int, database_id: int, **kwargs) -> list:
         c.attnum: ColumnMetaDataBlob.from_model(c) for c in column_metadata
     }
     return [col | {"metadata": metadata_map.get(col["id"])} for col in column_info]
+
+
+@rpc_method(name="columns.get_profile")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def get_profile(
+        *,
+        table_oid: int,
+        database_id: int,
+        column_attnums: list[int] = None,
+        sample_size: int = 10000,
+        analyze: bool = False,
+        **kwargs
+) -> list[ColumnProfile]:
+    """
+    Get summary statistics for columns of a table, without scanning it.
+
+    Statistics come from the Postgres planner statistics (`pg_stats`)
+    where possible. For columns whose statistics are missing or stale,
+    a sample of at most `sample_size` rows is read instead.
+
+    Args:
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        column_attnums: The attnums of the columns to profile. All
+            columns by default.
+        sample_size: The maximum number of rows to read when sampling.
+            Clamped to between 1 and 100000.
+        analyze: Whether to first `ANALYZE` the table if its statistics
+            are missing or stale. This needs the user to own the table;
+            otherwise, it's skipped.
+
+    Returns:
+        A profile for each column the user can read.
+    """
+    sample_size = max(1, min(sample_size, MAX_PROFILE_SAMPLE_SIZE))
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        profiles = get_column_profiles(
+            table_oid, conn, column_attnums=column_attnums,
+            sample_size=sample_size, analyze=analyze,
+        )
+    return [ColumnProfile.from_dict(profile) for profile in profiles]
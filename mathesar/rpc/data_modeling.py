@@ -1,8 +1,9 @@
 """
 Classes and functions exposed to the RPC endpoint for managing data models.
 """
-from typing import TypedDict
+from typing import Optional, TypedDict
 
+from django.conf import settings
 from modernrpc.core import rpc_method, REQUEST_KEY
 from modernrpc.auth.basic import http_basic_auth_login_required
 
@@ -10,6 +11,7 @@ from db.links.operations import create as links_create
 from db.tables.operations import infer_types, split, move_columns as move_cols
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
 from mathesar.rpc.utils import connect
+from mathesar.utils.jobs import register_job, submit_job
 
 
 @rpc_method(name="data_modeling.add_foreign_key_column")
@@ -83,27 +85,102 @@ def add_mapping_table(
         )
 
 
+class TypeSuggestion(TypedDict):
+    """
+    A suggested type for a column, along with how sure we are about it.
+
+    Attributes:
+        type: The canonical string referring to the suggested type.
+        confidence: 1 if the type is known to work for every row of the
+            column. Otherwise, the estimated fraction of the table's rows
+            which were sampled to infer the type, or null if the size of
+            the table isn't known (e.g., it hasn't been analyzed yet).
+        confirmed: Whether the type was checked against every row.
+    """
+    type: str
+    confidence: Optional[float]
+    confirmed: bool
+
+
 @rpc_method(name="data_modeling.suggest_types")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
-def suggest_types(*, table_oid: int, database_id: int, **kwargs) -> dict:
+def suggest_types(
+        *,
+        table_oid: int,
+        database_id: int,
+        strict: bool = False,
+        sample_size: int = None,
+        confirm: bool = True,
+        return_confidence: bool = False,
+        run_async: bool = False,
+        **kwargs
+) -> dict:
     """
     Infer the best type for each column in the table.
 
     Currently we only suggest different types for columns which originate
     as type `text`.
 
+    By default, types are inferred from a sample of the table's rows read
+    in a single pass, and then confirmed against the whole table. Setting
+    `confirm` to false skips the confirmation, which is faster for large
+    tables, but may suggest a type that some unsampled rows can't be cast
+    to. Setting `strict` instead tests each candidate type against the
+    whole table, one at a time.
+
     Args:
         table_oid: The OID of the table whose columns we're inferring types for.
         database_id: The Django id of the database containing the table.
+        strict: Whether to infer types by scanning the whole table.
+        sample_size: The maximum number of rows to sample. Defaults to
+            the `MATHESAR_TYPE_INFERENCE_SAMPLE_SIZE` setting.
+        confirm: Whether to check types inferred from the sample against
+            the whole table. Ignored when `strict` is set.
+        return_confidence: Whether to return a TypeSuggestion for each
+            column, rather than only the type.
+        run_async: Whether to run the inference as a background job.
 
     The response JSON will have attnum keys, and values will be the
     result of `format_type` for the inferred type of each column, i.e., the
-    canonical string referring to the type.
+    canonical string referring to the type. If `return_confidence` is
+    set, the values are TypeSuggestion objects instead. If `run_async` is
+    set, the Django id of the submitted job is returned instead, and the
+    suggestions become the result of the job.
     """
     user = kwargs.get(REQUEST_KEY).user
+    params = dict(
+        table_oid=table_oid,
+        strict=strict,
+        sample_size=sample_size,
+        confirm=confirm,
+        return_confidence=return_confidence,
+    )
+    if run_async:
+        return submit_job(user, database_id, "data_modeling.suggest_types", params).id
     with connect(database_id, user) as conn:
-        return infer_types.infer_table_column_data_types(conn, table_oid)
+        return _suggest_types(conn, **params)
+
+
+@register_job("data_modeling.suggest_types")
+def _suggest_types(conn, *, table_oid, strict, sample_size, confirm, return_confidence):
+    if strict:
+        suggestions = {
+            attnum: TypeSuggestion(type=typ, confidence=1, confirmed=True)
+            for attnum, typ in (
+                infer_types.infer_table_column_data_types(conn, table_oid) or {}
+            ).items()
+        }
+    else:
+        suggestions = infer_types.infer_table_column_data_types_sampled(
+            conn,
+            table_oid,
+            sample_size or settings.MATHESAR_TYPE_INFERENCE_SAMPLE_SIZE,
+            confirm,
+        )
+    if return_confidence:
+        return suggestions
+    return {attnum: info["type"] for attnum, info in suggestions.items()}
 
 
 class SplitTableInfo(TypedDict):
@@ -129,6 +206,7 @@ def split_table(
     extracted_table_name: str,
     database_id: int,
     relationship_fk_column_name: str = None,
+    run_async: bool = False,
     **kwargs
 ) -> SplitTableInfo:
     """
@@ -140,19 +218,36 @@ def split_table(
         extracted_table_name: The name of the new table to be made from the extracted columns.
         database_id: The Django id of the database containing the table.
         relationship_fk_column_name: The name to give the new foreign key column in the remainder table (optional)
+        run_async: Whether to split the table in a background job.
 
     Returns:
         The SplitTableInfo object describing the details for the created table as a result of column extraction.
+        If `run_async` is set, the Django id of the submitted job is returned instead.
     """
     user = kwargs.get(REQUEST_KEY).user
+    params = dict(
+        table_oid=table_oid,
+        column_attnums=column_attnums,
+        extracted_table_name=extracted_table_name,
+        relationship_fk_column_name=relationship_fk_column_name,
+    )
+    if run_async:
+        return submit_job(user, database_id, "data_modeling.split_table", params).id
     with connect(database_id, user) as conn:
-        return split.split_table(
-            conn,
-            table_oid,
-            column_attnums,
-            extracted_table_name,
-            relationship_fk_column_name
-        )
+        return _split_table(conn, **params)
+
+
+@register_job("data_modeling.split_table")
+def _split_table(
+    conn, *, table_oid, column_attnums, extracted_table_name, relationship_fk_column_name
+):
+    return split.split_table(
+        conn,
+        table_oid,
+        column_attnums,
+        extracted_table_name,
+        relationship_fk_column_name
+    )
 
 
 @rpc_method(name="data_modeling.move_columns")
@@ -164,6 +259,7 @@ def move_columns(
     target_table_oid: int,
     move_column_attnums: list[int],
     database_id: int,
+    run_async: bool = False,
     **kwargs
 ) -> None:
     """
@@ -174,12 +270,28 @@ def move_columns(
         target_table_oid: The OID of the target table where the extracted column(s) will be added.
         move_column_attnums: The list of attnum(s) to move from source table to the target table.
         database_id: The Django id of the database containing the table.
+        run_async: Whether to move the columns in a background job.
+
+    Returns:
+        If `run_async` is set, the Django id of the submitted job.
     """
     user = kwargs.get(REQUEST_KEY).user
+    params = dict(
+        source_table_oid=source_table_oid,
+        target_table_oid=target_table_oid,
+        move_column_attnums=move_column_attnums,
+    )
+    if run_async:
+        return submit_job(user, database_id, "data_modeling.move_columns", params).id
     with connect(database_id, user) as conn:
-        move_cols.move_columns_to_referenced_table(
-            conn,
-            source_table_oid,
-            target_table_oid,
-            move_column_attnums
-        )
+        _move_columns(conn, **params)
+
+
+@register_job("data_modeling.move_columns")
+def _move_columns(conn, *, source_table_oid, target_table_oid, move_column_attnums):
+    move_cols.move_columns_to_referenced_table(
+        conn,
+        source_table_oid,
+        target_table_oid,
+        move_column_attnums
+    )
@@ -542,6 +542,8 @@ mathesar_error_map = frozendict({
     "UnsupportedConstraintAPIException": -28033,
     "UnsupportedInstallationDatabase": -28034,
     "ValueAPIException": -28035,
+    "StatementTimeout": -28036,
+    "JobWorkerLost": -28037,
 })
 
 dblib_error_map = frozendict({
@@ -1,21 +1,44 @@
 """Custom Exceptions to improve debugging in RPC endpoint"""
 from functools import wraps
+import time
 
+from modernrpc.core import REQUEST_KEY
 from modernrpc.exceptions import RPCException
 
 from mathesar.rpc.exceptions import error_codes
+from mathesar.rpc.utils import get_statement_timeout_family, statement_timeout_context
+from mathesar.utils import metrics
 
 
 def handle_rpc_exceptions(f):
-    """Wrap a function to process any Exception raised."""
+    """
+    Wrap a function to process any Exception raised.
+
+    Connections made during the call also get the statement timeout
+    policy for the RPC method (see `mathesar.rpc.utils.connect`), and the
+    duration of the call is recorded when metrics are enabled.
+    """
     f.rpc_exceptions_handled = True
 
     @wraps(f)
     def safe_func(*args, **kwargs):
+        method_name = getattr(safe_func, 'modernrpc_name', None)
+        failed = False
+        start = time.perf_counter()
         try:
-            return f(*args, **kwargs)
+            if method_name is None:
+                return f(*args, **kwargs)
+            with statement_timeout_context(
+                get_statement_timeout_family(method_name), kwargs.get(REQUEST_KEY)
+            ):
+                return f(*args, **kwargs)
         except Exception as e:
+            failed = True
             _raise_generic_error(e)
+        finally:
+            metrics.observe_rpc_call(
+                method_name or f.__name__, time.perf_counter() - start, failed
+            )
     return safe_func
 
 
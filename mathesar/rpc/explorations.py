@@ -1,7 +1,8 @@
 """
 Classes and functions exposed to the RPC endpoint for managing explorations.
 """
-from typing import Optional, TypedDict
+import time
+from typing import Literal, Optional, TypedDict
 
 from modernrpc.core import rpc_method, REQUEST_KEY
 from modernrpc.auth.basic import http_basic_auth_login_required
@@ -16,8 +17,10 @@ from mathesar.utils.explorations import (
     run_exploration,
     run_saved_exploration,
     replace_exploration,
-    create_exploration
+    create_exploration,
+    get_exploration_page_query,
 )
+from mathesar.utils.slow_calls import log_if_cancelled_while_slow, log_if_slow
 
 
 class ExplorationInfo(TypedDict):
@@ -95,7 +98,8 @@ class ExplorationResult(TypedDict):
 
     Attributes:
         query: A dict describing the exploration that ran.
-        records: A dict describing the total count of records along with the contents of those records.
+        records: A dict describing the total count of records (per the
+            `count_mode`) along with the contents of those records.
         output_columns: A tuple describing the names of the columns included in the exploration.
         column_metadata: A dict describing the metadata applied to included columns.
         limit: Specifies the max number of rows returned.(default 100)
@@ -183,28 +187,70 @@ def delete(*, exploration_id: int, **kwargs) -> None:
 @rpc_method(name="explorations.run")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
-def run(*, exploration_def: ExplorationDef, limit: int = 100, offset: int = 0, **kwargs) -> ExplorationResult:
+def run(
+        *,
+        exploration_def: ExplorationDef,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: Literal["exact", "estimated", "exact_if_cheap", "none"] = "exact",
+        **kwargs
+) -> ExplorationResult:
     """
     Run an exploration.
 
+    The page of records and the exact count are found in one query. The
+    `count_mode` works as in `records.list`:
+
+    - `exact`: Count all resulting rows.
+    - `estimated`: Use the planner's estimate.
+    - `exact_if_cheap`: Count exactly if the estimate is small, otherwise
+      estimate.
+    - `none`: Don't count; the returned count will be null.
+
     Args:
         exploration_def: A dict describing an exploration to run.
         limit: The max number of rows to return.(default 100)
         offset: The number of rows to skip.(default 0)
+        count_mode: How to find the total row count.(default exact)
 
     Returns:
         The result of the exploration run.
     """
     user = kwargs.get(REQUEST_KEY).user
+    start = time.perf_counter()
     with connect(exploration_def['database_id'], user) as conn:
-        exploration_result = run_exploration(exploration_def, conn, limit, offset)
+        slow_call = dict(
+            start=start,
+            method="explorations.run",
+            database_id=exploration_def['database_id'],
+            user=user,
+            params=dict(
+                exploration_def=exploration_def,
+                limit=limit,
+                offset=offset,
+                count_mode=count_mode,
+            ),
+            sql=lambda: get_exploration_page_query(exploration_def, conn, limit, offset),
+        )
+        with log_if_cancelled_while_slow(conn, **slow_call):
+            exploration_result = run_exploration(
+                exploration_def, conn, limit, offset, count_mode
+            )
+        log_if_slow(conn, **slow_call)
     return ExplorationResult.from_dict(exploration_result)
 
 
 @rpc_method(name='explorations.run_saved')
 @http_basic_auth_login_required
 @handle_rpc_exceptions
-def run_saved(*, exploration_id: int, limit: int = 100, offset: int = 0, **kwargs) -> ExplorationResult:
+def run_saved(
+        *,
+        exploration_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        count_mode: Literal["exact", "estimated", "exact_if_cheap", "none"] = "exact",
+        **kwargs
+) -> ExplorationResult:
     """
     Run a saved exploration.
 
@@ -212,6 +258,8 @@ def run_saved(*, exploration_id: int, limit: int = 100, offset: int = 0, **kwarg
         exploration_id: The Django id of the exploration to run.
         limit: The max number of rows to return.(default 100)
         offset: The number of rows to skip.(default 0)
+        count_mode: How to find the total row count, as in
+            `explorations.run`.(default exact)
 
     Returns:
         The result of the exploration run.
@@ -219,7 +267,9 @@ def run_saved(*, exploration_id: int, limit: int = 100, offset: int = 0, **kwarg
     user = kwargs.get(REQUEST_KEY).user
     exp_model = Explorations.objects.get(id=exploration_id)
     with connect(exp_model.database.id, user) as conn:
-        exploration_result = run_saved_exploration(exp_model, limit, offset, conn)
+        exploration_result = run_saved_exploration(
+            exp_model, limit, offset, conn, count_mode
+        )
     return ExplorationResult.from_dict(exploration_result)
 
 
@@ -0,0 +1,166 @@
+"""
+Classes and functions exposed to the RPC endpoint for managing background jobs.
+"""
+from typing import Literal, Optional, TypedDict
+
+from modernrpc.core import rpc_method, REQUEST_KEY
+from modernrpc.auth.basic import http_basic_auth_login_required
+
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.utils.jobs import (
+    cancel_job, get_job, get_job_progress, has_live_worker, is_job_stale, list_jobs,
+    submit_job
+)
+
+
+class JobProgress(TypedDict):
+    """
+    Progress of the data load run by a job.
+
+    Attributes:
+        bytes_processed: The number of bytes read so far.
+        bytes_total: The size of the data being loaded, if known.
+        tuples_processed: The number of rows loaded so far.
+    """
+    bytes_processed: int
+    bytes_total: Optional[int]
+    tuples_processed: int
+
+
+class JobInfo(TypedDict):
+    """
+    Information about a background job.
+
+    Attributes:
+        id: The Django id of the job.
+        database_id: The Django id of the database the job runs on.
+        method: The name of the RPC method run by the job.
+        params: The arguments of the RPC method.
+        status: The status of the job.
+        result: The result of the RPC method, once the job has succeeded.
+        error: The `code` and `message` of the error, if the job failed.
+        progress: The progress of the job, if it's running and loading data.
+        stale: Whether the job is pending, but no job worker has recorded a
+            heartbeat recently, so it won't run until one is started.
+        created_at: When the job was submitted, as an ISO 8601 string.
+        started_at: When the job started running, as an ISO 8601 string.
+        finished_at: When the job finished, as an ISO 8601 string.
+    """
+    id: int
+    database_id: int
+    method: str
+    params: dict
+    status: Literal['pending', 'running', 'succeeded', 'failed', 'cancelled']
+    result: Optional[object]
+    error: Optional[dict]
+    progress: Optional[JobProgress]
+    stale: bool
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+
+    @classmethod
+    def from_model(cls, model, progress=None, stale=False):
+        return cls(
+            id=model.id,
+            database_id=model.database_id,
+            method=model.method,
+            params=model.params,
+            status=model.status,
+            result=model.result,
+            error=model.error,
+            progress=progress,
+            stale=stale,
+            created_at=model.created_at.isoformat(),
+            started_at=model.started_at and model.started_at.isoformat(),
+            finished_at=model.finished_at and model.finished_at.isoformat(),
+        )
+
+
+@rpc_method(name="jobs.submit")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def submit(*, method: str, params: dict, database_id: int, **kwargs) -> JobInfo:
+    """
+    Run an RPC method call as a background job.
+
+    Only some long-running methods can be run as jobs: `tables.import`,
+    `tables.search_indexes.add`, `columns.patch`,
+    `data_modeling.suggest_types`, `data_modeling.split_table`, and
+    `data_modeling.move_columns`. Those methods also accept `run_async`
+    to submit a job directly.
+
+    Args:
+        method: The name of the RPC method to run.
+        params: The arguments of the RPC method, except `database_id`.
+        database_id: The Django id of the database to run the method on.
+
+    Returns:
+        The details of the new (pending) job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    job = submit_job(user, database_id, method, params)
+    return JobInfo.from_model(job)
+
+
+@rpc_method(name="jobs.get")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def get(*, job_id: int, **kwargs) -> JobInfo:
+    """
+    Get information about a job, including its progress if running.
+
+    A pending job is reported as `stale` if no job worker is running.
+
+    Args:
+        job_id: The Django id of the job.
+
+    Returns:
+        The details of the job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    job = get_job(job_id, user)
+    return JobInfo.from_model(job, get_job_progress(job), is_job_stale(job))
+
+
+@rpc_method(name="jobs.list")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def list_(*, database_id: int = None, status: str = None, **kwargs) -> list[JobInfo]:
+    """
+    List the jobs submitted by the current user, newest first. Exposed as `list`.
+
+    Progress isn't reported by this method; use `jobs.get` for that.
+
+    Args:
+        database_id: Only list jobs on the database with this Django id.
+        status: Only list jobs with this status.
+
+    Returns:
+        A list of job details.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    jobs = list(list_jobs(user, database_id=database_id, status=status))
+    live_worker = has_live_worker() if any(job.status == 'pending' for job in jobs) else True
+    return [
+        JobInfo.from_model(job, stale=is_job_stale(job, live_worker))
+        for job in jobs
+    ]
+
+
+@rpc_method(name="jobs.cancel")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def cancel(*, job_id: int, **kwargs) -> None:
+    """
+    Cancel a pending or running job.
+
+    A running job is cancelled by cancelling the query it's running, so
+    it may take a moment before its status changes to `cancelled`. Any
+    changes made by the job are rolled back.
+
+    Args:
+        job_id: The Django id of the job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    cancel_job(get_job(job_id, user))
@@ -1,6 +1,10 @@
 """
 Classes and functions exposed to the RPC endpoint for managing table records.
 """
+import base64
+import hashlib
+import json
+import time
 from typing import Any, Literal, Optional, TypedDict, Union
 
 from modernrpc.core import rpc_method, REQUEST_KEY
@@ -11,7 +15,11 @@ from db.records.operations import insert as record_insert
 from db.records.operations import select as record_select
 from db.records.operations import update as record_update
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
-from mathesar.rpc.utils import connect
+from mathesar.rpc.utils import connect, on_commit
+from mathesar.utils.slow_calls import log_if_cancelled_while_slow, log_if_slow
+from mathesar.utils.record_counts import (
+    get_cached_count, get_count_key, invalidate_cached_counts, set_cached_count
+)
 
 
 class OrderBy(TypedDict):
@@ -101,7 +109,8 @@ class Group(TypedDict):
     in the group (e.g., the whole table), but we only return a few.
 
     Attributes:
-        id: The id of the group. Consistent for same input.
+        id: The id of the group. Groups are numbered from 1 in order of
+            their values, among the groups present in the returned page.
         count: The number of items in the group.
         results_eq: The value the results of the group equal.
         result_indices: The 0-indexed positions of group members in the
@@ -137,12 +146,16 @@ class RecordList(TypedDict):
     given row, for the given column.
 
     Attributes:
-        count: The total number of records in the table.
+        count: The total number of records in the table. This may be
+            an estimate, or null, depending on the requested count mode.
         results: An array of record objects.
         grouping: Information for displaying grouped records.
         linked_record_smmaries: Information for previewing foreign key
             values, provides a map of foreign key to a text summary.
         record_summaries: Information for previewing returned records.
+        next_cursor: An opaque cursor for getting the following page when
+            paginating by cursor. Null if there are no more records, or
+            when paginating by offset.
     """
     count: int
     results: list[dict]
@@ -150,6 +163,7 @@ class RecordList(TypedDict):
     linked_record_summaries: dict[str, dict[str, str]]
     record_summaries: dict[str, str]
     query: str
+    next_cursor: Optional[str]
 
     @classmethod
     def from_dict(cls, d):
@@ -160,6 +174,7 @@ class RecordList(TypedDict):
             linked_record_summaries=d.get("linked_record_summaries"),
             record_summaries=d.get("record_summaries"),
             query=d["query"],
+            next_cursor=d.get("next_cursor"),
         )
 
 
@@ -191,6 +206,50 @@ class RecordAdded(TypedDict):
         )
 
 
+class RecordError(TypedDict):
+    """
+    An error encountered while writing one record of a batch.
+
+    Attributes:
+        index: The index of the failed record definition in the batch.
+        message: The error message.
+        sql_state: The SQLSTATE code of the error.
+    """
+    index: int
+    message: str
+    sql_state: str
+
+
+class RecordsWritten(TypedDict):
+    """
+    Records written (added or modified) in a batch, along with some meta data
+
+    Attributes:
+        count: The number of records written.
+        results: An array of the written record objects, ordered by
+            primary key. Null if the records weren't requested.
+        linked_record_summaries: Information for previewing foreign key
+            values, provides a map of foreign key to a text summary.
+        record_summaries: Information for previewing written records.
+        errors: Errors for record definitions that couldn't be written.
+    """
+    count: int
+    results: Optional[list[dict]]
+    linked_record_summaries: dict[str, dict[str, str]]
+    record_summaries: dict[str, str]
+    errors: list[RecordError]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            count=d["count"],
+            results=d.get("results"),
+            linked_record_summaries=d.get("linked_record_summaries"),
+            record_summaries=d.get("record_summaries"),
+            errors=[RecordError(**e) for e in d.get("errors", [])],
+        )
+
+
 @rpc_method(name="records.list")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -204,11 +263,31 @@ def list_(
         filter: Filter = None,
         grouping: Grouping = None,
         return_record_summaries: bool = False,
+        count_mode: Literal["exact", "estimated", "exact_if_cheap", "none"] = "exact",
+        paginate_by_cursor: bool = False,
+        cursor: str = None,
         **kwargs
 ) -> RecordList:
     """
     List records from a table, and its row count. Exposed as `list`.
 
+    Records can be paged through either by `offset`, or by cursor. To
+    paginate by cursor, set `paginate_by_cursor` to get the first page,
+    then pass the `next_cursor` of each response as the `cursor` of the
+    following request, along with the same `order` and `filter`. Unlike
+    offsets, cursors seek directly to the following rows, so deep pages
+    are as fast as the first one.
+
+    The `count_mode` determines how the row count is found:
+
+    - `exact`: Count all (filtered) rows. Exact counts are cached, so
+      paging through a table doesn't recount it for every page.
+    - `estimated`: Use the planner's estimate, which doesn't scan the
+      table. A cached exact count is used instead, if available.
+    - `exact_if_cheap`: Count exactly for small tables, otherwise
+      estimate.
+    - `none`: Don't count; the returned count will be null.
+
     Args:
         table_oid: Identity of the table in the user's database.
         database_id: The Django id of the database containing the table.
@@ -220,25 +299,109 @@ def list_(
         grouping: An array of group definition objects.
         return_record_summaries: Whether to return summaries of retrieved
             records.
+        count_mode: How to find the total row count.
+        paginate_by_cursor: Whether to return a `next_cursor`.
+        cursor: The `next_cursor` returned with the previous page.
+            Implies `paginate_by_cursor`.
 
     Returns:
         The requested records, along with some metadata.
     """
     user = kwargs.get(REQUEST_KEY).user
-    with connect(database_id, user) as conn:
-        record_info = record_select.list_records_from_table(
-            conn,
-            table_oid,
+    if cursor is not None:
+        cursor_values = _decode_cursor(cursor, order, filter)
+    elif paginate_by_cursor:
+        cursor_values = []
+    else:
+        cursor_values = None
+    cached_count = None
+    if count_mode != "none":
+        count_key = get_count_key(database_id, table_oid, user, filter)
+        cached_count = get_cached_count(count_key)
+    slow_call = dict(
+        method="records.list",
+        database_id=database_id,
+        user=user,
+        params=dict(
+            table_oid=table_oid,
             limit=limit,
             offset=offset,
             order=order,
             filter=filter,
-            group=grouping,
-            return_record_summaries=return_record_summaries,
+            grouping=grouping,
+            count_mode=count_mode,
+            cursor=cursor,
+        ),
+    )
+    start = time.perf_counter()
+    with connect(database_id, user) as conn:
+        with log_if_cancelled_while_slow(
+            conn,
+            start=start,
+            sql=lambda: (
+                record_select.get_list_records_query(
+                    conn,
+                    table_oid,
+                    limit=limit,
+                    offset=offset,
+                    order=order,
+                    filter=filter,
+                    cursor=cursor_values,
+                ),
+                None,
+            ),
+            **slow_call,
+        ):
+            record_info = record_select.list_records_from_table(
+                conn,
+                table_oid,
+                limit=limit,
+                offset=offset,
+                order=order,
+                filter=filter,
+                group=grouping,
+                return_record_summaries=return_record_summaries,
+                count_mode="none" if cached_count is not None else count_mode,
+                cursor=cursor_values,
+            )
+        log_if_slow(conn, start=start, sql=record_info["query"], **slow_call)
+    if record_info.get("next_cursor") is not None:
+        record_info["next_cursor"] = _encode_cursor(
+            record_info["next_cursor"], order, filter
         )
+    if cached_count is not None:
+        record_info["count"] = cached_count
+    elif count_mode == "exact" and record_info["results"]:
+        # An empty page (e.g., past the end) always reports a zero count.
+        set_cached_count(count_key, record_info["count"])
     return RecordList.from_dict(record_info)
 
 
+def _get_cursor_query_hash(order, filter):
+    return hashlib.sha256(
+        json.dumps([order, filter], sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+
+def _encode_cursor(values, order, filter):
+    """Make an opaque cursor from the total ordering values of a row."""
+    cursor_info = {"q": _get_cursor_query_hash(order, filter), "v": values}
+    return base64.urlsafe_b64encode(json.dumps(cursor_info).encode()).decode()
+
+
+def _decode_cursor(cursor, order, filter):
+    """Get the total ordering values of a row from a cursor."""
+    try:
+        cursor_info = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = cursor_info["v"]
+        query_hash = cursor_info["q"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("The cursor is invalid.")
+    if query_hash != _get_cursor_query_hash(order, filter) or not isinstance(values, list):
+        raise ValueError("The cursor doesn't match the requested order and filter.")
+    return values
+
+
 @rpc_method(name="records.get")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -313,9 +476,61 @@ def add(
             table_oid,
             return_record_summaries=return_record_summaries,
         )
+    on_commit(database_id, user, lambda: invalidate_cached_counts(database_id, table_oid))
     return RecordAdded.from_dict(record_info)
 
 
+@rpc_method(name="records.add_many")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def add_many(
+        *,
+        record_defs: list[dict],
+        table_oid: int,
+        database_id: int,
+        return_records: bool = True,
+        return_record_summaries: bool = False,
+        continue_on_error: bool = False,
+        **kwargs
+) -> RecordsWritten:
+    """
+    Add a batch of records to a table in a single transaction.
+
+    Each of the `record_defs` has the same form as the `record_def` of
+    `records.add`. Records defining the same columns are added with a
+    single statement.
+
+    By default, the first error aborts the whole batch, and no records
+    are added. If `continue_on_error` is set, the records that can be
+    added are, and an error is returned for each of the others.
+
+    Args:
+        record_defs: An array of objects representing the records to add.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        return_records: Whether to return the added records.
+        return_record_summaries: Whether to return summaries of the added
+            records.
+        continue_on_error: Whether to add the valid records when some
+            record definitions fail.
+
+    Returns:
+        The number of added records, the records, and any errors.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        record_info = record_insert.add_records_to_table(
+            conn,
+            record_defs,
+            table_oid,
+            return_records=return_records,
+            return_record_summaries=return_record_summaries,
+            continue_on_error=continue_on_error,
+        )
+    on_commit(database_id, user, lambda: invalidate_cached_counts(database_id, table_oid))
+    return RecordsWritten.from_dict(record_info)
+
+
 @rpc_method(name="records.patch")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -357,9 +572,63 @@ def patch(
             table_oid,
             return_record_summaries=return_record_summaries,
         )
+    on_commit(database_id, user, lambda: invalidate_cached_counts(database_id, table_oid))
     return RecordAdded.from_dict(record_info)
 
 
+@rpc_method(name="records.patch_many")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def patch_many(
+        *,
+        record_defs: list[dict],
+        table_oid: int,
+        database_id: int,
+        return_records: bool = True,
+        return_record_summaries: bool = False,
+        continue_on_error: bool = False,
+        **kwargs
+) -> RecordsWritten:
+    """
+    Modify a batch of records in a table in a single transaction.
+
+    Each of the `record_defs` has the same form as the `record_def` of
+    `records.patch`, but must also include the primary key value of the
+    record to modify (keyed by the attnum of the primary key column). A
+    record may only be modified once per batch. Records defining the same
+    columns are modified with a single statement.
+
+    By default, the first error aborts the whole batch, and no records
+    are modified. If `continue_on_error` is set, the records that can be
+    modified are, and an error is returned for each of the others.
+
+    Args:
+        record_defs: An array of objects representing the modifications.
+        table_oid: Identity of the table in the user's database.
+        database_id: The Django id of the database containing the table.
+        return_records: Whether to return the modified records.
+        return_record_summaries: Whether to return summaries of the
+            modified records.
+        continue_on_error: Whether to modify the valid records when some
+            record definitions fail.
+
+    Returns:
+        The number of modified records, the records, and any errors.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        record_info = record_update.patch_records_in_table(
+            conn,
+            record_defs,
+            table_oid,
+            return_records=return_records,
+            return_record_summaries=return_record_summaries,
+            continue_on_error=continue_on_error,
+        )
+    on_commit(database_id, user, lambda: invalidate_cached_counts(database_id, table_oid))
+    return RecordsWritten.from_dict(record_info)
+
+
 @rpc_method(name="records.delete")
 @http_basic_auth_login_required
 @handle_rpc_exceptions
@@ -388,6 +657,7 @@ def delete(
             record_ids,
             table_oid,
         )
+    on_commit(database_id, user, lambda: invalidate_cached_counts(database_id, table_oid))
     return num_deleted
 
 
@@ -401,6 +671,7 @@ def search(
         search_params: list[SearchParam] = [],
         limit: int = 10,
         return_record_summaries: bool = False,
+        fuzzy: bool = False,
         **kwargs
 ) -> RecordList:
     """
@@ -413,23 +684,56 @@ def search(
     Records are assigned a score based on how many matches, and of what
     quality, they have with the passed search parameters.
 
+    Searches of string columns can be sped up with trigram indexes; see
+    `tables.search_indexes`.
+
     Args:
         table_oid: Identity of the table in the user's database.
         database_id: The Django id of the database containing the table.
         search_params: Results are ranked and filtered according to the
                        objects passed here.
         limit: The maximum number of rows we'll return.
+        return_record_summaries: Whether to return summaries of retrieved
+            records.
+        fuzzy: Whether strings similar to a searched literal also match.
+            Such matches rank below substring matches. Requires the
+            pg_trgm extension.
 
     Returns:
         The requested records, along with some metadata.
     """
     user = kwargs.get(REQUEST_KEY).user
+    slow_call = dict(
+        method="records.search",
+        database_id=database_id,
+        user=user,
+        params=dict(
+            table_oid=table_oid,
+            search_params=search_params,
+            limit=limit,
+            fuzzy=fuzzy,
+        ),
+    )
+    start = time.perf_counter()
     with connect(database_id, user) as conn:
-        record_info = record_select.search_records_from_table(
+        with log_if_cancelled_while_slow(
             conn,
-            table_oid,
-            search=search_params,
-            limit=limit,
-            return_record_summaries=return_record_summaries,
-        )
+            start=start,
+            sql=lambda: (
+                record_select.get_search_records_query(
+                    conn, table_oid, search=search_params, limit=limit, fuzzy=fuzzy
+                ),
+                None,
+            ),
+            **slow_call,
+        ):
+            record_info = record_select.search_records_from_table(
+                conn,
+                table_oid,
+                search=search_params,
+                limit=limit,
+                return_record_summaries=return_record_summaries,
+                fuzzy=fuzzy,
+            )
+        log_if_slow(conn, start=start, sql=record_info["query"], **slow_call)
     return RecordList.from_dict(record_info)
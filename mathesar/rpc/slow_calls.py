@@ -0,0 +1,84 @@
+"""
+Classes and functions exposed to the RPC endpoint for inspecting slow calls.
+"""
+from typing import Optional, TypedDict
+
+from modernrpc.core import rpc_method
+from modernrpc.auth.basic import http_basic_auth_superuser_required
+
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.utils.slow_calls import list_slow_calls
+
+
+class SlowCallInfo(TypedDict):
+    """
+    Information about a slow RPC method call.
+
+    Attributes:
+        id: The Django id of the slow call.
+        method: The name of the RPC method called.
+        database_id: The Django id of the database the call was made on.
+        username: The username of the user who made the call.
+        duration: The duration of the call, in seconds.
+        params: The params of the call, with literal values redacted.
+        sql: The main SQL query of the call, with string constants
+            redacted.
+        plan: The query plan, from `EXPLAIN (FORMAT JSON)`, with string
+            constants redacted.
+        created_at: When the call was logged, as an ISO 8601 string.
+    """
+    id: int
+    method: str
+    database_id: int
+    username: Optional[str]
+    duration: float
+    params: dict
+    sql: Optional[str]
+    plan: Optional[list]
+    created_at: str
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(
+            id=model.id,
+            method=model.method,
+            database_id=model.database_id,
+            username=model.user and model.user.username,
+            duration=model.duration,
+            params=model.params,
+            sql=model.sql,
+            plan=model.plan,
+            created_at=model.created_at.isoformat(),
+        )
+
+
+@rpc_method(name="slow_calls.list")
+@http_basic_auth_superuser_required
+@handle_rpc_exceptions
+def list_(
+        *,
+        database_id: int = None,
+        method: str = None,
+        limit: int = 100,
+        **kwargs
+) -> list[SlowCallInfo]:
+    """
+    List logged slow calls, newest first. Exposed as `list`.
+
+    Calls to `records.list`, `records.search` and `explorations.run` are
+    logged when they take longer than `MATHESAR_SLOW_CALL_THRESHOLD`,
+    including calls whose query was cancelled (e.g., by the statement
+    timeout).
+
+    Args:
+        database_id: Only list calls made on the database with this Django id.
+        method: Only list calls to this RPC method.
+        limit: The maximum number of calls to list.
+
+    Returns:
+        A list of slow call details.
+    """
+    return [
+        SlowCallInfo.from_model(slow_call)
+        for slow_call in list_slow_calls(database_id, method, limit)
+    ]
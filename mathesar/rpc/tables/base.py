@@ -16,6 +16,7 @@ from mathesar.rpc.constraints import CreatableConstraintInfo
 from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
 from mathesar.rpc.tables.metadata import TableMetaDataBlob
 from mathesar.rpc.utils import connect
+from mathesar.utils.jobs import register_job, submit_job
 from mathesar.utils.tables import list_tables_meta_data, get_table_meta_data
 
 
@@ -283,6 +284,7 @@ def import_(
     database_id: int,
     table_name: str = None,
     comment: str = None,
+    run_async: bool = False,
     **kwargs
 ) -> AddedTableInfo:
     """
@@ -294,13 +296,28 @@ def import_(
         database_id: The Django id of the database containing the table.
         table_name: Name of the table to be imported.
         comment: The comment for the new table.
+        run_async: Whether to import the table in a background job.
 
     Returns:
-        The `oid` and `name` of the created table.
+        The `oid` and `name` of the created table. If `run_async` is set,
+        the Django id of the submitted job is returned instead.
     """
     user = kwargs.get(REQUEST_KEY).user
+    params = dict(
+        data_file_id=data_file_id,
+        schema_oid=schema_oid,
+        table_name=table_name,
+        comment=comment,
+    )
+    if run_async:
+        return submit_job(user, database_id, "tables.import", params).id
     with connect(database_id, user) as conn:
-        return import_csv(data_file_id, table_name, schema_oid, conn, comment)
+        return _import(conn, **params)
+
+
+@register_job("tables.import")
+def _import(conn, *, data_file_id, schema_oid, table_name, comment):
+    return import_csv(data_file_id, table_name, schema_oid, conn, comment)
 
 
 @rpc_method(name="tables.get_import_preview")
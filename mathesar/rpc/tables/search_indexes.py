@@ -0,0 +1,152 @@
+"""
+Classes and functions exposed to the RPC endpoint for managing the trigram
+indexes that accelerate `records.search`.
+"""
+from typing import TypedDict, Union
+
+from modernrpc.core import rpc_method, REQUEST_KEY
+from modernrpc.auth.basic import http_basic_auth_login_required
+
+from db.tables.operations import search_indexes
+from mathesar.rpc.exceptions.handlers import handle_rpc_exceptions
+from mathesar.rpc.utils import connect
+from mathesar.utils.jobs import register_job, submit_job
+
+
+class SearchIndexColumn(TypedDict):
+    """
+    Search index status of a string column.
+
+    Attributes:
+        attnum: The attnum of the column.
+        indexed: Whether the column has a trigram index.
+        index_names: The names of the column's trigram indexes.
+    """
+    attnum: int
+    indexed: bool
+    index_names: list[str]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            attnum=d["attnum"],
+            indexed=d["indexed"],
+            index_names=d["index_names"],
+        )
+
+
+class SearchIndexStatus(TypedDict):
+    """
+    Search index status of a table.
+
+    Attributes:
+        pg_trgm_installed: Whether the pg_trgm extension is installed.
+            Fuzzy search needs it.
+        columns: The status of each string column of the table.
+    """
+    pg_trgm_installed: bool
+    columns: list[SearchIndexColumn]
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            pg_trgm_installed=d["pg_trgm_installed"],
+            columns=[SearchIndexColumn.from_dict(c) for c in d["columns"]],
+        )
+
+
+@rpc_method(name="tables.search_indexes.get_status")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def get_status(*, table_oid: int, database_id: int, **kwargs) -> SearchIndexStatus:
+    """
+    Get the search index status of the string columns of a table.
+
+    Args:
+        table_oid: The OID of the table.
+        database_id: The Django id of the database containing the table.
+
+    Returns:
+        The search index status of the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        status = search_indexes.get_search_index_info(table_oid, conn)
+    return SearchIndexStatus.from_dict(status)
+
+
+@rpc_method(name="tables.search_indexes.add")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def add(
+        *,
+        table_oid: int,
+        database_id: int,
+        column_attnums: list[int] = None,
+        run_async: bool = False,
+        **kwargs
+) -> Union[SearchIndexStatus, int]:
+    """
+    Add trigram indexes to speed up searching string columns of a table.
+
+    The pg_trgm extension is installed first, if needed. Columns that
+    are already indexed are skipped.
+
+    Building an index takes a while for big tables. When run directly,
+    the indexes are built with a plain `CREATE INDEX`, which blocks
+    writes to the table until it's done, and is subject to the DDL
+    statement timeout. With `run_async`, they're built by a background
+    job with `CREATE INDEX CONCURRENTLY` instead, which doesn't block
+    writes.
+
+    Args:
+        table_oid: The OID of the table.
+        database_id: The Django id of the database containing the table.
+        column_attnums: The attnums of the columns to index. All string
+            columns by default.
+        run_async: Whether to build the indexes in a background job.
+
+    Returns:
+        The search index status of the table. If `run_async` is set, the
+        Django id of the submitted job is returned instead (see
+        `jobs.get`), and the status becomes the result of the job.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    params = dict(table_oid=table_oid, column_attnums=column_attnums)
+    if run_async:
+        return submit_job(user, database_id, "tables.search_indexes.add", params).id
+    with connect(database_id, user) as conn:
+        status = search_indexes.add_search_indexes(table_oid, conn, column_attnums)
+    return SearchIndexStatus.from_dict(status)
+
+
+@register_job("tables.search_indexes.add")
+def _add(conn, *, table_oid, column_attnums=None):
+    status = search_indexes.add_search_indexes_concurrently(
+        table_oid, conn, column_attnums
+    )
+    return SearchIndexStatus.from_dict(status)
+
+
+@rpc_method(name="tables.search_indexes.drop")
+@http_basic_auth_login_required
+@handle_rpc_exceptions
+def drop(
+        *, table_oid: int, database_id: int, column_attnums: list[int] = None, **kwargs
+) -> SearchIndexStatus:
+    """
+    Drop the search indexes added by `tables.search_indexes.add`.
+
+    Args:
+        table_oid: The OID of the table.
+        database_id: The Django id of the database containing the table.
+        column_attnums: The attnums of the columns whose indexes we'll
+            drop. All columns by default.
+
+    Returns:
+        The search index status of the table.
+    """
+    user = kwargs.get(REQUEST_KEY).user
+    with connect(database_id, user) as conn:
+        status = search_indexes.drop_search_indexes(table_oid, conn, column_attnums)
+    return SearchIndexStatus.from_dict(status)
@@ -1,15 +1,293 @@
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+import select
+import socket
+import threading
+import time
+
+from django.conf import settings
+import psycopg
+from psycopg import sql
+
 from mathesar.models.base import UserDatabaseRoleMap
+from mathesar.utils import metrics
+from mathesar.utils.connection_pools import pooled_connection
+
+# Methods outside the `records` namespace that read (many) records.
+RECORDS_TIMEOUT_METHODS = frozenset({
+    'columns.get_profile',
+    'data_modeling.suggest_types',
+    'explorations.run',
+    'explorations.run_saved',
+    'tables.get_import_preview',
+})
+
+# Methods not named `get*` or `list*` which only read from the database.
+READ_ONLY_METHODS = frozenset({
+    'explorations.run',
+    'explorations.run_saved',
+    'records.search',
+})
+
+_statement_timeout_context = ContextVar('statement_timeout_context', default=None)
+_shared_connection = ContextVar('shared_connection', default=None)
+
+
+class StatementTimeout(Exception):
+    pass
+
+
+def get_statement_timeout_family(method_name):
+    """
+    Return the `MATHESAR_STATEMENT_TIMEOUTS` key for an RPC method.
+
+    Record listings (and other methods reading records) are `RECORDS`,
+    methods that only read the catalog (`get*` and `list*` methods) are
+    `CATALOG`, and everything else (mostly DDL) is `DDL`.
+    """
+    namespace, _, name = method_name.rpartition('.')
+    if namespace == 'records' or method_name in RECORDS_TIMEOUT_METHODS:
+        return 'RECORDS'
+    elif name.startswith(('get', 'list')):
+        return 'CATALOG'
+    else:
+        return 'DDL'
+
+
+def is_read_only_method(method_name):
+    """Return whether an RPC method only reads from the user database."""
+    name = method_name.rpartition('.')[2]
+    return name.startswith(('get', 'list')) or method_name in READ_ONLY_METHODS
+
+
+@contextmanager
+def statement_timeout_context(family, request=None):
+    """
+    Apply a statement timeout policy to connections made within the block.
+
+    Args:
+        family: A key of the `MATHESAR_STATEMENT_TIMEOUTS` setting.
+        request: The HTTP request being served, if any. The query run by
+            a connection is cancelled if the request's client disconnects.
+    """
+    token = _statement_timeout_context.set((family, request))
+    try:
+        yield
+    finally:
+        _statement_timeout_context.reset(token)
+
+
+class SharedConnection:
+    """
+    A connection to a database, shared by the calls in an RPC batch.
+
+    The connection is only opened once a call connects to the database, and
+    its transaction lasts until the end of the `shared_connection` block.
+    Within a read-only transaction, all calls see the same snapshot.
+    """
+
+    def __init__(self, database_id, user, read_only, exit_stack):
+        self.database_id = database_id
+        self.user = user
+        self.read_only = read_only
+        self._exit_stack = exit_stack
+        self._conn = None
+        self._commit_callbacks = []
+
+    def is_for(self, database_id, user):
+        return database_id == self.database_id and user == self.user
+
+    def get_connection(self):
+        if self._conn is None:
+            conn = self._exit_stack.enter_context(
+                _open_connection(self.database_id, self.user)
+            )
+            # This also begins the transaction, so calls run in savepoints.
+            if self.read_only:
+                conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            else:
+                conn.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            self._conn = conn
+        return self._conn
 
+    def add_commit_callback(self, func):
+        """Call `func` once the transaction is committed."""
+        self._commit_callbacks.append(func)
+
+    def run_commit_callbacks(self):
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for func in callbacks:
+            func()
+
+
+@contextmanager
+def shared_connection(database_id, user, read_only=False):
+    """
+    Create a SharedConnection, committed and given back at the end of the block.
 
+    Use it for calls with `shared_connection_context`. Functions passed
+    to `on_commit` by those calls are called after committing.
+
+    Args:
+        database_id: The Django id of the Database used for connecting.
+        user: A user model instance who'll connect to the database.
+        read_only: Whether to use a read-only, repeatable read transaction.
+    """
+    with ExitStack() as exit_stack:
+        shared = SharedConnection(database_id, user, read_only, exit_stack)
+        yield shared
+    # Not reached if the block (or committing) fails, so callbacks only
+    # see committed changes.
+    shared.run_commit_callbacks()
+
+
+@contextmanager
+def shared_connection_context(shared):
+    """Make `connect` use the SharedConnection within the block."""
+    token = _shared_connection.set(shared)
+    try:
+        yield
+    finally:
+        _shared_connection.reset(token)
+
+
+def on_commit(database_id, user, func):
+    """
+    Call `func` once the changes made via `connect` are committed.
+
+    Within a `shared_connection_context` for the same database and user,
+    that's at the end of the `shared_connection` block, and `func` isn't
+    called if the shared transaction fails. Otherwise, the transaction of
+    `connect` was committed at the end of its block, so `func` is called
+    right away.
+
+    Args:
+        database_id: The Django id of the Database used for connecting.
+        user: A user model instance who connected to the database.
+        func: A function taking no arguments.
+    """
+    shared = _shared_connection.get()
+    if shared is not None and shared.is_for(database_id, user):
+        shared.add_commit_callback(func)
+    else:
+        func()
+
+
+@contextmanager
 def connect(database_id, user):
     """
     Get a psycopg database connection.
 
+    Connections are borrowed from a per-role pool unless pooling is
+    disabled via the `MATHESAR_CONNECTION_POOL` setting. Within a
+    `shared_connection_context` for the same database and user (e.g.,
+    during a batch request), the shared connection is used instead, in a
+    savepoint, so that a failing call doesn't affect the others.
+
+    Within a `statement_timeout_context` (e.g., during an RPC method
+    call), the statement timeout of the policy is set for the transaction,
+    and queries are cancelled if the client disconnects or the worker
+    process exits.
+
     Args:
         database_id: The Django id of the Database used for connecting.
         user: A user model instance who'll connect to the database.
     """
-    user_database_role = UserDatabaseRoleMap.objects.get(
-        user=user, database__id=database_id
+    shared = _shared_connection.get()
+    if shared is not None and shared.is_for(database_id, user):
+        conn = shared.get_connection()
+        with conn.transaction():
+            with _apply_statement_timeout_policy(conn):
+                yield conn
+        return
+    with _open_connection(database_id, user) as conn:
+        with _apply_statement_timeout_policy(conn):
+            yield conn
+
+
+@contextmanager
+def _open_connection(database_id, user):
+    start = time.perf_counter()
+    user_database_role = UserDatabaseRoleMap.objects.select_related(
+        'server', 'database', 'configured_role'
+    ).get(user=user, database__id=database_id)
+    if settings.MATHESAR_CONNECTION_POOL['ENABLED']:
+        conn_context = pooled_connection(user_database_role)
+    else:
+        conn_context = user_database_role.connection
+    with conn_context as conn:
+        metrics.observe_connection_acquire(time.perf_counter() - start)
+        yield conn
+
+
+@contextmanager
+def _apply_statement_timeout_policy(conn):
+    timeout_context = _statement_timeout_context.get()
+    if timeout_context is None:
+        yield
+        return
+    family, request = timeout_context
+    _set_statement_timeout(conn, settings.MATHESAR_STATEMENT_TIMEOUTS[family])
+    try:
+        with _cancel_query_on_abort(conn, request):
+            yield
+    except psycopg.errors.QueryCanceled as e:
+        if 'statement timeout' in (e.diag.message_primary or ''):
+            raise StatementTimeout(
+                f"The query took longer than the {family.lower()} timeout"
+            ) from e
+        raise
+
+
+def _set_statement_timeout(conn, timeout):
+    # A timeout of 0 disables it, as for Postgres.
+    conn.execute(
+        sql.SQL("SET LOCAL statement_timeout = {}").format(
+            sql.Literal(int(timeout * 1000))
+        )
     )
-    return user_database_role.connection
+
+
+@contextmanager
+def _cancel_query_on_abort(conn, request):
+    """Cancel the connection's query if the client or the worker goes away."""
+    client_socket = request and request.META.get('gunicorn.socket')
+    poll_interval = settings.MATHESAR_CLIENT_DISCONNECT_POLL_INTERVAL
+    watcher = None
+    stop = threading.Event()
+    if client_socket is not None and poll_interval > 0:
+        watcher = threading.Thread(
+            target=_watch_client_socket,
+            args=(client_socket, conn, stop, poll_interval),
+            daemon=True,
+        )
+        watcher.start()
+    try:
+        yield
+    except (KeyboardInterrupt, SystemExit):
+        # The worker is shutting down (e.g., gunicorn aborting a worker
+        # after its timeout), so nobody will wait for the query anymore.
+        conn.cancel()
+        raise
+    finally:
+        stop.set()
+        if watcher is not None:
+            # Don't let the watcher cancel a query on a connection that's
+            # been given back to the pool.
+            watcher.join()
+
+
+def _watch_client_socket(client_socket, conn, stop, poll_interval):
+    while not stop.wait(poll_interval):
+        if _is_disconnected(client_socket):
+            conn.cancel()
+            return
+
+
+def _is_disconnected(client_socket):
+    try:
+        readable, _, _ = select.select([client_socket], [], [], 0)
+        # A closed connection is readable, but has no data.
+        return bool(readable) and client_socket.recv(1, socket.MSG_PEEK) == b''
+    except (OSError, ValueError):
+        return True
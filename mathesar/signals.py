@@ -1,11 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from mathesar.models.base import ConfiguredRole, Database, Server
 from mathesar.models.deprecated import (
     Column, Table, _set_default_preview_template,
     _create_table_settings,
 )
 from mathesar.state.django import reflect_new_table_constraints
+from mathesar.utils.connection_pools import invalidate_pools
 
 
 @receiver(post_save, sender=Table)
@@ -27,3 +29,23 @@ def create_table_settings(**kwargs):
 def compute_preview_column_settings(**kwargs):
     instance = kwargs['instance']
     _set_default_preview_template(instance.table)
+
+
+@receiver(post_save, sender=Server)
+@receiver(post_delete, sender=Server)
+def invalidate_server_connection_pools(**kwargs):
+    # The host or port may have changed, so pooled connections are stale.
+    invalidate_pools(server_id=kwargs['instance'].id)
+
+
+@receiver(post_save, sender=Database)
+@receiver(post_delete, sender=Database)
+def invalidate_database_connection_pools(**kwargs):
+    invalidate_pools(database_id=kwargs['instance'].id)
+
+
+@receiver(post_save, sender=ConfiguredRole)
+@receiver(post_delete, sender=ConfiguredRole)
+def invalidate_role_connection_pools(**kwargs):
+    # The password may have changed, so pooled connections are stale.
+    invalidate_pools(role_id=kwargs['instance'].id)
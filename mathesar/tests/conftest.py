@@ -22,6 +22,7 @@ from db.schemas.utils import get_schema_oid_from_name
 
 import mathesar.tests.conftest
 from mathesar.imports.base import create_table_from_data_file
+from mathesar.models.base import Database, Server
 from mathesar.models.deprecated import Schema, Table, Connection, DataFile
 from mathesar.models.deprecated import Column as mathesar_model_column
 from mathesar.models.users import DatabaseRole, SchemaRole, User
@@ -144,6 +145,13 @@ def test_db_model(request, test_db_name, django_db_blocker):
     database_model.delete()
 
 
+@pytest.fixture
+def database_model(test_db_model):
+    """A Database model (with its Server) for the test database."""
+    server = Server.objects.create(host=test_db_model.host, port=test_db_model.port)
+    return Database.objects.create(name=test_db_model.db_name, server=server)
+
+
 def add_db_to_dj_settings(request):
     """
     If the Django layer should be aware of a db, it should be added to settings.DATABASES dict.
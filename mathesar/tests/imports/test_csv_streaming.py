@@ -0,0 +1,141 @@
+"""
+Tests that CSV imports stream the file, rather than reading it whole.
+
+The benchmark at the end imports a large generated CSV file and checks
+that peak memory stays under a fixed limit. It's skipped unless the
+MATHESAR_CSV_IMPORT_BENCHMARK_MB environment variable is set to the
+size of the file to generate, e.g.:
+
+    MATHESAR_CSV_IMPORT_BENCHMARK_MB=4096 pytest -n0 \
+        mathesar/tests/imports/test_csv_streaming.py
+"""
+from contextlib import contextmanager
+from io import BytesIO
+import os
+import resource
+import time
+
+import psycopg
+import pytest
+
+from db.tables.operations import import_
+from mathesar.imports import csv as csv_imports
+
+BENCHMARK_SIZE_MB = int(os.environ.get('MATHESAR_CSV_IMPORT_BENCHMARK_MB', 0))
+BENCHMARK_MEMORY_LIMIT_MB = int(
+    os.environ.get('MATHESAR_CSV_IMPORT_BENCHMARK_MEMORY_LIMIT_MB', 256)
+)
+BENCHMARK_TABLE = "csv_import_benchmark"
+
+
+class MockCursor:
+    def __init__(self):
+        self.written = []
+
+    @contextmanager
+    def copy(self, copy_sql):
+        yield self
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class MockConnection:
+    def __init__(self):
+        self.mock_cursor = MockCursor()
+
+    def cursor(self):
+        return self.mock_cursor
+
+
+def test_insert_csv_records_writes_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_, 'COPY_CHUNK_SIZE', 8)
+    file_path = tmp_path / 'data.csv'
+    file_path.write_text('name\nabcdefghij\nklmnopqrst\n', encoding='utf-8')
+    conn = MockConnection()
+    import_.insert_csv_records('COPY', file_path, 'utf-8', 'utf-8', conn)
+    written = conn.mock_cursor.written
+    assert len(written) == 4
+    assert all(len(chunk) <= 8 for chunk in written)
+    assert ''.join(written) == 'name\nabcdefghij\nklmnopqrst\n'
+
+
+def test_insert_csv_records_transcodes_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_, 'COPY_CHUNK_SIZE', 3)
+    contents = 'name\nÅsa\nJosé\n'
+    file_path = tmp_path / 'data.csv'
+    file_path.write_text(contents, encoding='utf-16')
+    conn = MockConnection()
+    import_.insert_csv_records('COPY', file_path, 'utf-16', 'utf-8', conn)
+    written = conn.mock_cursor.written
+    assert len(written) > 1
+    assert b''.join(written).decode('utf-8') == contents
+
+
+class TrackedFile(BytesIO):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_sizes = []
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        return super().read(size)
+
+
+def test_get_file_encoding_reads_prefix(monkeypatch):
+    monkeypatch.setattr(csv_imports, 'ENCODING_SAMPLE_SIZE', 16)
+    file = TrackedFile(b'a' * 32 + 'Åsa'.encode('utf-8'))
+    # The prefix is all ASCII, so we fall back to a superset of ASCII.
+    assert csv_imports.get_file_encoding(file) == 'utf-8'
+    assert file.read_sizes == [16]
+    assert file.tell() == 0
+
+
+def _write_benchmark_csv(file_path, size_mb):
+    row = '{0},Name {0},{0}.25,2024-01-{1:02d},Some longer description text for row {0}\n'
+    with open(file_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write('id,name,amount,date,description\n')
+        i = 0
+        while csv_file.tell() < size_mb * 1024 * 1024:
+            csv_file.write(''.join(row.format(i + j, (i + j) % 28 + 1) for j in range(1000)))
+            i += 1000
+    return i
+
+
+def _get_peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@pytest.mark.skipif(
+    not BENCHMARK_SIZE_MB, reason='MATHESAR_CSV_IMPORT_BENCHMARK_MB is not set'
+)
+def test_csv_import_memory_benchmark(tmp_path, engine):
+    file_path = tmp_path / 'benchmark.csv'
+    num_rows = _write_benchmark_csv(file_path, BENCHMARK_SIZE_MB)
+    url = engine.url
+    with psycopg.connect(
+        host=url.host, port=url.port, dbname=url.database,
+        user=url.username, password=url.password,
+    ) as conn:
+        conn.execute(
+            f'CREATE TABLE {BENCHMARK_TABLE}'
+            ' (id integer, name text, amount text, date text, description text)'
+        )
+        copy_sql = f"COPY {BENCHMARK_TABLE} FROM STDIN (FORMAT csv, HEADER true)"
+        peak_before = _get_peak_rss_mb()
+        start = time.perf_counter()
+        try:
+            import_.insert_csv_records(copy_sql, file_path, 'utf-8', 'utf-8', conn)
+            elapsed = time.perf_counter() - start
+            peak_growth = _get_peak_rss_mb() - peak_before
+            imported_rows = conn.execute(
+                f'SELECT count(*) FROM {BENCHMARK_TABLE}'
+            ).fetchone()[0]
+        finally:
+            conn.rollback()
+    assert imported_rows == num_rows
+    assert peak_growth < BENCHMARK_MEMORY_LIMIT_MB, (
+        f'Imported {BENCHMARK_SIZE_MB} MB ({imported_rows} rows) in {elapsed:.1f}s,'
+        f' peak memory grew by {peak_growth:.1f} MB'
+    )
@@ -1,9 +1,13 @@
+import datetime
+
+import openpyxl
 import pytest
 
 from django.core.files import File
 
 from mathesar.models.deprecated import DataFile, Schema
 from mathesar.imports.base import create_table_from_data_file
+from mathesar.imports.excel import SheetSpool
 from db.schemas.utils import get_schema_oid_from_name
 from psycopg.errors import DuplicateTable
 
@@ -81,3 +85,52 @@ def test_excel_upload_table_imported_to(data_file, engine_with_schema):
     table = create_table_from_data_file(data_file, "NASA", schema)
     data_file.refresh_from_db()
     assert data_file.table_imported_to == table
+
+
+def test_excel_upload_with_id_column(engine_with_schema, tmp_path):
+    engine, schema_name = engine_with_schema
+    schema_oid = get_schema_oid_from_name(schema_name, engine)
+    schema = Schema.objects.get(oid=schema_oid)
+    excel_filepath = tmp_path / 'ids.xlsx'
+    workbook = openpyxl.Workbook()
+    for row in [('id', 'name'), ('a1', 'Alice'), ('a2', 'Bob')]:
+        workbook.active.append(row)
+    workbook.save(excel_filepath)
+    with open(excel_filepath, "rb") as excel_file:
+        data_file = DataFile.objects.create(file=File(excel_file), type='excel')
+    table = create_table_from_data_file(data_file, "IDs", schema)
+    assert table.sa_num_records() == 2
+    assert table.sa_column_names == ['id', 'id_original', 'name']
+    assert table.get_records()[0] == (1, 'a1', 'Alice')
+
+
+SHEET_ROWS = [
+    (None, None, None, None),
+    (None, 'id', 'name', 'name', None),
+    (None, 1, 'Alice', 2.0, None),
+    (None, None, None, None),
+    (None, 2, '', datetime.date(2024, 1, 2)),
+    (None, 3.0, True),
+]
+
+
+def test_sheet_spool_with_header():
+    spool = SheetSpool(SHEET_ROWS, header=True)
+    assert spool.column_names == ['id', 'name', 'name.1']
+    assert spool.is_integer_column(0)
+    assert not spool.is_integer_column(1)
+    assert list(spool.iter_records()) == [
+        [1, 'Alice', 2], [2, None, '2024-01-02'], [3, True, None]
+    ]
+    # Records can be read again, e.g., when retrying an insert.
+    assert len(list(spool.iter_records())) == 3
+    spool.close()
+
+
+def test_sheet_spool_without_header():
+    spool = SheetSpool(SHEET_ROWS, header=False)
+    assert spool.num_records == 4
+    assert len(spool.column_names) == 3
+    assert not spool.is_integer_column(0)
+    assert list(spool.iter_records())[0] == ['id', 'name', 'name']
+    spool.close()
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from django.core.files import File
@@ -5,6 +7,7 @@ from sqlalchemy import text
 
 from mathesar.models.deprecated import DataFile, Schema
 from mathesar.imports.base import create_table_from_data_file
+from mathesar.imports.json import get_column_names_from_json, is_valid_json
 from db.schemas.operations.create import create_schema_via_sql_alchemy
 from db.schemas.utils import get_schema_oid_from_name
 from psycopg.errors import DuplicateTable
@@ -19,6 +22,19 @@ def data_file(patents_json_filepath):
     return data_file
 
 
+@pytest.fixture
+def ndjson_data_file(patents_json_filepath, tmp_path):
+    with open(patents_json_filepath) as json_file:
+        records = json.load(json_file)
+    ndjson_filepath = tmp_path / 'patents.ndjson'
+    with open(ndjson_filepath, 'w') as ndjson_file:
+        for record in records:
+            ndjson_file.write(json.dumps(record) + '\n')
+    with open(ndjson_filepath, "rb") as ndjson_file:
+        data_file = DataFile.objects.create(file=File(ndjson_file), type='json')
+    return data_file
+
+
 @pytest.fixture()
 def schema(engine, test_db_model):
     create_schema_via_sql_alchemy(TEST_SCHEMA, engine)
@@ -85,3 +101,29 @@ def test_json_upload_table_imported_to(data_file, schema):
     table = create_table_from_data_file(data_file, "NASA", schema)
     data_file.refresh_from_db()
     assert data_file.table_imported_to == table
+
+
+def test_ndjson_upload(ndjson_data_file, schema):
+    table = create_table_from_data_file(ndjson_data_file, "NASA NDJSON", schema)
+    assert table.sa_num_records() == 1393
+    assert tuple(table.get_records()[0])[1:3] == ("NASA Kennedy Space Center", "Application")
+
+
+def test_get_column_names_from_json_in_order_of_appearance(tmp_path):
+    json_filepath = tmp_path / 'data.json'
+    json_filepath.write_text(
+        '[{"b": 1, "a": {"x": 1}}, {"c": 2, "b": 3}, {"a": {"y": 2}}]'
+    )
+    assert get_column_names_from_json(json_filepath, 0) == ["b", "a", "c"]
+    assert get_column_names_from_json(json_filepath, 1) == ["b", "a.x", "c", "a.y"]
+
+
+@pytest.mark.parametrize('data,expected', [
+    ('{"a": 1}', True),
+    ('[{"a": 1}, {"a": 2}]', True),
+    ('{"a": 1}\n{"a": 2}\n', True),
+    ('1\t2\n3\t4', False),
+    ('a\tb\n1\t2', False),
+])
+def test_is_valid_json(data, expected):
+    assert is_valid_json(data) is expected
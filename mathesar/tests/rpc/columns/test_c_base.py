@@ -7,6 +7,8 @@ Fixtures:
 """
 from contextlib import contextmanager
 
+import pytest
+
 from mathesar.rpc import columns
 from mathesar.models.users import User
 
@@ -224,3 +226,93 @@ def test_columns_delete(rf, monkeypatch):
         request=request
     )
     assert actual_result == 3
+
+
+def test_columns_get_profile(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    table_oid = 23457
+    database_id = 2
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == 'alice':
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_column_profiles(
+            _table_oid, conn, column_attnums=None, sample_size=10000, analyze=False
+    ):
+        if (
+                _table_oid != table_oid
+                or column_attnums != [2, 3]
+                or sample_size != 500
+                or analyze is not True
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return [
+            {
+                'attnum': 2, 'source': 'statistics', 'sampled_rows': None,
+                'null_fraction': 0, 'distinct_count': 4,
+                'most_common_values': ['0', '1', '2', '3'],
+                'most_common_frequencies': [0.25, 0.25, 0.25, 0.25],
+                'histogram_bounds': None, 'min': '0', 'max': '3',
+            }, {
+                'attnum': 3, 'source': 'sample', 'sampled_rows': 500,
+                'null_fraction': 0.5, 'distinct_count': 1,
+                'most_common_values': ['even'],
+                'most_common_frequencies': [0.5],
+                'histogram_bounds': ['even', 'even'], 'min': 'even', 'max': 'even',
+            },
+        ]
+
+    monkeypatch.setattr(columns.base, 'connect', mock_connect)
+    monkeypatch.setattr(columns.base, 'get_column_profiles', mock_column_profiles)
+    expect_profiles = [
+        {
+            'id': 2, 'source': 'statistics', 'sampled_rows': None,
+            'null_fraction': 0, 'distinct_count': 4,
+            'most_common_values': ['0', '1', '2', '3'],
+            'most_common_frequencies': [0.25, 0.25, 0.25, 0.25],
+            'histogram_bounds': None, 'min': '0', 'max': '3',
+        }, {
+            'id': 3, 'source': 'sample', 'sampled_rows': 500,
+            'null_fraction': 0.5, 'distinct_count': 1,
+            'most_common_values': ['even'],
+            'most_common_frequencies': [0.5],
+            'histogram_bounds': ['even', 'even'], 'min': 'even', 'max': 'even',
+        },
+    ]
+    actual_profiles = columns.get_profile(
+        table_oid=table_oid, database_id=database_id, column_attnums=[2, 3],
+        sample_size=500, analyze=True, request=request
+    )
+    assert actual_profiles == expect_profiles
+
+
+@pytest.mark.parametrize(
+    'sample_size,expect_sample_size', [(0, 1), (-5, 1), (500, 500), (10 ** 9, 100000)]
+)
+def test_columns_get_profile_clamps_sample_size(rf, monkeypatch, sample_size, expect_sample_size):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    sample_sizes = []
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        yield True
+
+    def mock_column_profiles(_table_oid, conn, column_attnums=None, sample_size=10000, analyze=False):
+        sample_sizes.append(sample_size)
+        return []
+
+    monkeypatch.setattr(columns.base, 'connect', mock_connect)
+    monkeypatch.setattr(columns.base, 'get_column_profiles', mock_column_profiles)
+    columns.get_profile(
+        table_oid=23457, database_id=2, sample_size=sample_size, request=request
+    )
+    assert sample_sizes == [expect_sample_size]
@@ -4,6 +4,7 @@ from modernrpc.exceptions import RPCException
 from psycopg.errors import BadCopyFileFormat
 from django.core.exceptions import FieldDoesNotExist
 from mathesar.utils.connections import BadInstallationTarget
+from mathesar.rpc.utils import StatementTimeout
 from db.functions.exceptions import UnknownDBFunctionID
 from http.client import CannotSendRequest
 
@@ -21,6 +22,7 @@ def fake_func(exception):
         (BadCopyFileFormat, -30009),
         (FieldDoesNotExist, -29030),
         (BadInstallationTarget, -28002),
+        (StatementTimeout, -28036),
         (UnknownDBFunctionID, -27024),
         (CannotSendRequest, -25031),
     ]
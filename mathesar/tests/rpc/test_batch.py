@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+
+import pytest
+
+from mathesar.rpc import batch, utils
+
+
+@pytest.fixture
+def mock_shared_connection(monkeypatch, settings):
+    settings.MATHESAR_RPC_BATCH = {'WORKERS': 1}
+    opened = []
+
+    @contextmanager
+    def _shared_connection(database_id, user, read_only=False):
+        opened.append((database_id, read_only))
+        yield (database_id, read_only)
+    monkeypatch.setattr(batch, 'shared_connection', _shared_connection)
+    return opened
+
+
+def _call(call_id, method, **params):
+    return {'jsonrpc': '2.0', 'id': call_id, 'method': method, 'params': params}
+
+
+def _process_call(call):
+    return (call['id'], utils._shared_connection.get())
+
+
+def test_run_batch_groups_calls_by_database(mock_shared_connection):
+    calls = [
+        _call(1, 'tables.get_with_metadata', table_oid=2254329, database_id=11),
+        _call(2, 'records.patch', table_oid=2254329, database_id=12),
+        _call(3, 'servers.configured.list'),
+        _call(4, 'records.list', table_oid=2254329, database_id=11),
+        _call(5, 'records.list', table_oid=2254329, database_id=12),
+    ]
+    results = batch.run_batch(calls, _process_call, None)
+    assert mock_shared_connection == [(11, True), (12, False)]
+    assert results == [
+        (1, (11, True)),
+        (2, (12, False)),
+        (3, None),
+        (4, (11, True)),
+        (5, (12, False)),
+    ]
+
+
+def test_run_batch_analyzing_profile_is_not_read_only(mock_shared_connection):
+    calls = [
+        _call(1, 'columns.get_profile', table_oid=2254329, database_id=11, analyze=True),
+    ]
+    batch.run_batch(calls, _process_call, None)
+    assert mock_shared_connection == [(11, False)]
+
+
+def test_run_batch_unshared_method(mock_shared_connection):
+    calls = [
+        _call(1, 'databases.get', database_id=11),
+        _call(2, 'databases.delete', database_oid=2254329, database_id=11),
+    ]
+    results = batch.run_batch(calls, _process_call, None)
+    assert mock_shared_connection == []
+    assert results == [(1, None), (2, None)]
+
+
+def test_run_batch_invalid_calls(mock_shared_connection):
+    calls = [
+        'not a call',
+        _call(1, 'records.list', database_id='11'),
+    ]
+    results = batch.run_batch(calls, lambda call: call, None)
+    assert mock_shared_connection == []
+    assert results == calls
@@ -121,17 +121,56 @@ def test_suggest_types(rf, monkeypatch):
         else:
             raise AssertionError('incorrect parameters passed')
 
+    def mock_suggest_types(conn, table_oid, sample_size, confirm):
+        if table_oid != _table_oid or confirm is not True:
+            raise AssertionError('incorrect parameters passed')
+        return {
+            '1': {'type': 'integer', 'confidence': 1, 'confirmed': True},
+            '2': {'type': 'numeric', 'confidence': 1, 'confirmed': True},
+        }
+
+    monkeypatch.setattr(data_modeling, 'connect', mock_connect)
+    monkeypatch.setattr(
+        data_modeling.infer_types, 'infer_table_column_data_types_sampled', mock_suggest_types
+    )
+    actual_types = data_modeling.suggest_types(
+        table_oid=_table_oid,
+        database_id=_database_id,
+        request=request,
+    )
+    assert actual_types == {'1': 'integer', '2': 'numeric'}
+
+
+def test_suggest_types_strict(rf, monkeypatch):
+    _username = 'alice'
+    _password = 'pass1234'
+    _table_oid = 12345
+    _database_id = 2
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=_username, password=_password)
+
+    @contextmanager
+    def mock_connect(database_id, user):
+        yield True
+
     def mock_suggest_types(conn, table_oid):
         if table_oid != _table_oid:
             raise AssertionError('incorrect parameters passed')
+        return {'1': 'integer', '2': 'numeric'}
 
     monkeypatch.setattr(data_modeling, 'connect', mock_connect)
     monkeypatch.setattr(data_modeling.infer_types, 'infer_table_column_data_types', mock_suggest_types)
-    data_modeling.suggest_types(
+    actual_types = data_modeling.suggest_types(
         table_oid=_table_oid,
         database_id=_database_id,
+        strict=True,
+        return_confidence=True,
         request=request,
     )
+    assert actual_types == {
+        '1': {'type': 'integer', 'confidence': 1, 'confirmed': True},
+        '2': {'type': 'numeric', 'confidence': 1, 'confirmed': True},
+    }
 
 
 def test_split_table(rf, monkeypatch):
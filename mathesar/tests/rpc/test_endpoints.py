@@ -15,10 +15,12 @@ from mathesar.rpc import constraints
 from mathesar.rpc import data_modeling
 from mathesar.rpc import databases
 from mathesar.rpc import explorations
+from mathesar.rpc import jobs
 from mathesar.rpc import records
 from mathesar.rpc import roles
 from mathesar.rpc import schemas
 from mathesar.rpc import servers
+from mathesar.rpc import slow_calls
 from mathesar.rpc import tables
 from mathesar.rpc import types
 
@@ -54,6 +56,11 @@ METHODS = [
         "columns.delete",
         [user_is_authenticated]
     ),
+    (
+        columns.get_profile,
+        "columns.get_profile",
+        [user_is_authenticated]
+    ),
     (
         columns.list_,
         "columns.list",
@@ -224,11 +231,37 @@ METHODS = [
         [user_is_authenticated]
     ),
 
+    (
+        jobs.cancel,
+        "jobs.cancel",
+        [user_is_authenticated]
+    ),
+    (
+        jobs.get,
+        "jobs.get",
+        [user_is_authenticated]
+    ),
+    (
+        jobs.list_,
+        "jobs.list",
+        [user_is_authenticated]
+    ),
+    (
+        jobs.submit,
+        "jobs.submit",
+        [user_is_authenticated]
+    ),
+
     (
         records.add,
         "records.add",
         [user_is_authenticated]
     ),
+    (
+        records.add_many,
+        "records.add_many",
+        [user_is_authenticated]
+    ),
     (
         records.delete,
         "records.delete",
@@ -249,6 +282,11 @@ METHODS = [
         "records.patch",
         [user_is_authenticated]
     ),
+    (
+        records.patch_many,
+        "records.patch_many",
+        [user_is_authenticated]
+    ),
     (
         records.search,
         "records.search",
@@ -350,6 +388,12 @@ METHODS = [
         [user_is_authenticated]
     ),
 
+    (
+        slow_calls.list_,
+        "slow_calls.list",
+        [user_is_superuser]
+    ),
+
     (
 
         types.list_,
@@ -433,6 +477,22 @@ METHODS = [
         tables.metadata.set_,
         "tables.metadata.set",
         [user_is_authenticated]
+    ),
+
+    (
+        tables.search_indexes.get_status,
+        "tables.search_indexes.get_status",
+        [user_is_authenticated]
+    ),
+    (
+        tables.search_indexes.add,
+        "tables.search_indexes.add",
+        [user_is_authenticated]
+    ),
+    (
+        tables.search_indexes.drop,
+        "tables.search_indexes.drop",
+        [user_is_authenticated]
     )
 ]
 
@@ -0,0 +1,129 @@
+"""
+This file tests the jobs RPC functions.
+
+Fixtures:
+    rf(pytest-django): Provides mocked `Request` objects.
+    monkeypatch(pytest): Lets you monkeypatch an object for testing.
+"""
+from datetime import datetime, timezone
+
+from mathesar.models.base import Job
+from mathesar.models.users import User
+from mathesar.rpc import jobs, tables
+
+
+def _get_job(**kwargs):
+    return Job(
+        id=7,
+        database_id=2,
+        method='tables.import',
+        params={'data_file_id': 3, 'schema_oid': 2200},
+        created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        **kwargs
+    )
+
+
+def test_jobs_submit(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+
+    def mock_submit_job(user, database_id, method, params):
+        if (
+            user.username != 'alice' or database_id != 2
+            or method != 'tables.import'
+            or params != {'data_file_id': 3, 'schema_oid': 2200}
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return _get_job(status='pending')
+    monkeypatch.setattr(jobs, 'submit_job', mock_submit_job)
+    actual = jobs.submit(
+        method='tables.import',
+        params={'data_file_id': 3, 'schema_oid': 2200},
+        database_id=2,
+        request=request
+    )
+    assert actual['id'] == 7
+    assert actual['status'] == 'pending'
+    assert actual['created_at'] == '2026-01-02T03:04:05+00:00'
+    assert actual['started_at'] is None
+
+
+def test_jobs_get_with_progress(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    started_at = datetime(2026, 1, 2, 3, 4, 6, tzinfo=timezone.utc)
+    progress = {'bytes_processed': 100, 'bytes_total': 400, 'tuples_processed': 5}
+
+    def mock_get_job(job_id, user):
+        if job_id != 7 or user.username != 'alice':
+            raise AssertionError('incorrect parameters passed')
+        return _get_job(status='running', started_at=started_at, backend_pid=1234)
+    monkeypatch.setattr(jobs, 'get_job', mock_get_job)
+    monkeypatch.setattr(jobs, 'get_job_progress', lambda job: progress)
+    actual = jobs.get(job_id=7, request=request)
+    assert actual['status'] == 'running'
+    assert actual['progress'] == progress
+    assert actual['started_at'] == '2026-01-02T03:04:06+00:00'
+
+
+def test_jobs_get_stale(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    monkeypatch.setattr(jobs, 'get_job', lambda job_id, user: _get_job(status='pending'))
+    monkeypatch.setattr(jobs, 'get_job_progress', lambda job: None)
+    monkeypatch.setattr('mathesar.utils.jobs.has_live_worker', lambda: False)
+    actual = jobs.get(job_id=7, request=request)
+    assert actual['status'] == 'pending'
+    assert actual['stale'] is True
+
+
+def test_jobs_cancel(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    job = _get_job(status='running')
+    cancelled = []
+    monkeypatch.setattr(jobs, 'get_job', lambda job_id, user: job)
+    monkeypatch.setattr(jobs, 'cancel_job', cancelled.append)
+    jobs.cancel(job_id=7, request=request)
+    assert cancelled == [job]
+
+
+def test_tables_import_run_async(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+
+    def mock_submit_job(user, database_id, method, params):
+        if method != 'tables.import' or params['data_file_id'] != 3:
+            raise AssertionError('incorrect parameters passed')
+        return _get_job(status='pending')
+
+    def mock_connect(*args):
+        raise AssertionError('async import connected in the request')
+    monkeypatch.setattr(tables.base, 'submit_job', mock_submit_job)
+    monkeypatch.setattr(tables.base, 'connect', mock_connect)
+    actual = tables.import_(
+        data_file_id=3, schema_oid=2200, database_id=2, run_async=True, request=request
+    )
+    assert actual == 7
+
+
+def test_tables_search_indexes_add_run_async(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+
+    def mock_submit_job(user, database_id, method, params):
+        if (
+                method != 'tables.search_indexes.add'
+                or params != {'table_oid': 2254329, 'column_attnums': [3]}
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return _get_job(status='pending')
+
+    def mock_connect(*args):
+        raise AssertionError('async index build connected in the request')
+    monkeypatch.setattr(tables.search_indexes, 'submit_job', mock_submit_job)
+    monkeypatch.setattr(tables.search_indexes, 'connect', mock_connect)
+    actual = tables.search_indexes.add(
+        table_oid=2254329, database_id=2, column_attnums=[3], run_async=True, request=request
+    )
+    assert actual == 7
@@ -5,12 +5,21 @@ Fixtures:
     rf(pytest-django): Provides mocked `Request` objects.
     monkeypatch(pytest): Lets you monkeypatch an object for testing.
 """
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+
+from django.core.cache import cache
+from modernrpc.exceptions import RPCException
+import pytest
 
 from mathesar.rpc import records
 from mathesar.models.users import User
 
 
+class _MockConnection:
+    def transaction(self):
+        return nullcontext()
+
+
 def test_records_list(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
@@ -23,7 +32,7 @@ def test_records_list(rf, monkeypatch):
     def mock_connect(_database_id, user):
         if _database_id == database_id and user.username == username:
             try:
-                yield True
+                yield _MockConnection()
             finally:
                 pass
         else:
@@ -38,6 +47,8 @@ def test_records_list(rf, monkeypatch):
             filter=None,
             group=None,
             return_record_summaries=False,
+            count_mode='exact',
+            cursor=None,
     ):
         if _table_oid != table_oid or return_record_summaries is False:
             raise AssertionError('incorrect parameters passed')
@@ -69,6 +80,7 @@ def test_records_list(rf, monkeypatch):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
+        "next_cursor": None,
     }
     actual_records_list = records.list_(
         table_oid=table_oid,
@@ -79,6 +91,80 @@ def test_records_list(rf, monkeypatch):
     assert actual_records_list == expect_records_list
 
 
+def test_records_list_caches_exact_count(rf, monkeypatch, database_model):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23458
+    database_id = database_model.id
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+    count_modes_passed = []
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        yield _MockConnection()
+
+    def mock_list_records(conn, _table_oid, count_mode='exact', **kwargs):
+        count_modes_passed.append(count_mode)
+        return {
+            "count": 50123 if count_mode == 'exact' else None,
+            "results": [{"1": "abcde", "2": 12345}],
+            "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 1',
+        }
+
+    def mock_delete_records(conn, _record_ids, _table_oid):
+        return 1
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_select, 'list_records_from_table', mock_list_records)
+    monkeypatch.setattr(records.record_delete, 'delete_records_from_table', mock_delete_records)
+    cache.clear()
+    first = records.list_(table_oid=table_oid, database_id=database_id, request=request)
+    second = records.list_(table_oid=table_oid, database_id=database_id, request=request)
+    records.delete(record_ids=[1], table_oid=table_oid, database_id=database_id, request=request)
+    third = records.list_(table_oid=table_oid, database_id=database_id, request=request)
+    assert first["count"] == second["count"] == third["count"] == 50123
+    assert count_modes_passed == ['exact', 'none', 'exact']
+
+
+def test_records_list_cursor_roundtrip(rf, monkeypatch):
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username='alice', password='pass1234')
+    order = [{"attnum": 2, "direction": "desc"}]
+    cursors_passed = []
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        yield _MockConnection()
+
+    def mock_list_records(conn, _table_oid, cursor=None, **kwargs):
+        cursors_passed.append(cursor)
+        return {
+            "count": 3,
+            "results": [{"1": 3, "2": "c"}],
+            "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 1',
+            "next_cursor": ["c", 3],
+        }
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_select, 'list_records_from_table', mock_list_records)
+    cache.clear()
+    first = records.list_(
+        table_oid=23459, database_id=2, limit=1, order=order,
+        paginate_by_cursor=True, request=request
+    )
+    records.list_(
+        table_oid=23459, database_id=2, limit=1, order=order,
+        cursor=first["next_cursor"], request=request
+    )
+    assert cursors_passed == [[], ["c", 3]]
+    with pytest.raises(RPCException):
+        records.list_(
+            table_oid=23459, database_id=2, limit=1,
+            cursor=first["next_cursor"], request=request
+        )
+
+
 def test_records_get(rf, monkeypatch):
     username = 'alice'
     password = 'pass1234'
@@ -124,6 +210,7 @@ def test_records_get(rf, monkeypatch):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
+        "next_cursor": None,
     }
     actual_record = records.get(
         record_id=record_id,
@@ -135,11 +222,11 @@ def test_records_get(rf, monkeypatch):
     assert actual_record == expect_record
 
 
-def test_records_add(rf, monkeypatch):
+def test_records_add(rf, monkeypatch, database_model):
     username = 'alice'
     password = 'pass1234'
     table_oid = 23457
-    database_id = 2
+    database_id = database_model.id
     record_def = {"1": "arecord"}
     request = rf.post('/api/rpc/v0/', data={})
     request.user = User(username=username, password=password)
@@ -185,12 +272,12 @@ def test_records_add(rf, monkeypatch):
     assert actual_record == expect_record
 
 
-def test_records_patch(rf, monkeypatch):
+def test_records_patch(rf, monkeypatch, database_model):
     username = 'alice'
     password = 'pass1234'
     record_id = 243
     table_oid = 23457
-    database_id = 2
+    database_id = database_model.id
     record_def = {"2": "arecord"}
     request = rf.post('/api/rpc/v0/', data={})
     request.user = User(username=username, password=password)
@@ -243,11 +330,131 @@ def test_records_patch(rf, monkeypatch):
     assert actual_record == expect_record
 
 
-def test_records_delete(rf, monkeypatch):
+def test_records_add_many(rf, monkeypatch, database_model):
     username = 'alice'
     password = 'pass1234'
     table_oid = 23457
-    database_id = 2
+    database_id = database_model.id
+    record_defs = [{"2": "arecord"}, {"2": 1234}]
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_add_records(
+            conn,
+            _record_defs,
+            _table_oid,
+            return_records=True,
+            return_record_summaries=False,
+            continue_on_error=False,
+    ):
+        if (
+                _table_oid != table_oid
+                or _record_defs != record_defs
+                or continue_on_error is False
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return {
+            "count": 1,
+            "results": [{"1": 4, "2": "arecord"}],
+            "linked_record_summaries": None,
+            "record_summaries": None,
+            "errors": [{"index": 1, "message": "some error", "sql_state": "22P02"}],
+        }
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_insert, 'add_records_to_table', mock_add_records)
+    expect_records = {
+        "count": 1,
+        "results": [{"1": 4, "2": "arecord"}],
+        "linked_record_summaries": None,
+        "record_summaries": None,
+        "errors": [{"index": 1, "message": "some error", "sql_state": "22P02"}],
+    }
+    actual_records = records.add_many(
+        record_defs=record_defs,
+        table_oid=table_oid,
+        database_id=database_id,
+        continue_on_error=True,
+        request=request
+    )
+    assert actual_records == expect_records
+
+
+def test_records_patch_many(rf, monkeypatch, database_model):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = database_model.id
+    record_defs = [{"1": 3, "2": "arecord"}, {"1": 4, "2": "another"}]
+    request = rf.post('/api/rpc/v0/', data={})
+    request.user = User(username=username, password=password)
+
+    @contextmanager
+    def mock_connect(_database_id, user):
+        if _database_id == database_id and user.username == username:
+            try:
+                yield True
+            finally:
+                pass
+        else:
+            raise AssertionError('incorrect parameters passed')
+
+    def mock_patch_records(
+            conn,
+            _record_defs,
+            _table_oid,
+            return_records=True,
+            return_record_summaries=False,
+            continue_on_error=False,
+    ):
+        if (
+                _table_oid != table_oid
+                or _record_defs != record_defs
+                or return_records is True
+        ):
+            raise AssertionError('incorrect parameters passed')
+        return {
+            "count": 2,
+            "results": None,
+            "linked_record_summaries": None,
+            "record_summaries": None,
+            "errors": [],
+        }
+
+    monkeypatch.setattr(records, 'connect', mock_connect)
+    monkeypatch.setattr(records.record_update, 'patch_records_in_table', mock_patch_records)
+    expect_records = {
+        "count": 2,
+        "results": None,
+        "linked_record_summaries": None,
+        "record_summaries": None,
+        "errors": [],
+    }
+    actual_records = records.patch_many(
+        record_defs=record_defs,
+        table_oid=table_oid,
+        database_id=database_id,
+        return_records=False,
+        request=request
+    )
+    assert actual_records == expect_records
+
+
+def test_records_delete(rf, monkeypatch, database_model):
+    username = 'alice'
+    password = 'pass1234'
+    table_oid = 23457
+    database_id = database_model.id
     record_ids = [2342, 321]
     request = rf.post('/api/rpc/v0/', data={})
     request.user = User(username=username, password=password)
@@ -292,7 +499,7 @@ def test_records_search(rf, monkeypatch):
     def mock_connect(_database_id, user):
         if _database_id == database_id and user.username == username:
             try:
-                yield True
+                yield _MockConnection()
             finally:
                 pass
         else:
@@ -304,6 +511,7 @@ def test_records_search(rf, monkeypatch):
             search=[],
             limit=10,
             return_record_summaries=False,
+            fuzzy=False,
     ):
         if _table_oid != table_oid or return_record_summaries is False:
             raise AssertionError('incorrect parameters passed')
@@ -324,6 +532,7 @@ def test_records_search(rf, monkeypatch):
         "linked_record_summaries": {"2": {"12345": "blkjdfslkj"}},
         "record_summaries": {"3": "abcde"},
         "query": 'SELECT mycol AS "1", anothercol AS "2" FROM mytable LIMIT 2',
+        "next_cursor": None,
     }
     actual_records_list = records.search(
         table_oid=table_oid,
@@ -0,0 +1,158 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from mathesar.rpc import utils
+
+
+@pytest.mark.parametrize(
+    "method_name,family", [
+        ("records.list", "RECORDS"),
+        ("records.delete", "RECORDS"),
+        ("explorations.run", "RECORDS"),
+        ("columns.get_profile", "RECORDS"),
+        ("tables.get", "CATALOG"),
+        ("tables.list_with_metadata", "CATALOG"),
+        ("schemas.list", "CATALOG"),
+        ("columns.patch", "DDL"),
+        ("data_modeling.split_table", "DDL"),
+    ]
+)
+def test_get_statement_timeout_family(method_name, family):
+    assert utils.get_statement_timeout_family(method_name) == family
+
+
+@pytest.mark.parametrize(
+    "method_name,read_only", [
+        ("records.list", True),
+        ("records.search", True),
+        ("records.patch", False),
+        ("tables.get_with_metadata", True),
+        ("columns.list_with_metadata", True),
+        ("explorations.run", True),
+        ("explorations.add", False),
+        ("data_modeling.split_table", False),
+    ]
+)
+def test_is_read_only_method(method_name, read_only):
+    assert utils.is_read_only_method(method_name) == read_only
+
+
+class _MockConnection:
+    def __init__(self):
+        self.statements = []
+        self.cancelled = False
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+    def cancel(self):
+        self.cancelled = True
+
+    @contextmanager
+    def transaction(self):
+        self.statements.append('SAVEPOINT')
+        yield
+
+
+@pytest.fixture
+def mock_pooled_connection(monkeypatch, settings):
+    conn = _MockConnection()
+
+    @contextmanager
+    def _pooled_connection(_user_database_role):
+        conn.borrowed = getattr(conn, 'borrowed', 0) + 1
+        yield conn
+    settings.MATHESAR_CONNECTION_POOL = {**settings.MATHESAR_CONNECTION_POOL, 'ENABLED': True}
+    settings.MATHESAR_STATEMENT_TIMEOUTS = {'DDL': 2.5}
+    monkeypatch.setattr(utils, 'pooled_connection', _pooled_connection)
+    monkeypatch.setattr(
+        utils.UserDatabaseRoleMap.objects, 'select_related',
+        lambda *_: SimpleNamespace(get=lambda **_: None)
+    )
+    return conn
+
+
+def test_connect_sets_statement_timeout(mock_pooled_connection):
+    with utils.statement_timeout_context('DDL'):
+        with utils.connect(1, None) as conn:
+            pass
+    assert len(conn.statements) == 1
+    assert 'SET LOCAL statement_timeout' in conn.statements[0].as_string(None)
+    assert '2500' in conn.statements[0].as_string(None)
+
+
+def test_connect_without_context(mock_pooled_connection):
+    with utils.connect(1, None) as conn:
+        pass
+    assert conn.statements == []
+
+
+def test_connect_cancels_query_on_exit(mock_pooled_connection):
+    with pytest.raises(SystemExit):
+        with utils.statement_timeout_context('DDL'):
+            with utils.connect(1, None) as conn:
+                raise SystemExit(1)
+    assert conn.cancelled
+
+
+def test_connect_uses_shared_connection(mock_pooled_connection):
+    with utils.shared_connection(1, None, read_only=True) as shared:
+        with utils.shared_connection_context(shared):
+            with utils.connect(1, None) as conn_1:
+                pass
+            with utils.connect(1, None) as conn_2:
+                pass
+    assert conn_1 is conn_2
+    assert conn_1.borrowed == 1
+    assert conn_1.statements == [
+        'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY',
+        'SAVEPOINT',
+        'SAVEPOINT',
+    ]
+
+
+def test_connect_ignores_shared_connection_of_other_database(mock_pooled_connection):
+    with utils.shared_connection(2, None) as shared:
+        with utils.shared_connection_context(shared):
+            with utils.connect(1, None) as conn:
+                pass
+    assert conn.borrowed == 1
+    assert conn.statements == []
+
+
+def test_on_commit_waits_for_shared_connection(mock_pooled_connection, monkeypatch):
+    called = []
+
+    @contextmanager
+    def _pooled_connection(_user_database_role):
+        yield mock_pooled_connection
+        # Committed when given back.
+        called.append('commit')
+    monkeypatch.setattr(utils, 'pooled_connection', _pooled_connection)
+    with utils.shared_connection(1, None) as shared:
+        with utils.shared_connection_context(shared):
+            with utils.connect(1, None):
+                pass
+            utils.on_commit(1, None, lambda: called.append('callback'))
+            # A connection to another database is committed already.
+            utils.on_commit(2, None, lambda: called.append('other callback'))
+        assert called == ['other callback']
+    assert called == ['other callback', 'commit', 'callback']
+
+
+def test_on_commit_skipped_if_shared_connection_fails(mock_pooled_connection):
+    called = []
+    with pytest.raises(ValueError):
+        with utils.shared_connection(1, None) as shared:
+            with utils.shared_connection_context(shared):
+                utils.on_commit(1, None, lambda: called.append('callback'))
+                raise ValueError()
+    assert called == []
+
+
+def test_on_commit_without_shared_connection():
+    called = []
+    utils.on_commit(1, None, lambda: called.append('callback'))
+    assert called == ['callback']
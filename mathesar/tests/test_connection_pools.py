@@ -0,0 +1,55 @@
+from mathesar.models.base import (
+    ConfiguredRole, Database, Server, UserDatabaseRoleMap
+)
+from mathesar.utils import connection_pools
+
+
+class MockPool:
+    check_connection = None
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs['kwargs']
+        self.name = kwargs['name']
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _make_role_map(password='pass1234', port=5432):
+    server = Server(id=1, host='example.com', port=port)
+    database = Database(id=2, name='mydb', server=server)
+    role = ConfiguredRole(id=3, name='alice', server=server, password=password)
+    return UserDatabaseRoleMap(
+        database=database, configured_role=role, server=server
+    )
+
+
+def test_get_pool_reuses_pool(monkeypatch):
+    monkeypatch.setattr(connection_pools, 'ConnectionPool', MockPool)
+    monkeypatch.setattr(connection_pools, '_pools', {})
+    pool_a = connection_pools.get_pool(_make_role_map())
+    pool_b = connection_pools.get_pool(_make_role_map())
+    assert pool_a is pool_b
+    assert pool_a.name == '1_2_3'
+
+
+def test_get_pool_replaces_pool_on_password_change(monkeypatch):
+    monkeypatch.setattr(connection_pools, 'ConnectionPool', MockPool)
+    monkeypatch.setattr(connection_pools, '_pools', {})
+    pool_a = connection_pools.get_pool(_make_role_map())
+    pool_b = connection_pools.get_pool(_make_role_map(password='newpass'))
+    assert pool_a is not pool_b
+    assert pool_a.closed is True
+    assert pool_b.kwargs['password'] == 'newpass'
+
+
+def test_invalidate_pools(monkeypatch):
+    monkeypatch.setattr(connection_pools, 'ConnectionPool', MockPool)
+    monkeypatch.setattr(connection_pools, '_pools', {})
+    pool = connection_pools.get_pool(_make_role_map())
+    connection_pools.invalidate_pools(server_id=4)
+    assert pool.closed is False
+    connection_pools.invalidate_pools(server_id=1)
+    assert pool.closed is True
+    assert connection_pools._pools == {}
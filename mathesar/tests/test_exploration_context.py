@@ -0,0 +1,131 @@
+import threading
+from types import SimpleNamespace
+
+from mathesar.utils import exploration_context, explorations
+
+
+class MockEngine:
+    def __init__(self, password):
+        self.password = password
+        self.disposed = False
+
+    def dispose(self):
+        self.disposed = True
+
+
+class MockInfo:
+    host = 'example.com'
+    port = 5432
+    dbname = 'mydb'
+    user = 'alice'
+
+    def __init__(self, password):
+        self.password = password
+
+
+class MockConnection:
+    def __init__(self, password='pass1234'):
+        self.info = MockInfo(password)
+
+
+def _get_context(conn):
+    with exploration_context.get_exploration_context(conn) as context:
+        return context
+
+
+def _setup(monkeypatch, catalog_version=1):
+    monkeypatch.setattr(exploration_context, '_contexts', {})
+    monkeypatch.setattr(
+        exploration_context,
+        'create_future_engine_with_custom_types',
+        lambda user, password, host, dbname, port: MockEngine(password),
+    )
+    monkeypatch.setattr(
+        exploration_context, '_get_catalog_version', lambda conn: catalog_version
+    )
+
+
+def test_get_exploration_context_reuses_engine_and_metadata(monkeypatch):
+    _setup(monkeypatch)
+    context_a = _get_context(MockConnection())
+    metadata_a = context_a.metadata
+    context_b = _get_context(MockConnection())
+    assert context_a is context_b
+    assert context_b.metadata is metadata_a
+    assert context_b.keep_existing is True
+
+
+def test_get_exploration_context_resets_metadata_on_catalog_change(monkeypatch):
+    _setup(monkeypatch, catalog_version=1)
+    context = _get_context(MockConnection())
+    metadata_a = context.metadata
+    monkeypatch.setattr(exploration_context, '_get_catalog_version', lambda conn: 2)
+    context = _get_context(MockConnection())
+    assert context.metadata is not metadata_a
+    assert context.engine.disposed is False
+
+
+def test_get_exploration_context_without_catalog_version(monkeypatch):
+    _setup(monkeypatch, catalog_version=None)
+    context = _get_context(MockConnection())
+    metadata_a = context.metadata
+    context = _get_context(MockConnection())
+    assert context.metadata is not metadata_a
+    assert context.keep_existing is False
+
+
+def test_get_exploration_context_replaces_engine_on_password_change(monkeypatch):
+    _setup(monkeypatch)
+    context_a = _get_context(MockConnection())
+    engine_a = context_a.engine
+    context_b = _get_context(MockConnection(password='newpass'))
+    assert context_b.engine is not engine_a
+    assert engine_a.disposed is True
+    assert context_b.engine.password == 'newpass'
+
+
+def test_get_exploration_context_holds_lock(monkeypatch):
+    _setup(monkeypatch)
+    acquired = []
+    with exploration_context.get_exploration_context(MockConnection()) as context:
+        thread = threading.Thread(
+            target=lambda: acquired.append(context.lock.acquire(blocking=False))
+        )
+        thread.start()
+        thread.join()
+    assert acquired == [False]
+    # The lock is reentrant, so a thread holding it may get the context again.
+    with exploration_context.get_exploration_context(MockConnection()) as context_a:
+        with exploration_context.get_exploration_context(MockConnection()) as context_b:
+            assert context_a is context_b
+
+
+def test_run_exploration_queries_without_lock(monkeypatch):
+    _setup(monkeypatch)
+    relation = SimpleNamespace(columns=[SimpleNamespace(name='id')])
+    db_query = SimpleNamespace(transformed_relation=relation, _is_sorting_transform_used=False)
+    monkeypatch.setattr(
+        explorations, '_get_exploration_db_query', lambda *args: (db_query, [])
+    )
+    monkeypatch.setattr(explorations, '_get_exploration_columns_info', lambda *args: {})
+    monkeypatch.setattr(explorations, '_get_exploration_column_metadata', lambda *args: {})
+    # Both calls must be querying at once to get past the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def mock_get_records_with_count(**kwargs):
+        barrier.wait()
+        return [{'id': 1}], 1
+    monkeypatch.setattr(explorations, 'get_records_with_count', mock_get_records_with_count)
+    results = []
+
+    def run():
+        results.append(
+            explorations.run_exploration({'base_table_oid': 1234}, MockConnection())
+        )
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not barrier.broken
+    assert [result['records']['count'] for result in results] == [1, 1]
@@ -0,0 +1,113 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+import psycopg
+import pytest
+
+from mathesar import views
+from mathesar.models.base import Explorations
+from mathesar.models.users import User
+
+
+def _chunks(*chunks, error=None):
+    yield from chunks
+    if error is not None:
+        raise error
+
+
+def _get_request(rf, path, **params):
+    request = rf.get(path, params)
+    request.user = User(username='alice', password='pass1234')
+    return request
+
+
+def test_export_table(rf, monkeypatch):
+    exports = []
+
+    def mock_stream_table_export(database_id, user, table_oid, **kwargs):
+        exports.append((database_id, table_oid, kwargs))
+        return _chunks(b'id,name\n', b'1,a\n')
+    monkeypatch.setattr(views, 'stream_table_export', mock_stream_table_export)
+    response = views.export_table(_get_request(
+        rf, '/api/export/v0/tables/', database_id=2, table_oid=1234,
+        columns=json.dumps([1, 2]),
+    ))
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+    assert response['Content-Disposition'] == 'attachment; filename="table_1234.csv"'
+    assert b''.join(response.streaming_content) == b'id,name\n1,a\n'
+    assert exports == [
+        (2, 1234, {'columns': [1, 2], 'order': None, 'filter': None, 'format_': 'csv'})
+    ]
+
+
+@pytest.mark.parametrize('error,expected_status', [
+    (psycopg.errors.InvalidTextRepresentation('invalid input syntax'), 400),
+    (psycopg.errors.UndefinedColumn('column does not exist'), 400),
+    (psycopg.errors.RaiseException('bad filter'), 400),
+    (psycopg.errors.InsufficientPrivilege('permission denied'), 403),
+    (psycopg.errors.UndefinedTable('relation does not exist'), 404),
+])
+def test_export_table_user_errors(rf, monkeypatch, error, expected_status):
+    monkeypatch.setattr(
+        views, 'stream_table_export', lambda *args, **kwargs: _chunks(error=error)
+    )
+    response = views.export_table(_get_request(
+        rf, '/api/export/v0/tables/', database_id=2, table_oid=1234,
+        filter=json.dumps({'type': 'equal'}),
+    ))
+    assert response.status_code == expected_status
+    assert json.loads(response.content) == {'error': str(error)}
+
+
+def test_export_table_other_errors_raise(rf, monkeypatch):
+    monkeypatch.setattr(
+        views, 'stream_table_export',
+        lambda *args, **kwargs: _chunks(error=psycopg.OperationalError('connection lost')),
+    )
+    with pytest.raises(psycopg.OperationalError):
+        views.export_table(_get_request(
+            rf, '/api/export/v0/tables/', database_id=2, table_oid=1234
+        ))
+
+
+def test_export_table_bad_params(rf):
+    response = views.export_table(_get_request(
+        rf, '/api/export/v0/tables/', database_id=2, table_oid=1234, format='xlsx'
+    ))
+    assert response.status_code == 400
+
+
+def test_export_table_requires_login(rf):
+    request = rf.get('/api/export/v0/tables/', {'database_id': 2, 'table_oid': 1234})
+    request.user = AnonymousUser()
+    assert views.export_table(request).status_code == 302
+
+
+def test_export_exploration(rf, monkeypatch):
+    monkeypatch.setattr(
+        views, 'stream_exploration_export',
+        lambda exploration_id, user, format_: _chunks(b'{"a": 1}\n'),
+    )
+    response = views.export_exploration(_get_request(
+        rf, '/api/export/v0/explorations/', exploration_id=5, format='ndjson'
+    ))
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert response['Content-Disposition'] == (
+        'attachment; filename="exploration_5.ndjson"'
+    )
+    assert b''.join(response.streaming_content) == b'{"a": 1}\n'
+
+
+def test_export_exploration_does_not_exist(rf, monkeypatch):
+    monkeypatch.setattr(
+        views, 'stream_exploration_export',
+        lambda *args, **kwargs: _chunks(
+            error=Explorations.DoesNotExist('Explorations matching query does not exist.')
+        ),
+    )
+    response = views.export_exploration(_get_request(
+        rf, '/api/export/v0/explorations/', exploration_id=5
+    ))
+    assert response.status_code == 404
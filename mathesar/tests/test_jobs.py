@@ -0,0 +1,159 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.utils import timezone
+import psycopg
+import pytest
+
+from mathesar.models.base import Job
+from mathesar.models.users import User
+from mathesar.utils import jobs
+
+
+@pytest.fixture
+def job_user():
+    return User.objects.create(username='alice', password='pass1234')
+
+
+@pytest.fixture
+def mock_connect(monkeypatch):
+    @contextmanager
+    def _connect(_database_id, _user):
+        yield SimpleNamespace(info=SimpleNamespace(backend_pid=4321))
+    monkeypatch.setattr(jobs, 'connect', _connect)
+
+
+def _create_job(monkeypatch, job_user, database, job_function, params):
+    monkeypatch.setitem(jobs._job_functions, 'tests.job', job_function)
+    return Job.objects.create(
+        user=job_user, database=database, method='tests.job', params=params
+    )
+
+
+def test_run_job_succeeds(monkeypatch, mock_connect, job_user, test_db_model):
+    def job_function(conn, *, a, b):
+        assert Job.objects.get(method='tests.job').backend_pid == conn.info.backend_pid
+        return {'sum': a + b}
+    job = _create_job(monkeypatch, job_user, test_db_model, job_function, {'a': 1, 'b': 2})
+    jobs.run_job(job.id)
+    job.refresh_from_db()
+    assert job.status == 'succeeded'
+    assert job.result == {'sum': 3}
+    assert job.error is None
+    assert job.backend_pid is None
+    assert job.started_at is not None and job.finished_at is not None
+
+
+def test_run_job_fails(monkeypatch, mock_connect, job_user, test_db_model):
+    def job_function(conn):
+        raise ValueError('bad input')
+    job = _create_job(monkeypatch, job_user, test_db_model, job_function, {})
+    jobs.run_job(job.id)
+    job.refresh_from_db()
+    assert job.status == 'failed'
+    assert job.error['message'] == 'bad input'
+    assert job.error['code'] == jobs.get_error_code(ValueError())
+
+
+def test_run_job_cancelled_while_running(monkeypatch, mock_connect, job_user, test_db_model):
+    def job_function(conn):
+        Job.objects.filter(method='tests.job').update(cancel_requested=True)
+        raise psycopg.errors.QueryCanceled('canceling statement due to user request')
+    job = _create_job(monkeypatch, job_user, test_db_model, job_function, {})
+    jobs.run_job(job.id)
+    job.refresh_from_db()
+    assert job.status == 'cancelled'
+    assert job.error is None
+
+
+def test_cancel_pending_job_skips_run(monkeypatch, mock_connect, job_user, test_db_model):
+    def job_function(conn):
+        raise AssertionError('cancelled job was run')
+    job = _create_job(monkeypatch, job_user, test_db_model, job_function, {})
+    jobs.cancel_job(job)
+    jobs.run_job(job.id)
+    job.refresh_from_db()
+    assert job.status == 'cancelled'
+    assert job.started_at is None
+
+
+def test_submit_job_unregistered_method(job_user, test_db_model):
+    with pytest.raises(ValueError):
+        jobs.submit_job(job_user, test_db_model.id, 'tables.delete', {})
+    assert not Job.objects.exists()
+
+
+def test_claim_job_oldest_first(monkeypatch, job_user, test_db_model):
+    first = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    second = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    assert jobs.claim_job().id == first.id
+    assert jobs.claim_job().id == second.id
+    assert jobs.claim_job() is None
+    first.refresh_from_db()
+    assert first.status == 'running'
+    assert first.heartbeat_at is not None
+
+
+def test_submit_job_leaves_job_pending(monkeypatch, job_user, test_db_model):
+    monkeypatch.setitem(jobs._job_functions, 'tests.job', lambda conn: None)
+    job = jobs.submit_job(job_user, test_db_model.id, 'tests.job', {})
+    job.refresh_from_db()
+    assert job.status == 'pending'
+    assert job.started_at is None
+
+
+def test_fail_orphaned_jobs(monkeypatch, settings, job_user, test_db_model):
+    settings.MATHESAR_JOBS = {**settings.MATHESAR_JOBS, 'HEARTBEAT_TIMEOUT': 60}
+    orphaned = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    alive = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    long_ago = timezone.now() - timedelta(minutes=5)
+    Job.objects.filter(id=orphaned.id).update(
+        status='running', started_at=long_ago, heartbeat_at=long_ago, backend_pid=4321
+    )
+    Job.objects.filter(id=alive.id).update(
+        status='running', started_at=long_ago, heartbeat_at=timezone.now()
+    )
+    assert jobs.fail_orphaned_jobs() == 1
+    orphaned.refresh_from_db()
+    alive.refresh_from_db()
+    assert orphaned.status == 'failed'
+    assert orphaned.backend_pid is None
+    assert orphaned.error['code'] == jobs.get_error_code(jobs.JobWorkerLost())
+    assert alive.status == 'running'
+
+
+def test_cancel_running_job(monkeypatch, job_user, test_db_model):
+    executed = []
+
+    @contextmanager
+    def _connect(_database_id, _user):
+        yield SimpleNamespace(execute=lambda query, params: executed.append(params))
+    monkeypatch.setattr(jobs, 'connect', _connect)
+    job = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    Job.objects.filter(id=job.id).update(status='running', backend_pid=4321)
+    jobs.cancel_job(job)
+    job.refresh_from_db()
+    assert job.cancel_requested
+    assert job.status == 'running'
+    assert executed == [(4321,)]
+
+
+def test_pending_job_stale_without_worker(monkeypatch, settings, job_user, test_db_model):
+    settings.MATHESAR_JOBS = {**settings.MATHESAR_JOBS, 'HEARTBEAT_TIMEOUT': 60}
+    job = _create_job(monkeypatch, job_user, test_db_model, lambda conn: None, {})
+    assert jobs.is_job_stale(job)
+    worker = jobs.register_worker()
+    assert not jobs.is_job_stale(job)
+    jobs.JobWorker.objects.filter(id=worker.id).update(
+        heartbeat_at=timezone.now() - timedelta(minutes=5)
+    )
+    assert jobs.is_job_stale(job)
+    # The worker is recorded again if it comes back.
+    jobs.record_worker_heartbeat(worker)
+    assert not jobs.is_job_stale(job)
+    jobs.unregister_worker(worker)
+    assert jobs.is_job_stale(job)
+    Job.objects.filter(id=job.id).update(status='running')
+    job.refresh_from_db()
+    assert not jobs.is_job_stale(job)
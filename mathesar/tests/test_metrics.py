@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db import connection as db_conn
+from mathesar.utils import metrics
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, '_enabled', True)
+
+
+def test_histogram_render():
+    histogram = metrics.Histogram(
+        'test_duration_seconds', 'Test durations.', ('method',), buckets=(0.1, 1)
+    )
+    histogram.observe(0.05, 'records.list')
+    histogram.observe(0.5, 'records.list')
+    histogram.observe(5, 'records.list')
+    assert histogram.render() == [
+        '# HELP test_duration_seconds Test durations.',
+        '# TYPE test_duration_seconds histogram',
+        'test_duration_seconds_bucket{method="records.list",le="0.1"} 1',
+        'test_duration_seconds_bucket{method="records.list",le="1"} 2',
+        'test_duration_seconds_bucket{method="records.list",le="+Inf"} 3',
+        'test_duration_seconds_sum{method="records.list"} 5.55',
+        'test_duration_seconds_count{method="records.list"} 3',
+    ]
+
+
+def test_counter_render_escapes_labels():
+    counter = metrics.Counter('test_total', 'Test counter.', ('function',))
+    counter.inc(2, 'a"b')
+    counter.inc(3, 'a"b')
+    assert counter.render()[2] == 'test_total{function="a\\"b"} 5'
+
+
+def test_observe_disabled(monkeypatch):
+    histogram = metrics.Histogram('test_seconds', 'Test.', ('method', 'status'))
+    monkeypatch.setattr(metrics, 'RPC_CALL_DURATION', histogram)
+    metrics.observe_rpc_call('tables.list', 0.2, False)
+    assert histogram.render()[2:] == []
+
+
+def test_request_timings(enabled_metrics, monkeypatch):
+    monkeypatch.setattr(
+        metrics, 'RPC_CALL_DURATION', metrics.Histogram('a', 'A.', ('method', 'status'))
+    )
+    monkeypatch.setattr(
+        metrics, 'CONNECTION_ACQUIRE_DURATION', metrics.Histogram('b', 'B.')
+    )
+    with metrics.request_timings() as timings:
+        metrics.observe_rpc_call('tables.list', 0.2, False)
+        metrics.observe_rpc_call('records.list', 0.3, True)
+        metrics.observe_connection_acquire(0.01)
+        timings.count_orm_query(lambda *args: None, 'SELECT 1', None, False, {})
+    assert timings.get_server_timing_header() == (
+        'rpc;dur=500.0, msar;desc="0 calls";dur=0.0, '
+        'conn;desc="Connection acquire";dur=10.0, orm;desc="1 queries"'
+    )
+    # Calls outside of the request aren't added to its timings.
+    metrics.observe_rpc_call('tables.list', 0.2, False)
+    assert timings.rpc == pytest.approx(0.5)
+
+
+def test_observe_msar_call(enabled_metrics, monkeypatch):
+    monkeypatch.setattr(
+        metrics, 'MSAR_ROWS_RETURNED', metrics.Counter('r', 'R.', ('function',))
+    )
+    monkeypatch.setattr(
+        metrics, 'MSAR_BYTES_RETURNED', metrics.Counter('b', 'B.', ('function',))
+    )
+    monkeypatch.setattr(
+        metrics, 'MSAR_CALL_DURATION', metrics.Histogram('d', 'D.', ('function',))
+    )
+    lengths = [[3, 4], [5, 6]]
+    cursor = SimpleNamespace(pgresult=SimpleNamespace(
+        ntuples=2, nfields=2, get_length=lambda row, col: lengths[row][col]
+    ))
+    conn = SimpleNamespace(execute=lambda query, args: cursor)
+    monkeypatch.setattr(db_conn, '_msar_call_observer', metrics.observe_msar_call)
+    with metrics.request_timings() as timings:
+        assert db_conn.exec_msar_func(conn, 'get_roles') is cursor
+    assert metrics.MSAR_ROWS_RETURNED.render()[2] == 'r{function="get_roles"} 2'
+    assert metrics.MSAR_BYTES_RETURNED.render()[2] == 'b{function="get_roles"} 18'
+    assert timings.msar_calls == 1
+
+
+def test_render_adds_shared_metrics(monkeypatch, tmp_path):
+    counter = metrics.Counter('c', 'C.', ('function',))
+    histogram = metrics.Histogram('h', 'H.', buckets=(1,))
+    monkeypatch.setattr(metrics, 'METRICS', (counter, histogram))
+    monkeypatch.setattr(metrics, '_get_share_dir', lambda: str(tmp_path))
+    counter.inc(2, 'get_roles')
+    histogram.observe(0.5)
+    # Shared by another process of the server.
+    (tmp_path / '1.json').write_text(
+        '{"c": [[["get_roles"], 3], [["get_schemas"], 1]], "h": [[[], [0, 4.0, 2]]]}'
+    )
+    # This process's own shared metrics are superseded by its live ones.
+    metrics._share()
+    assert metrics.render().splitlines() == [
+        '# HELP c C.',
+        '# TYPE c counter',
+        'c{function="get_roles"} 5',
+        'c{function="get_schemas"} 1',
+        '# HELP h H.',
+        '# TYPE h histogram',
+        'h_bucket{le="1"} 1',
+        'h_bucket{le="+Inf"} 3',
+        'h_sum 4.5',
+        'h_count 3',
+    ]
@@ -0,0 +1,29 @@
+from mathesar.models.base import RecordCountVersion
+from mathesar.models.users import User
+from mathesar.utils import record_counts
+
+
+def test_invalidate_cached_counts(database_model):
+    user = User.objects.create(username='alice', password='pass1234')
+    count_key = record_counts.get_count_key(database_model.id, 2254329, user, None)
+    record_counts.set_cached_count(count_key, 42)
+    assert record_counts.get_cached_count(count_key) == 42
+
+    record_counts.invalidate_cached_counts(database_model.id, 2254329)
+    record_counts.invalidate_cached_counts(database_model.id, 2254329)
+
+    assert RecordCountVersion.objects.get(
+        database=database_model, table_oid=2254329
+    ).version == 2
+    new_count_key = record_counts.get_count_key(database_model.id, 2254329, user, None)
+    assert new_count_key != count_key
+    assert record_counts.get_cached_count(new_count_key) is None
+
+
+def test_count_key_depends_on_filter(database_model):
+    user = User.objects.create(username='alice', password='pass1234')
+    filter = {"type": "equal", "args": [{"type": "attnum", "value": 2}, {"type": "literal", "value": 1}]}
+    assert (
+        record_counts.get_count_key(database_model.id, 2254329, user, filter)
+        != record_counts.get_count_key(database_model.id, 2254329, user, None)
+    )
@@ -0,0 +1,148 @@
+from contextlib import nullcontext
+import time
+
+import psycopg
+import pytest
+
+from mathesar.models.base import SlowCall
+from mathesar.models.users import User
+from mathesar.utils import slow_calls
+
+
+class _MockConnection:
+    def __init__(self):
+        self.queries = []
+
+    def transaction(self):
+        return nullcontext()
+
+    def execute(self, query, params=None):
+        self.queries.append((query.as_string(None), params))
+        return self
+
+    def fetchone(self):
+        return [[{'Plan': {'Node Type': 'Seq Scan'}}]]
+
+
+@pytest.fixture
+def slow_call_log(settings):
+    settings.MATHESAR_SLOW_CALL_LOG = {'THRESHOLD': 0.5, 'MAX_ENTRIES': 2}
+
+
+def test_redact_literals():
+    params = {
+        'filter': {
+            'type': 'and',
+            'args': [
+                {'type': 'equal', 'args': [
+                    {'type': 'attnum', 'value': 2}, {'type': 'literal', 'value': 'secret'}
+                ]},
+                {'type': 'null', 'args': [{'type': 'attnum', 'value': 3}]},
+            ]
+        },
+        'search_params': [{'attnum': 2, 'literal': 'secret'}],
+    }
+    assert slow_calls.redact_literals(params) == {
+        'filter': {
+            'type': 'and',
+            'args': [
+                {'type': 'equal', 'args': [
+                    {'type': 'attnum', 'value': 2}, {'type': 'literal', 'value': '<redacted>'}
+                ]},
+                {'type': 'null', 'args': [{'type': 'attnum', 'value': 3}]},
+            ]
+        },
+        'search_params': [{'attnum': 2, 'literal': '<redacted>'}],
+    }
+
+
+def test_log_if_slow_skips_fast_calls(slow_call_log, test_db_model):
+    conn = _MockConnection()
+    slow_calls.log_if_slow(
+        conn, start=time.perf_counter(), method='records.list',
+        database_id=test_db_model.id, user=None, params={}, sql='SELECT 1'
+    )
+    assert conn.queries == []
+    assert not SlowCall.objects.exists()
+
+
+def test_log_if_slow(slow_call_log, test_db_model):
+    user = User.objects.create(username='alice', password='pass1234')
+    conn = _MockConnection()
+    slow_calls.log_if_slow(
+        conn,
+        start=time.perf_counter() - 1,
+        method='records.search',
+        database_id=test_db_model.id,
+        user=user,
+        params={'table_oid': 1234, 'search_params': [{'attnum': 2, 'literal': 'x'}]},
+        sql=lambda: ('SELECT * FROM t WHERE a = %(param_1)s', {'param_1': 'x'}),
+    )
+    assert conn.queries == [
+        ('EXPLAIN (FORMAT JSON) SELECT * FROM t WHERE a = %(param_1)s', {'param_1': 'x'})
+    ]
+    slow_call = SlowCall.objects.get()
+    assert slow_call.user == user
+    assert slow_call.duration >= 1
+    assert slow_call.params == {
+        'table_oid': 1234, 'search_params': [{'attnum': 2, 'literal': '<redacted>'}]
+    }
+    assert slow_call.sql == 'SELECT * FROM t WHERE a = %(param_1)s'
+    assert slow_call.plan == [{'Plan': {'Node Type': 'Seq Scan'}}]
+
+
+def test_log_if_slow_keeps_latest_entries(slow_call_log, test_db_model):
+    for i in range(4):
+        slow_calls.log_if_slow(
+            _MockConnection(), start=time.perf_counter() - 1, method='records.list',
+            database_id=test_db_model.id, user=None, params={'offset': i}, sql='SELECT 1'
+        )
+    assert [c.params['offset'] for c in slow_calls.list_slow_calls()] == [3, 2]
+
+
+def test_redact_sql_literals():
+    sql = """SELECT "it's" FROM t WHERE a = 'o''neil'::text AND b = E'x\\'y' LIMIT '10'"""
+    assert slow_calls.redact_sql_literals(sql) == (
+        """SELECT "it's" FROM t WHERE a = '<redacted>'::text AND b = '<redacted>'"""
+        """ LIMIT '<redacted>'"""
+    )
+    plan = [{'Plan': {'Filter': "(a = 'secret'::text)", 'Plans': [{'Rows': 3}]}}]
+    assert slow_calls.redact_sql_literals(plan) == [
+        {'Plan': {'Filter': "(a = '<redacted>'::text)", 'Plans': [{'Rows': 3}]}}
+    ]
+
+
+def test_log_if_slow_redacts_sql_literals(slow_call_log, test_db_model):
+    conn = _MockConnection()
+    slow_calls.log_if_slow(
+        conn, start=time.perf_counter() - 1, method='records.list',
+        database_id=test_db_model.id, user=None, params={},
+        sql="SELECT * FROM t WHERE a = 'secret'",
+    )
+    # The query is explained as it ran, but logged redacted.
+    assert conn.queries == [("EXPLAIN (FORMAT JSON) SELECT * FROM t WHERE a = 'secret'", None)]
+    assert SlowCall.objects.get().sql == "SELECT * FROM t WHERE a = '<redacted>'"
+
+
+def test_log_if_cancelled_while_slow(slow_call_log, test_db_model):
+    conn = _MockConnection()
+    with pytest.raises(psycopg.errors.QueryCanceled):
+        with slow_calls.log_if_cancelled_while_slow(
+            conn, start=time.perf_counter() - 1, method='records.list',
+            database_id=test_db_model.id, user=None, params={},
+            sql=lambda: ('SELECT 1', None),
+        ):
+            raise psycopg.errors.QueryCanceled()
+    assert conn.queries == [('EXPLAIN (FORMAT JSON) SELECT 1', None)]
+    assert SlowCall.objects.get().sql == 'SELECT 1'
+
+
+def test_log_if_cancelled_while_slow_ignores_other_errors(slow_call_log, test_db_model):
+    with pytest.raises(ValueError):
+        with slow_calls.log_if_cancelled_while_slow(
+            _MockConnection(), start=time.perf_counter() - 1, method='records.list',
+            database_id=test_db_model.id, user=None, params={},
+            sql=lambda: ('SELECT 1', None),
+        ):
+            raise ValueError()
+    assert not SlowCall.objects.exists()
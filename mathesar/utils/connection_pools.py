@@ -0,0 +1,140 @@
+"""
+Pooled psycopg connections to user databases.
+
+Pools are keyed by (server, database, configured role). Each pool also
+remembers the connection parameters it was built with, so a pool whose
+server host/port or role password changed (possibly in another worker
+process) is replaced the next time it's requested.
+"""
+from contextlib import contextmanager
+import threading
+
+from django.conf import settings
+from psycopg_pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool_settings():
+    return settings.MATHESAR_CONNECTION_POOL
+
+
+def _get_pool_key(user_database_role):
+    return (
+        user_database_role.server_id,
+        user_database_role.database_id,
+        user_database_role.configured_role_id,
+    )
+
+
+def _get_conn_kwargs(user_database_role):
+    return dict(
+        host=user_database_role.server.host,
+        port=user_database_role.server.port,
+        dbname=user_database_role.database.name,
+        user=user_database_role.configured_role.name,
+        password=user_database_role.configured_role.password,
+    )
+
+
+def _reset_connection(conn):
+    # Some callers (e.g., dropping a database) flip autocommit on.
+    conn.autocommit = False
+
+
+def _create_pool(key, conn_kwargs):
+    pool_settings = _get_pool_settings()
+    return ConnectionPool(
+        kwargs=conn_kwargs,
+        min_size=pool_settings['MIN_SIZE'],
+        max_size=pool_settings['MAX_SIZE'],
+        max_idle=pool_settings['MAX_IDLE'],
+        timeout=pool_settings['TIMEOUT'],
+        check=ConnectionPool.check_connection,
+        reset=_reset_connection,
+        name='_'.join(str(k) for k in key),
+        open=True,
+    )
+
+
+def get_pool(user_database_role):
+    """
+    Get (or create) the pool for the given UserDatabaseRoleMap.
+
+    Args:
+        user_database_role: A UserDatabaseRoleMap model instance.
+    """
+    key = _get_pool_key(user_database_role)
+    conn_kwargs = _get_conn_kwargs(user_database_role)
+    stale_pool = None
+    with _pools_lock:
+        pool_kwargs, pool = _pools.get(key, (None, None))
+        if pool_kwargs != conn_kwargs:
+            stale_pool = pool
+            pool = _create_pool(key, conn_kwargs)
+            _pools[key] = (conn_kwargs, pool)
+    if stale_pool is not None:
+        stale_pool.close()
+    return pool
+
+
+@contextmanager
+def pooled_connection(user_database_role):
+    """
+    Borrow a connection from the pool for the given UserDatabaseRoleMap.
+
+    This behaves like using a psycopg connection as a context manager:
+    the transaction is committed on success and rolled back on error.
+    The connection is returned to the pool rather than closed.
+
+    Args:
+        user_database_role: A UserDatabaseRoleMap model instance.
+    """
+    pool = get_pool(user_database_role)
+    conn = pool.getconn()
+    try:
+        yield conn
+    except BaseException:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    else:
+        conn.commit()
+    finally:
+        pool.putconn(conn)
+
+
+def invalidate_pools(server_id=None, database_id=None, role_id=None):
+    """
+    Close and forget every pool matching all of the given ids.
+
+    Args:
+        server_id: The Django id of a Server.
+        database_id: The Django id of a Database.
+        role_id: The Django id of a ConfiguredRole.
+    """
+    def _matches(key):
+        return all(
+            target is None or target == actual
+            for target, actual in zip((server_id, database_id, role_id), key)
+        )
+
+    with _pools_lock:
+        stale_keys = [key for key in _pools if _matches(key)]
+        stale_pools = [_pools.pop(key)[1] for key in stale_keys]
+    for pool in stale_pools:
+        pool.close()
+
+
+def get_pool_stats():
+    """
+    Return statistics for each open pool, keyed by pool name.
+
+    The counters include `requests_waiting`, `requests_wait_ms`,
+    `requests_num` and `pool_size`, among others. Counters are reset
+    after being read.
+    """
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+    return {pool.name: pool.pop_stats() for pool in pools}
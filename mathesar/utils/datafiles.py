@@ -16,7 +16,8 @@ from mathesar.imports.json import is_valid_json, validate_json_format
 from mathesar.models.deprecated import DataFile
 
 
-ALLOWED_FILE_FORMATS = ['csv', 'tsv', 'json', 'xls', 'xlsx', 'xlsm', 'xlsb', 'odf', 'ods', 'odt']
+ALLOWED_FILE_FORMATS = ['csv', 'tsv', 'json', 'ndjson', 'jsonl', 'xls', 'xlsx', 'xlsm', 'xlsb', 'odf', 'ods', 'odt']
+NDJSON_FILE_EXTENSIONS = ['ndjson', 'jsonl']
 
 
 def _download_datafile(url):
@@ -41,7 +42,7 @@ def _get_file_type(raw_file):
     Algorithm:
     1.  Get file extension using 'os' library.
     2.  If the file extension is in ALLOWED_FILE_FORMATS then return file type
-        as 'csv', 'tsv', 'json' or 'excel'.
+        as 'csv', 'tsv', 'json' or 'excel'. NDJSON files have the 'json' type.
     3.  If the file does not have an extension or does not have an allowed one,
         we check for the file type using brute force approach. Similar case can
         also arise when we download a file from an URL and it does not have a
@@ -55,6 +56,8 @@ def _get_file_type(raw_file):
     if file_extension in ALLOWED_FILE_FORMATS:
         if file_extension in ['csv', 'tsv', 'json']:
             return file_extension
+        elif file_extension in NDJSON_FILE_EXTENSIONS:
+            return 'json'
         else:
             return 'excel'
 
@@ -0,0 +1,101 @@
+"""
+Shared SQLAlchemy state for running explorations.
+
+Running an exploration needs an SQLAlchemy engine and reflected table
+metadata. Creating those from scratch on every call means a new
+connection pool per request, and reflecting every involved table again.
+
+Instead, we keep one context per (host, port, database, role), holding an
+engine and a MetaData object that are reused across requests. A context
+is rebuilt if the role's password changes, and its metadata is dropped
+whenever the database's catalog version (see msar.get_catalog_version)
+changes, i.e., after any DDL. If the catalog version isn't available
+(e.g., the event trigger bumping it couldn't be installed), or DDL is
+still being run (see msar.get_settled_catalog_version), metadata is not
+reused.
+
+Reflecting tables into a MetaData object isn't thread-safe, and calls in
+a batch request may run in several threads. So, a context may only be
+used within the `get_exploration_context` block, which holds its lock.
+Relations built from its metadata may be queried after the block, since
+reflected tables aren't changed afterwards: stale metadata is replaced,
+not cleared.
+"""
+from contextlib import contextmanager
+import threading
+
+from db.connection import exec_msar_func
+from db.engine import create_future_engine_with_custom_types
+from db.metadata import get_empty_metadata
+
+_contexts = {}
+_contexts_lock = threading.Lock()
+
+
+class ExplorationContext:
+    def __init__(self, engine, password):
+        self.engine = engine
+        self.password = password
+        self.metadata = get_empty_metadata()
+        self.catalog_version = None
+        self.lock = threading.RLock()
+
+    @property
+    def keep_existing(self):
+        """Whether tables already reflected into the metadata may be reused."""
+        return self.catalog_version is not None
+
+
+def _get_context_key(conn):
+    return (conn.info.host, conn.info.port, conn.info.dbname, conn.info.user)
+
+
+def _get_catalog_version(conn):
+    return exec_msar_func(conn, 'get_settled_catalog_version').fetchone()[0]
+
+
+@contextmanager
+def get_exploration_context(conn):
+    """
+    Get the ExplorationContext for the database and role of `conn`.
+
+    The context's lock is held within the block, and its metadata is valid
+    for the state of the database catalog at the start of the block.
+
+    Args:
+        conn: A psycopg connection to the user database.
+    """
+    key = _get_context_key(conn)
+    password = conn.info.password
+    catalog_version = _get_catalog_version(conn)
+    stale_engine = None
+    with _contexts_lock:
+        context = _contexts.get(key)
+        if context is None or context.password != password:
+            stale_engine = context.engine if context is not None else None
+            context = ExplorationContext(
+                create_future_engine_with_custom_types(
+                    conn.info.user, password, conn.info.host,
+                    conn.info.dbname, conn.info.port
+                ),
+                password,
+            )
+            _contexts[key] = context
+    if stale_engine is not None:
+        stale_engine.dispose()
+    # Not taken while holding `_contexts_lock`, since the holder of a
+    # context's lock may get another context.
+    with context.lock:
+        if catalog_version is None or catalog_version != context.catalog_version:
+            context.metadata = get_empty_metadata()
+            context.catalog_version = catalog_version
+        yield context
+
+
+def clear_exploration_contexts():
+    """Dispose of every cached engine, and forget all reflected metadata."""
+    with _contexts_lock:
+        contexts = list(_contexts.values())
+        _contexts.clear()
+    for context in contexts:
+        context.engine.dispose()
@@ -1,13 +1,14 @@
-from db.engine import create_future_engine_with_custom_types
-from db.records.operations.select import get_count
+from db.columns.operations.select import get_map_of_attnum_and_table_oid_to_column_name
+from db.records.operations.export import get_relation_export_query
+from db.records.operations.select import get_count, get_records, get_records_with_count
 from db.queries.base import DBQuery, InitialColumn, JoinParameter
 from db.queries.operations.process import get_transforms_with_summarizes_speced
-from db.tables.operations.select import get_table
+from db.tables.operations.select import get_map_of_table_oid_to_schema_name_and_table_name
 from db.transforms.operations.deserialize import deserialize_transformation
 from mathesar.api.utils import process_annotated_records
 from mathesar.models.base import Explorations, ColumnMetaData, Database
 from mathesar.rpc.columns.metadata import ColumnMetaDataRecord
-from mathesar.state import get_cached_metadata
+from mathesar.utils.exploration_context import get_exploration_context
 
 
 def list_explorations(database_id, schema_oid=None):
@@ -53,15 +54,7 @@ def create_exploration(exploration_def):
     )
 
 
-def run_exploration(exploration_def, conn, limit=100, offset=0):
-    engine = create_future_engine_with_custom_types(
-        conn.info.user,
-        conn.info.password,
-        conn.info.host,
-        conn.info.dbname,
-        conn.info.port
-    )
-    metadata = get_cached_metadata()
+def _get_exploration_db_query(exploration_def, engine, metadata, keep_existing):
     base_table_oid = exploration_def["base_table_oid"]
     initial_columns = exploration_def['initial_columns']
     processed_initial_columns = []
@@ -94,83 +87,187 @@ def run_exploration(exploration_def, conn, limit=100, offset=0):
         engine=engine,
         transformations=transformations,
         name=None,
-        metadata=metadata
+        metadata=metadata,
+        keep_existing=keep_existing,
     )
     transformations = get_transforms_with_summarizes_speced(db_query, engine, metadata)
     db_query.transformations = transformations
-    records = db_query.get_records(
-        limit=limit,
-        offset=offset
-    )
+    return db_query, processed_initial_columns
+
+
+def run_exploration(exploration_def, conn, limit=100, offset=0, count_mode="exact"):
+    # The context's lock is only held while reflecting into its metadata
+    # and building the query, so that explorations run by the same role
+    # don't wait for each other's records.
+    with get_exploration_context(conn) as context:
+        engine = context.engine
+        db_query, processed_initial_columns = _get_exploration_db_query(
+            exploration_def, engine, context.metadata, context.keep_existing
+        )
+        relation = db_query.transformed_relation
+        fallback_to_default_ordering = not db_query._is_sorting_transform_used
+        columns_info = _get_exploration_columns_info(
+            processed_initial_columns, db_query, engine, context.metadata
+        )
+    count_filter = exploration_def.get('filter', None)
+    if count_filter is None:
+        records, count = get_records_with_count(
+            table=relation,
+            engine=engine,
+            limit=limit,
+            offset=offset,
+            fallback_to_default_ordering=fallback_to_default_ordering,
+            count_mode=count_mode,
+        )
+    else:
+        # The filter only applies to the count, so it needs its own query.
+        records = get_records(
+            table=relation,
+            engine=engine,
+            limit=limit,
+            offset=offset,
+            fallback_to_default_ordering=fallback_to_default_ordering,
+        )
+        count = get_count(
+            table=relation,
+            engine=engine,
+            filter=count_filter,
+            count_mode=count_mode,
+        )
     processed_records = process_annotated_records(records)[0]
     column_metadata = _get_exploration_column_metadata(
-        exploration_def,
-        processed_initial_columns,
-        db_query,
-        conn,
-        engine,
-        metadata
+        exploration_def, processed_initial_columns, columns_info
     )
     return {
         "query": exploration_def,
         "records": {
-            "count": get_count(
-                table=db_query.transformed_relation,
-                engine=engine,
-                filter=exploration_def.get('filter', None)
-            ),
+            "count": count,
             "results": processed_records
         },
-        "output_columns": tuple(sa_col.name for sa_col in db_query.sa_output_columns),
+        "output_columns": tuple(sa_col.name for sa_col in relation.columns),
         "column_metadata": column_metadata,
         "limit": limit,
         "offset": offset
     }
 
 
-def run_saved_exploration(exp_model, limit, offset, conn):
-    exploration_def = {
+def run_saved_exploration(exp_model, limit, offset, conn, count_mode="exact"):
+    exploration_def = _get_saved_exploration_def(exp_model)
+    return run_exploration(exploration_def, conn, limit, offset, count_mode)
+
+
+def get_exploration_export_query(exploration_def, conn, as_json=False):
+    """
+    Get a query giving all result rows of an exploration, for export.
+
+    Returns:
+        A (query, params) tuple, as from get_relation_export_query.
+    """
+    with get_exploration_context(conn) as context:
+        db_query, _ = _get_exploration_db_query(
+            exploration_def, context.engine, context.metadata, context.keep_existing
+        )
+        return get_relation_export_query(
+            db_query.ordered_relation, context.engine, as_json=as_json
+        )
+
+
+def get_exploration_page_query(exploration_def, conn, limit=100, offset=0):
+    """
+    Get a query giving a page of result rows of an exploration.
+
+    Returns:
+        A (query, params) tuple, as from get_relation_export_query.
+    """
+    query, params = get_exploration_export_query(exploration_def, conn)
+    limit = 'ALL' if limit is None else int(limit)
+    return f"{query}\nLIMIT {limit} OFFSET {int(offset or 0)}", params
+
+
+def get_saved_exploration_export_query(exp_model, conn, as_json=False):
+    return get_exploration_export_query(
+        _get_saved_exploration_def(exp_model), conn, as_json=as_json
+    )
+
+
+def _get_saved_exploration_def(exp_model):
+    return {
         "database_id": exp_model.database.id,
         "base_table_oid": exp_model.base_table_oid,
         "initial_columns": exp_model.initial_columns,
         "display_names": exp_model.display_names,
         "transformations": exp_model.transformations,
     }
-    return run_exploration(exploration_def, conn, limit, offset)
 
 
-def _get_exploration_column_metadata(
-    exploration_def,
-    processed_initial_columns,
-    db_query,
-    conn,
-    engine,
-    metadata
-):
-    exploration_column_metadata = {}
+def _get_exploration_columns_info(processed_initial_columns, db_query, engine, metadata):
+    """
+    Describe each column of an exploration, except for its Django metadata.
+
+    This reflects into `metadata`, so the exploration context's lock must
+    be held.
+    """
+    initial_columns_by_alias = {col.alias: col for col in processed_initial_columns}
+    table_oids = list({col.reloid for col in processed_initial_columns})
+    # Look up the names of all initial columns at once, rather than once
+    # per output column.
+    table_names = {
+        table_oid: table_name
+        for table_oid, (_, table_name)
+        in get_map_of_table_oid_to_schema_name_and_table_name(
+            table_oids, engine, metadata
+        ).items()
+    }
+    column_names = get_map_of_attnum_and_table_oid_to_column_name(
+        table_oids, engine, metadata
+    ) if table_oids else {}
+    columns_info = {}
     for alias, sa_col in db_query.all_sa_columns_map.items():
-        initial_column = None
-        for col in processed_initial_columns:
-            if alias == col.alias:
-                initial_column = col
-        column_metadata = ColumnMetaData.objects.filter(
-            database__id=exploration_def["database_id"],
-            table_oid=initial_column.reloid,
-            attnum=sa_col.column_attnum
-        ).first() if initial_column else None
-        input_table_name = get_table(initial_column.reloid, conn)["name"] if initial_column else None
-        input_column_name = initial_column.get_name(engine, metadata) if initial_column else None
-        display_names = exploration_def.get("display_names", None)
-        exploration_column_metadata[alias] = {
+        initial_column = initial_columns_by_alias.get(alias)
+        columns_info[alias] = {
             "alias": alias,
-            "display_name": display_names.get(alias) if display_names is not None else None,
             "type": sa_col.db_type.id,
             "type_options": sa_col.type_options,
-            "metadata": ColumnMetaDataRecord.from_model(column_metadata) if column_metadata else None,
             "is_initial_column": True if initial_column else False,
-            "input_column_name": input_column_name,
-            "input_table_name": input_table_name,
+            "input_column_name": column_names.get(
+                (initial_column.attnum, initial_column.reloid)
+            ) if initial_column else None,
+            "input_table_name": table_names.get(initial_column.reloid) if initial_column else None,
             "input_table_id": initial_column.reloid if initial_column else None,
             "input_alias": db_query.get_input_alias_for_output_alias(alias)
         }
+    return columns_info
+
+
+def _get_exploration_column_metadata(exploration_def, processed_initial_columns, columns_info):
+    initial_columns_by_alias = {col.alias: col for col in processed_initial_columns}
+    # Look up the metadata of all initial columns at once, rather than once
+    # per output column.
+    column_metadata_models = {
+        (col_meta.table_oid, col_meta.attnum): col_meta
+        for col_meta in ColumnMetaData.objects.filter(
+            database__id=exploration_def["database_id"],
+            table_oid__in={col.reloid for col in processed_initial_columns},
+            attnum__in={col.attnum for col in processed_initial_columns},
+        )
+    }
+    display_names = exploration_def.get("display_names", None)
+    exploration_column_metadata = {}
+    for alias, column_info in columns_info.items():
+        initial_column = initial_columns_by_alias.get(alias)
+        column_metadata = column_metadata_models.get(
+            (initial_column.reloid, initial_column.attnum)
+        ) if initial_column else None
+        exploration_column_metadata[alias] = {
+            "alias": alias,
+            "display_name": display_names.get(alias) if display_names is not None else None,
+            "type": column_info["type"],
+            "type_options": column_info["type_options"],
+            "metadata": ColumnMetaDataRecord.from_model(column_metadata) if column_metadata else None,
+            "is_initial_column": column_info["is_initial_column"],
+            "input_column_name": column_info["input_column_name"],
+            "input_table_name": column_info["input_table_name"],
+            "input_table_id": column_info["input_table_id"],
+            "input_alias": column_info["input_alias"],
+        }
     return exploration_column_metadata
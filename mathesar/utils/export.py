@@ -0,0 +1,59 @@
+"""
+Streaming exports of tables and explorations.
+
+Each export is a generator of bytes chunks, holding a database connection
+open for as long as it's being consumed.
+"""
+from db.records.operations.export import (
+    get_copy_statement, get_table_export_query, stream_copy
+)
+from mathesar.models.base import Explorations
+from mathesar.rpc.utils import connect
+from mathesar.utils.explorations import get_saved_exploration_export_query
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def stream_table_export(
+        database_id, user, table_oid, columns=None, order=None, filter=None,
+        format_="csv"
+):
+    """
+    Yield the rows of a table in the given format.
+
+    Args:
+        database_id: The Django id of the database containing the table.
+        user: The user whose role will be used to read the table.
+        table_oid: The OID of the table to export.
+        columns: A list of the attnums of the columns to export.
+        order: An array of ordering definition objects.
+        filter: An array of filter definition objects.
+        format_: One of "csv", "tsv" or "ndjson".
+    """
+    with connect(database_id, user) as conn:
+        query = get_table_export_query(
+            conn, table_oid, columns=columns, order=order, filter=filter,
+            as_json=format_ == "ndjson",
+        )
+        yield from stream_copy(conn, get_copy_statement(query, format_))
+
+
+def stream_exploration_export(exploration_id, user, format_="csv"):
+    """
+    Yield the result rows of a saved exploration in the given format.
+
+    Args:
+        exploration_id: The Django id of the exploration to export.
+        user: The user whose role will be used to run the exploration.
+        format_: One of "csv", "tsv" or "ndjson".
+    """
+    exp_model = Explorations.objects.get(id=exploration_id)
+    with connect(exp_model.database.id, user) as conn:
+        query, params = get_saved_exploration_export_query(
+            exp_model, conn, as_json=format_ == "ndjson"
+        )
+        yield from stream_copy(conn, get_copy_statement(query, format_), params)
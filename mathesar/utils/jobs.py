@@ -0,0 +1,364 @@
+"""
+Background jobs for long-running RPC method calls.
+
+Some RPC methods (e.g., imports and DDL on big tables) can take longer
+than a client is willing to wait on a single request. Such methods
+register a job function here, and can then be submitted as a `Job`. Jobs
+are run by worker processes (`manage.py run_job_worker`), separate from
+the web server's, each running a few jobs at a time in threads. The
+client polls the job for its status, progress, and result, and may cancel
+it while it's running.
+
+A job function is called with a database connection and the job's
+params, and must return something JSON serializable. While it runs, the
+backend PID of its connection is stored on the job, so that other
+requests can report progress of (and cancel) the query it's running.
+
+Workers claim pending jobs with `SELECT ... FOR UPDATE SKIP LOCKED`, so
+several of them can run side by side, and they regularly record a
+heartbeat on the jobs they run. Running jobs whose heartbeat stops (e.g.,
+because their worker was killed) are marked as failed. Workers also record
+a heartbeat of their own, so that pending jobs can be reported as stale
+when no worker is around to run them.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import logging
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+import psycopg
+
+from mathesar.models.base import Job, JobWorker
+from mathesar.rpc.exceptions.error_codes import get_error_code
+from mathesar.rpc.utils import connect, statement_timeout_context
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_job_functions = {}
+
+
+class JobWorkerLost(Exception):
+    pass
+
+
+def register_job(name):
+    """
+    Register the decorated function as the job run for `name`.
+
+    The name should be the name of the RPC method that submits the job.
+    """
+    def decorator(func):
+        _job_functions[name] = func
+        return func
+    return decorator
+
+
+def submit_job(user, database_id, method, params):
+    """
+    Create a pending job, to be run by a job worker.
+
+    Args:
+        user: The user submitting the job. The job connects as this user.
+        database_id: The Django id of the database the job runs on.
+        method: The name of a registered job.
+        params: A dict of keyword arguments for the job function.
+
+    Returns:
+        The new Job.
+    """
+    if method not in _job_functions:
+        raise ValueError(f"{method} can't be run as a background job")
+    return Job.objects.create(
+        user=user, database_id=database_id, method=method, params=params
+    )
+
+
+def claim_job(job_id=None):
+    """
+    Mark the oldest pending job (or the given one) as running.
+
+    Jobs being claimed by other workers are skipped.
+
+    Returns:
+        The claimed Job, or None if there's no pending job to claim.
+    """
+    with transaction.atomic():
+        pending_jobs = Job.objects.select_for_update(skip_locked=True).filter(
+            status=PENDING
+        )
+        if job_id is not None:
+            pending_jobs = pending_jobs.filter(id=job_id)
+        job = pending_jobs.order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        now = timezone.now()
+        Job.objects.filter(id=job.id).update(
+            status=RUNNING, started_at=now, heartbeat_at=now
+        )
+    return Job.objects.select_related('user').get(id=job.id)
+
+
+def run_job(job_id):
+    """
+    Claim a pending job, and run it to completion in this thread.
+
+    Does nothing if the job isn't pending (e.g., if it was cancelled, or
+    claimed by a worker).
+    """
+    job = claim_job(job_id)
+    if job is not None:
+        _run_claimed_job(job)
+
+
+def _run_claimed_job(job):
+    try:
+        try:
+            with statement_timeout_context('JOBS'), connect(job.database_id, job.user) as conn:
+                _set_backend_pid(job, conn.info.backend_pid)
+                try:
+                    result = _job_functions[job.method](conn, **job.params)
+                finally:
+                    # Cleared before the connection is released (e.g., back
+                    # to the pool), so that `cancel_job` can't cancel a query
+                    # of its next user.
+                    _set_backend_pid(job, None)
+        except Exception as e:
+            job.refresh_from_db(fields=['cancel_requested'])
+            if job.cancel_requested and isinstance(e, psycopg.errors.QueryCanceled):
+                _finish_job(job, CANCELLED)
+            else:
+                _finish_job(
+                    job, FAILED, error={'code': get_error_code(e), 'message': str(e)}
+                )
+        else:
+            _finish_job(job, SUCCEEDED, result=result)
+    finally:
+        # Worker threads get their own Django connection, which would
+        # otherwise stay open after the job.
+        close_old_connections()
+
+
+def _set_backend_pid(job, backend_pid):
+    # Waits for any `cancel_job` holding the job's row lock.
+    Job.objects.filter(id=job.id).update(backend_pid=backend_pid)
+    job.backend_pid = backend_pid
+
+
+def _finish_job(job, status, result=None, error=None):
+    Job.objects.filter(id=job.id).update(
+        status=status,
+        result=result,
+        error=error,
+        backend_pid=None,
+        finished_at=timezone.now(),
+    )
+
+
+def record_heartbeat(job_ids):
+    """Record that the running jobs with the given ids are still alive."""
+    Job.objects.filter(id__in=job_ids, status=RUNNING).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+def fail_orphaned_jobs():
+    """
+    Mark running jobs whose heartbeat stopped as failed.
+
+    Returns:
+        The number of jobs marked as failed.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.MATHESAR_JOBS['HEARTBEAT_TIMEOUT']
+    )
+    error = JobWorkerLost("The worker running the job stopped before it finished")
+    return Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff)
+        | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=RUNNING,
+    ).update(
+        status=FAILED,
+        error={'code': get_error_code(error), 'message': str(error)},
+        backend_pid=None,
+        finished_at=timezone.now(),
+    )
+
+
+def register_worker():
+    """Record a new running worker process, returning its JobWorker."""
+    return JobWorker.objects.create(
+        hostname=socket.gethostname(), pid=os.getpid(), heartbeat_at=timezone.now()
+    )
+
+
+def record_worker_heartbeat(worker):
+    """
+    Record that the worker is still alive.
+
+    Workers whose heartbeat stopped are forgotten. If that was this worker
+    (e.g., the process was suspended for a while), it's recorded again.
+    """
+    now = timezone.now()
+    JobWorker.objects.update_or_create(
+        id=worker.id,
+        defaults={'hostname': worker.hostname, 'pid': worker.pid, 'heartbeat_at': now},
+    )
+    JobWorker.objects.filter(
+        heartbeat_at__lt=now - timedelta(seconds=settings.MATHESAR_JOBS['HEARTBEAT_TIMEOUT'])
+    ).delete()
+
+
+def unregister_worker(worker):
+    JobWorker.objects.filter(id=worker.id).delete()
+
+
+def has_live_worker():
+    """Return whether any worker has recorded a heartbeat recently."""
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.MATHESAR_JOBS['HEARTBEAT_TIMEOUT']
+    )
+    return JobWorker.objects.filter(heartbeat_at__gte=cutoff).exists()
+
+
+def run_worker(stop):
+    """
+    Claim and run pending jobs until `stop` is set.
+
+    Up to `MATHESAR_JOBS['WORKERS']` jobs run at a time, in threads. Jobs
+    running when `stop` is set are run to completion.
+
+    Args:
+        stop: A `threading.Event`.
+    """
+    max_jobs = settings.MATHESAR_JOBS['WORKERS']
+    poll_interval = settings.MATHESAR_JOBS['POLL_INTERVAL']
+    heartbeat_interval = settings.MATHESAR_JOBS['HEARTBEAT_TIMEOUT'] / 3
+    running = {}
+    last_heartbeat = None
+    worker = register_worker()
+    try:
+        with ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix='mathesar-job') as executor:
+            while not stop.is_set():
+                running = {
+                    job_id: future for job_id, future in running.items() if not future.done()
+                }
+                if last_heartbeat is None or time.monotonic() - last_heartbeat >= heartbeat_interval:
+                    record_worker_heartbeat(worker)
+                    record_heartbeat(list(running))
+                    failed = fail_orphaned_jobs()
+                    if failed:
+                        logger.warning("Marked %s orphaned job(s) as failed", failed)
+                    last_heartbeat = time.monotonic()
+                while len(running) < max_jobs:
+                    job = claim_job()
+                    if job is None:
+                        break
+                    running[job.id] = executor.submit(_run_claimed_job, job)
+                stop.wait(poll_interval)
+            # This worker won't claim more jobs.
+            unregister_worker(worker)
+            # Keep the heartbeat going while the last jobs finish.
+            while any(not future.done() for future in running.values()):
+                record_heartbeat(list(running))
+                time.sleep(min(heartbeat_interval, poll_interval))
+    finally:
+        unregister_worker(worker)
+
+
+def is_job_stale(job, live_worker=None):
+    """
+    Return whether the job is pending, with no worker around to run it.
+
+    Args:
+        job: A Job.
+        live_worker: The result of `has_live_worker`, if already known.
+    """
+    if job.status != PENDING:
+        return False
+    if live_worker is None:
+        live_worker = has_live_worker()
+    return not live_worker
+
+
+def get_job(job_id, user):
+    return Job.objects.get(id=job_id, user=user)
+
+
+def list_jobs(user, database_id=None, status=None):
+    jobs = Job.objects.filter(user=user).order_by('-created_at')
+    if database_id is not None:
+        jobs = jobs.filter(database_id=database_id)
+    if status is not None:
+        jobs = jobs.filter(status=status)
+    return jobs
+
+
+def get_job_progress(job):
+    """
+    Return the progress of the COPY run by a running job, if any.
+
+    Progress is read from `pg_stat_progress_copy`, so it's only available
+    while the job is loading data (e.g., during an import). Otherwise,
+    returns None.
+    """
+    if job.status != RUNNING or job.backend_pid is None:
+        return None
+    with connect(job.database_id, job.user) as conn:
+        row = conn.execute(
+            """
+            SELECT bytes_processed, bytes_total, tuples_processed
+            FROM pg_catalog.pg_stat_progress_copy WHERE pid = %s
+            """,
+            (job.backend_pid,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {
+        'bytes_processed': row[0],
+        'bytes_total': row[1] or None,
+        'tuples_processed': row[2],
+    }
+
+
+def cancel_job(job):
+    """
+    Cancel a pending or running job.
+
+    A pending job is cancelled right away. For a running job, the query
+    currently run by its connection is cancelled via `pg_cancel_backend`,
+    and the job is marked as cancelled by its worker once the query fails.
+    Finished jobs are left as they are.
+
+    The job's row is locked while cancelling, and the worker clears the
+    backend PID (under the same lock) before releasing the connection, so
+    a reused connection's query is never cancelled.
+    """
+    if Job.objects.filter(id=job.id, status=PENDING).update(
+        status=CANCELLED, cancel_requested=True, finished_at=timezone.now()
+    ):
+        return
+    with transaction.atomic():
+        running_job = Job.objects.select_for_update().filter(
+            id=job.id, status=RUNNING
+        ).first()
+        if running_job is None:
+            return
+        running_job.cancel_requested = True
+        running_job.save(update_fields=['cancel_requested'])
+        if running_job.backend_pid is not None:
+            with connect(job.database_id, job.user) as conn:
+                conn.execute(
+                    "SELECT pg_catalog.pg_cancel_backend(%s)", (running_job.backend_pid,)
+                )
@@ -0,0 +1,333 @@
+"""
+Instrumentation of RPC method calls, msar function calls and connections.
+
+Metrics are collected per process while the `MATHESAR_METRICS` setting is
+enabled, and rendered in the Prometheus text format by the metrics
+endpoint. Timings of the current request are also collected, so that
+they can be sent in a `Server-Timing` response header.
+
+A server runs several processes (e.g., gunicorn workers), and any one of
+them may serve the metrics endpoint. So, each process shares its metrics
+every `SHARE_INTERVAL` seconds, as a file in a directory common to the
+processes of the server, and the endpoint renders the sum over all of them.
+Files of processes that have exited are kept, so counts never go down.
+
+When metrics are disabled, `install` is never called, and the `observe_*`
+functions return right away.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from db import connection as db_conn
+
+# Upper bounds of the duration histogram buckets, in seconds.
+DURATION_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60
+)
+ORM_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# How often (in seconds) each process shares its metrics, if they changed.
+SHARE_INTERVAL = 1
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_changed = False
+_request_timings = ContextVar('request_timings', default=None)
+
+
+class _Metric:
+    type_ = None
+
+    def __init__(self, name, help_, label_names=()):
+        self.name = name
+        self.help = help_
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _format_labels(self, labels, **extra):
+        pairs = list(zip(self.label_names, labels)) + list(extra.items())
+        if not pairs:
+            return ''
+        return '{' + ','.join(
+            f'{name}="{_escape_label_value(value)}"' for name, value in pairs
+        ) + '}'
+
+    def get_values(self):
+        with self._lock:
+            return {labels: _copy_value(value) for labels, value in self._values.items()}
+
+    def render(self, values=None):
+        """Render the metric, with the given values or else its own."""
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type_}']
+        values = self.get_values() if values is None else values
+        for labels, value in sorted(values.items()):
+            lines.extend(self._render_value(labels, value))
+        return lines
+
+
+class Counter(_Metric):
+    type_ = 'counter'
+
+    def inc(self, amount, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _render_value(self, labels, value):
+        yield f'{self.name}{self._format_labels(labels)} {value}'
+
+
+class Histogram(_Metric):
+    type_ = 'histogram'
+
+    def __init__(self, name, help_, label_names=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, help_, label_names)
+        self.buckets = buckets
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                # One count per bucket, then the sum and the total count.
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def _render_value(self, labels, counts):
+        for bound, count in zip(self.buckets, counts):
+            yield f'{self.name}_bucket{self._format_labels(labels, le=bound)} {count}'
+        yield f'{self.name}_bucket{self._format_labels(labels, le="+Inf")} {counts[-1]}'
+        yield f'{self.name}_sum{self._format_labels(labels)} {counts[-2]}'
+        yield f'{self.name}_count{self._format_labels(labels)} {counts[-1]}'
+
+
+def _copy_value(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def _add_values(a, b):
+    if a is None:
+        return b
+    elif isinstance(a, list):
+        return [x + y for x, y in zip(a, b)]
+    return a + b
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+RPC_CALL_DURATION = Histogram(
+    'mathesar_rpc_call_duration_seconds',
+    'Duration of RPC method calls.',
+    ('method', 'status'),
+)
+MSAR_CALL_DURATION = Histogram(
+    'mathesar_msar_call_duration_seconds',
+    'Duration of msar function calls.',
+    ('function',),
+)
+MSAR_ROWS_RETURNED = Counter(
+    'mathesar_msar_rows_returned_total',
+    'Rows returned by msar function calls.',
+    ('function',),
+)
+MSAR_BYTES_RETURNED = Counter(
+    'mathesar_msar_bytes_returned_total',
+    'Bytes of data returned by msar function calls.',
+    ('function',),
+)
+CONNECTION_ACQUIRE_DURATION = Histogram(
+    'mathesar_connection_acquire_duration_seconds',
+    'Time taken to get a connection to a user database.',
+)
+REQUEST_ORM_QUERIES = Histogram(
+    'mathesar_request_orm_queries',
+    'Number of Django ORM queries run per request.',
+    buckets=ORM_QUERY_BUCKETS,
+)
+METRICS = (
+    RPC_CALL_DURATION,
+    MSAR_CALL_DURATION,
+    MSAR_ROWS_RETURNED,
+    MSAR_BYTES_RETURNED,
+    CONNECTION_ACQUIRE_DURATION,
+    REQUEST_ORM_QUERIES,
+)
+
+
+class RequestTimings:
+    """Timings (in seconds) of the work done while serving one request."""
+
+    def __init__(self):
+        self.rpc = 0
+        self.msar = 0
+        self.msar_calls = 0
+        self.connection_acquire = 0
+        self.orm_queries = 0
+
+    def count_orm_query(self, execute, sql, params, many, context):
+        """Count a query; to be used as a Django database execute wrapper."""
+        self.orm_queries += 1
+        return execute(sql, params, many, context)
+
+    def get_server_timing_header(self):
+        return ', '.join([
+            f'rpc;dur={self.rpc * 1000:.1f}',
+            f'msar;desc="{self.msar_calls} calls";dur={self.msar * 1000:.1f}',
+            f'conn;desc="Connection acquire";dur={self.connection_acquire * 1000:.1f}',
+            f'orm;desc="{self.orm_queries} queries"',
+        ])
+
+
+def install():
+    """Start collecting metrics in this process, and sharing them."""
+    global _enabled
+    _enabled = True
+    db_conn.set_msar_call_observer(observe_msar_call)
+    _start_sharing()
+    # Threads don't survive a fork, e.g., of workers from a preloaded app.
+    os.register_at_fork(after_in_child=_start_sharing)
+
+
+def _get_share_dir():
+    # The processes of a server (e.g., gunicorn workers) share their parent,
+    # so they share this directory. A restarted server starts afresh.
+    return os.path.join(tempfile.gettempdir(), f'mathesar-metrics-{os.getppid()}')
+
+
+def _start_sharing():
+    threading.Thread(target=_share_periodically, daemon=True).start()
+
+
+def _share_periodically():
+    global _changed
+    while True:
+        time.sleep(SHARE_INTERVAL)
+        if not _changed:
+            continue
+        # Reset first, so that changes made while sharing are shared next time.
+        _changed = False
+        try:
+            _share()
+        except Exception:
+            logger.exception("Failed to share metrics")
+
+
+def _share():
+    share_dir = _get_share_dir()
+    os.makedirs(share_dir, exist_ok=True)
+    shared = {
+        metric.name: [[list(labels), value] for labels, value in metric.get_values().items()]
+        for metric in METRICS
+    }
+    path = os.path.join(share_dir, f'{os.getpid()}.json')
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(shared, f)
+    # Replaced at once, so readers never see a partly written file.
+    os.replace(f'{path}.tmp', path)
+
+
+def _read_shared():
+    """Return the metrics last shared by the other processes of the server."""
+    share_dir = _get_share_dir()
+    own_file = f'{os.getpid()}.json'
+    try:
+        file_names = os.listdir(share_dir)
+    except FileNotFoundError:
+        return []
+    shared = []
+    for file_name in file_names:
+        if file_name == own_file or not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(share_dir, file_name)) as f:
+                shared.append(json.load(f))
+        except (OSError, ValueError):
+            logger.warning("Could not read shared metrics from %s", file_name)
+    return shared
+
+
+@contextmanager
+def request_timings():
+    """Collect the timings of the work done within the block."""
+    global _changed
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+        REQUEST_ORM_QUERIES.observe(timings.orm_queries)
+        _changed = True
+
+
+def observe_rpc_call(method_name, duration, failed):
+    global _changed
+    if not _enabled:
+        return
+    _changed = True
+    RPC_CALL_DURATION.observe(duration, method_name, 'error' if failed else 'ok')
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.rpc += duration
+
+
+def observe_msar_call(func_name, cursor, duration):
+    global _changed
+    if not _enabled:
+        return
+    _changed = True
+    MSAR_CALL_DURATION.observe(duration, func_name)
+    result = cursor.pgresult
+    if result is not None:
+        MSAR_ROWS_RETURNED.inc(result.ntuples, func_name)
+        MSAR_BYTES_RETURNED.inc(sum(
+            result.get_length(row, col)
+            for row in range(result.ntuples)
+            for col in range(result.nfields)
+        ), func_name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.msar += duration
+        timings.msar_calls += 1
+
+
+def observe_connection_acquire(duration):
+    global _changed
+    if not _enabled:
+        return
+    _changed = True
+    CONNECTION_ACQUIRE_DURATION.observe(duration)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.connection_acquire += duration
+
+
+def render():
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    The metrics of this process are added to those last shared by the other
+    processes of the server.
+    """
+    all_values = [metric.get_values() for metric in METRICS]
+    for shared in _read_shared():
+        for metric, values in zip(METRICS, all_values):
+            for labels, value in shared.get(metric.name, []):
+                labels = tuple(labels)
+                values[labels] = _add_values(values.get(labels), value)
+    return '\n'.join(
+        line
+        for metric, values in zip(METRICS, all_values)
+        for line in metric.render(values)
+    ) + '\n'
@@ -0,0 +1,66 @@
+"""
+Cache for total row counts of (filtered) record listings.
+
+Counting every matching row of a big table is expensive, and the count
+rarely changes between consecutive pages. Counts are cached per
+(database, table, filter). Each table has a version number that is part
+of the cache key, so invalidating all cached counts for a table (e.g.,
+after a record is added) just means bumping that version.
+
+Versions are kept in the Django database (as `RecordCountVersion`), so a
+bump made by one server process is seen by all of them, while counts are
+kept in each process's cache.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from mathesar.models.base import RecordCountVersion
+
+
+def _get_version(database_id, table_oid):
+    version = RecordCountVersion.objects.filter(
+        database_id=database_id, table_oid=table_oid
+    ).values_list('version', flat=True).first()
+    return version or 0
+
+
+def get_count_key(database_id, table_oid, user, filter):
+    """
+    Return the cache key for the count of a listing.
+
+    Get the key once per listing, before counting. A count cached under a
+    key read afterwards might miss writes made while counting.
+    """
+    version = _get_version(database_id, table_oid)
+    filter_hash = hashlib.sha256(
+        json.dumps(filter, sort_keys=True).encode()
+    ).hexdigest()
+    # The user is part of the key since row visibility may depend on the
+    # role used to connect (e.g., with row level security).
+    return (
+        f"records_count_{database_id}_{table_oid}_{version}"
+        f"_{user.id}_{filter_hash}"
+    )
+
+
+def get_cached_count(count_key):
+    """Return the cached count for the listing, or None if not cached."""
+    return cache.get(count_key)
+
+
+def set_cached_count(count_key, count):
+    """Cache the count for the listing."""
+    cache.set(count_key, count, settings.MATHESAR_RECORD_COUNT_CACHE_TIMEOUT)
+
+
+def invalidate_cached_counts(database_id, table_oid):
+    """Forget all cached counts for the given table."""
+    version, _ = RecordCountVersion.objects.get_or_create(
+        database_id=database_id, table_oid=table_oid
+    )
+    # An atomic increment, as concurrent writes may bump the version too.
+    RecordCountVersion.objects.filter(id=version.id).update(version=F('version') + 1)
@@ -0,0 +1,189 @@
+"""
+Log of slow record listing, search, and exploration calls.
+
+When one of these RPC method calls takes longer than the threshold set in
+`MATHESAR_SLOW_CALL_LOG`, a `SlowCall` is saved with the call's params, its
+main SQL query, and the plan of that query. This includes calls whose query
+was cancelled (e.g., by the statement timeout). Literal values are redacted
+from all of these; in the query and plan, that's every string constant. The
+plan is found by `EXPLAIN` on the connection used for the call, so it's
+what the user's role would get. Only the latest calls are kept.
+"""
+from contextlib import contextmanager
+import logging
+import re
+import time
+
+from django.conf import settings
+import psycopg
+from psycopg import sql as pg_sql
+
+from mathesar.models.base import SlowCall
+
+logger = logging.getLogger(__name__)
+
+REDACTED = '<redacted>'
+# Params whose values are redacted entirely.
+REDACTED_PARAMS = frozenset({'cursor'})
+# Quoted identifiers, which are kept, and string constants (including
+# escape strings, e.g. E'it\'s'), which are redacted.
+SQL_STRING_OR_IDENTIFIER = re.compile(
+    r'"(?:[^"]|"")*"'
+    r"|\b[eE]'(?:[^'\\]|\\.|'')*'"
+    r"|'(?:[^']|'')*'",
+    re.DOTALL,
+)
+
+
+def redact_literals(value):
+    """
+    Return a copy of RPC params, with the values of literals redacted.
+
+    Literals are the values of `literal` keys (as in search definitions),
+    and of `value` keys in `{"type": "literal"}` objects (as in filters).
+    """
+    if isinstance(value, dict):
+        return {
+            key: (
+                REDACTED
+                if key == 'literal'
+                or (key == 'value' and value.get('type') == 'literal')
+                else redact_literals(item)
+            )
+            for key, item in value.items()
+        }
+    elif isinstance(value, list):
+        return [redact_literals(item) for item in value]
+    return value
+
+
+def redact_sql_literals(value):
+    """
+    Return a copy of an SQL query or a query plan, with string constants redacted.
+
+    All literals in Mathesar's queries are string constants (possibly cast),
+    so this covers filter, search, and cursor values. Plans are JSON, and
+    each string in them is redacted as SQL.
+    """
+    if isinstance(value, str):
+        return SQL_STRING_OR_IDENTIFIER.sub(
+            lambda match: match[0] if match[0].startswith('"') else f"'{REDACTED}'",
+            value
+        )
+    elif isinstance(value, dict):
+        return {key: redact_sql_literals(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [redact_sql_literals(item) for item in value]
+    return value
+
+
+def log_if_slow(
+        conn, *, start, method, database_id, user, params, sql, sql_params=None
+):
+    """
+    Save a SlowCall if the call started at `start` took too long.
+
+    Should be called on the call's connection, after its main query ran.
+    Failures are logged, rather than failing the call.
+
+    Args:
+        conn: The psycopg connection used for the call.
+        start: The `time.perf_counter()` value at the start of the call.
+        method: The name of the RPC method.
+        database_id: The Django id of the database of the call.
+        user: The user making the call.
+        params: The RPC params of the call.
+        sql: The main query of the call, or a function returning a
+            (query, params) tuple, which is only called for slow calls.
+        sql_params: Params for the placeholders of the query, if any.
+    """
+    threshold = settings.MATHESAR_SLOW_CALL_LOG['THRESHOLD']
+    duration = time.perf_counter() - start
+    if threshold <= 0 or duration < threshold:
+        return
+    try:
+        if callable(sql):
+            sql, sql_params = sql()
+        SlowCall.objects.create(
+            user=user,
+            database_id=database_id,
+            method=method,
+            duration=duration,
+            params={
+                key: REDACTED if key in REDACTED_PARAMS and value is not None
+                else redact_literals(value)
+                for key, value in params.items()
+            },
+            sql=redact_sql_literals(sql),
+            plan=redact_sql_literals(_explain(conn, sql, sql_params)),
+        )
+        _trim_log()
+    except Exception:
+        logger.exception("Failed to log slow %s call", method)
+
+
+@contextmanager
+def log_if_cancelled_while_slow(
+        conn, *, start, method, database_id, user, params, sql, sql_params=None
+):
+    """
+    Save a SlowCall if the query of the block is cancelled after too long.
+
+    Queries are cancelled by the statement timeout, or when the client goes
+    away. The block runs in a savepoint, so that the query can still be
+    explained on the call's connection once it's been cancelled. The
+    exception is raised again after logging.
+
+    Args are as for `log_if_slow`, except that `sql` should be a function,
+    since the block gives no result to take the query from.
+    """
+    if settings.MATHESAR_SLOW_CALL_LOG['THRESHOLD'] <= 0:
+        yield
+        return
+    try:
+        with conn.transaction():
+            yield
+    except psycopg.errors.QueryCanceled:
+        log_if_slow(
+            conn,
+            start=start,
+            method=method,
+            database_id=database_id,
+            user=user,
+            params=params,
+            sql=sql,
+            sql_params=sql_params,
+        )
+        raise
+
+
+def _explain(conn, sql, sql_params):
+    # A savepoint keeps a failing EXPLAIN from aborting the transaction of
+    # the call.
+    try:
+        with conn.transaction():
+            return conn.execute(
+                pg_sql.SQL("EXPLAIN (FORMAT JSON) ") + pg_sql.SQL(sql), sql_params
+            ).fetchone()[0]
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _trim_log():
+    max_entries = max(settings.MATHESAR_SLOW_CALL_LOG['MAX_ENTRIES'], 1)
+    oldest_kept = list(
+        SlowCall.objects.order_by('-id').values_list('id', flat=True)[
+            max_entries - 1:max_entries
+        ]
+    )
+    if oldest_kept:
+        SlowCall.objects.filter(id__lt=oldest_kept[0]).delete()
+
+
+def list_slow_calls(database_id=None, method=None, limit=100):
+    slow_calls = SlowCall.objects.select_related('user').order_by('-id')
+    if database_id is not None:
+        slow_calls = slow_calls.filter(database_id=database_id)
+    if method is not None:
+        slow_calls = slow_calls.filter(method=method)
+    return slow_calls[:limit]
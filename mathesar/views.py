@@ -1,8 +1,16 @@
+from itertools import chain
+import json
+
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
 from modernrpc.views import RPCEntryPoint
+import psycopg
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -20,6 +28,10 @@ from mathesar.api.utils import is_valid_uuid_v4
 from mathesar.database.types import UIType
 from mathesar.models.shares import SharedTable, SharedQuery
 from mathesar.state import reset_reflection
+from mathesar.utils import metrics
+from mathesar.utils.export import (
+    EXPORT_CONTENT_TYPES, stream_exploration_export, stream_table_export
+)
 from mathesar import __version__
 
 
@@ -162,6 +174,126 @@ def reflect_all(_):
     return Response(status=status.HTTP_200_OK)
 
 
+@require_GET
+def metrics_endpoint(request):
+    """
+    Serve the metrics of all server processes in the Prometheus text format.
+
+    The request must bear the `MATHESAR_METRICS_TOKEN` in a bearer
+    Authorization header, or come from a logged in superuser.
+    """
+    if not settings.MATHESAR_METRICS['ENABLED']:
+        raise Http404
+    token = settings.MATHESAR_METRICS['TOKEN']
+    authorized = request.user.is_superuser or (
+        token and constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}'
+        )
+    )
+    if not authorized:
+        return HttpResponse(status=401)
+    return HttpResponse(
+        metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+def _get_json_param(params, name):
+    value = params.get(name)
+    return json.loads(value) if value is not None else None
+
+
+def _get_export_format(params):
+    format_ = params.get('format', 'csv')
+    if format_ not in EXPORT_CONTENT_TYPES:
+        raise ValueError(f'Unknown export format: {format_}')
+    return format_
+
+
+def _get_export_error_status(e):
+    """
+    Get the HTTP status for an error in setting up an export.
+
+    Returns None for errors that aren't caused by the request, e.g., a
+    lost connection, which should be raised as usual.
+    """
+    if isinstance(e, (ObjectDoesNotExist, psycopg.errors.UndefinedTable)):
+        return 404
+    elif isinstance(e, psycopg.errors.InsufficientPrivilege):
+        return 403
+    elif isinstance(e, psycopg.errors.RaiseException) or (
+        # Data exceptions (e.g., a bad literal in a filter), and syntax
+        # errors or access rule violations (e.g., an unknown column).
+        isinstance(e, psycopg.Error) and (e.sqlstate or '')[:2] in ('22', '42')
+    ):
+        return 400
+
+
+def _streaming_export_response(chunks, format_, filename):
+    # Get the first chunk before responding, so that errors in setting up
+    # the export (e.g., a bad filter) produce an error response rather
+    # than a truncated file.
+    try:
+        first_chunk = next(chunks, b'')
+    except Exception as e:
+        error_status = _get_export_error_status(e)
+        if error_status is None:
+            raise
+        return JsonResponse({'error': str(e)}, status=error_status)
+    response = StreamingHttpResponse(
+        chain([first_chunk], chunks), content_type=EXPORT_CONTENT_TYPES[format_]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{format_}"'
+    return response
+
+
+@login_required
+@require_GET
+def export_table(request):
+    """
+    Stream the rows of a table as CSV, TSV or NDJSON.
+
+    Query parameters are `database_id`, `table_oid`, `format` and,
+    optionally, JSON-encoded `columns` (a list of attnums), `order` and
+    `filter`, which work as in `records.list`.
+    """
+    params = request.GET
+    try:
+        format_ = _get_export_format(params)
+        table_oid = int(params['table_oid'])
+        chunks = stream_table_export(
+            int(params['database_id']),
+            request.user,
+            table_oid,
+            columns=_get_json_param(params, 'columns'),
+            order=_get_json_param(params, 'order'),
+            filter=_get_json_param(params, 'filter'),
+            format_=format_,
+        )
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'error': f'Invalid export parameters: {e}'}, status=400)
+    return _streaming_export_response(chunks, format_, f'table_{table_oid}')
+
+
+@login_required
+@require_GET
+def export_exploration(request):
+    """
+    Stream the result rows of a saved exploration as CSV, TSV or NDJSON.
+
+    Query parameters are `exploration_id` and `format`.
+    """
+    params = request.GET
+    try:
+        format_ = _get_export_format(params)
+        exploration_id = int(params['exploration_id'])
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'error': f'Invalid export parameters: {e}'}, status=400)
+    chunks = stream_exploration_export(exploration_id, request.user, format_=format_)
+    return _streaming_export_response(
+        chunks, format_, f'exploration_{exploration_id}'
+    )
+
+
 @login_required
 def home(request):
     database_list = get_database_list(request)
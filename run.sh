@@ -17,5 +17,11 @@ then
 fi
 
 python -m mathesar.install --skip-confirm
+# Run background jobs in a separate process, restarted whenever it dies
+# (e.g., crashing or being OOM-killed). It exits cleanly once stopped.
+until python manage.py run_job_worker; do
+  echo "Job worker exited with status $?, restarting it" >&2
+  sleep 1
+done &
 # Start the Django server on port 8000.
 gunicorn config.wsgi -b 0.0.0.0:8000 && fg